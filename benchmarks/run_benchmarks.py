@@ -0,0 +1,346 @@
+"""Time startup and hot paths of the app against synthetic libraries.
+
+    python benchmarks/run_benchmarks.py --sizes 1k,10k,100k --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 10k --compare bench.json
+
+Each size gets a fresh working directory with a generated library, and the
+same DataManager, ButtonPanel and TableWidget code the app runs is timed on
+it (Qt runs on the offscreen platform). Results are written as JSON; with
+--compare the medians are checked against an earlier run and the exit code
+is 1 if any benchmark got slower than the allowed ratio.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import islice
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from synthetic_library import GENRES, LibraryGenerator, parse_size, write_excel, write_library
+
+DEFAULT_SIZES = "1k,10k,100k"
+DEFAULT_REPEAT = 5
+# Rows in the imported and exported Excel files and in the exported PDF; all grow linearly
+# and would dominate a run at the larger sizes
+EXCEL_ROWS = 10_000
+PDF_ROWS = 5_000
+SEARCH_QUERY = "gölge"
+FILTER_GENRE = "Roman"
+# A median this many times the baseline's counts as a regression
+REGRESSION_RATIO = 1.2
+# Medians below this are timer noise and never count as regressions
+NOISE_FLOOR = 0.002
+
+
+def timed(function):
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def summary(runs, **extra):
+    result = {
+        'runs': [round(run, 6) for run in runs],
+        'first': round(runs[0], 6),
+        'best': round(min(runs), 6),
+        'median': round(statistics.median(runs), 6)
+    }
+    result.update(extra)
+    return result
+
+
+class LibraryBench:
+    """Benchmarks for one generated library in its own working directory."""
+
+    def __init__(self, app, size, storage_kind, seed, repeat, font_file=None):
+        self.app = app
+        self.size = size
+        self.storage_kind = storage_kind
+        self.repeat = repeat
+        self.font_file = font_file
+        self.generator = LibraryGenerator(seed)
+        self.workdir = tempfile.mkdtemp(prefix=f"library-bench-{size}-")
+
+    def run(self):
+        from src.storage import STORAGE_FILES
+
+        cwd = os.getcwd()
+        os.chdir(self.workdir)
+        try:
+            with open("genres.json", 'w', encoding='utf-8') as f:
+                json.dump(sorted(GENRES), f, ensure_ascii=False)
+            write_library(self.generator.library(self.size), self.storage_kind, STORAGE_FILES[self.storage_kind])
+
+            results = {'records': self.size}
+            for name, bench in (
+                ('load_data', self.bench_load_data),
+                ('open_collection', self.bench_open_collection),
+                ('save_data', self.bench_save_data),
+                ('update_table', self.bench_update_table),
+                ('filter_by_type', self.bench_filter_by_type),
+                ('search_items', self.bench_search_items),
+                ('export_to_pdf', self.bench_export_to_pdf),
+                ('export_to_excel', self.bench_export_to_excel),
+                ('import_excel', self.bench_import_excel)
+            ):
+                results[name] = bench()
+                print(f"  {name:<16}{describe(results[name])}", flush=True)
+            return results
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def data_manager(self, load=True):
+        from data_manager import DataManager
+        manager = DataManager(self.storage_kind)
+        if load:
+            manager.load_data()
+        return manager
+
+    def widgets(self):
+        """Return a loaded DataManager with the app's panel and table showing its books."""
+        from components.button_panel import ButtonPanel
+        from components.table_widget import TableWidget
+
+        manager = self.data_manager()
+        table = TableWidget(manager)
+        table.resize(1200, 800)
+        table.show()
+        panel = ButtonPanel(manager, table, None, None, None)
+        panel.show_books()
+        self.app.processEvents()
+        return manager, panel, table
+
+    def close(self, manager, *widgets):
+        for widget in widgets:
+            widget.deleteLater()
+        manager.storage.close()
+        self.app.processEvents()
+
+    def bench_load_data(self):
+        runs = []
+        for _ in range(self.repeat):
+            manager = self.data_manager(load=False)
+            runs.append(timed(manager.load_data))
+            manager.storage.close()
+        return summary(runs)
+
+    def bench_open_collection(self):
+        """load_data plus everything needed before the books can be shown."""
+        runs = []
+        for _ in range(self.repeat):
+            manager = self.data_manager(load=False)
+            runs.append(timed(lambda: (manager.load_data(), manager.collection_items('books'))))
+            manager.storage.close()
+        return summary(runs)
+
+    def bench_save_data(self):
+        manager = self.data_manager()
+        for collection in ('books', 'articles', 'magazines'):
+            manager.collection_items(collection)
+        runs = [timed(manager.save_data) for _ in range(self.repeat)]
+        manager.storage.close()
+        return summary(runs)
+
+    def bench_update_table(self):
+        """Show every book in the table, from an empty table, until painted."""
+        manager, panel, table = self.widgets()
+        books = manager.collection_items('books')
+        runs = []
+        for _ in range(self.repeat):
+            table.update_table([], None)
+            self.app.processEvents()
+            runs.append(timed(lambda: (table.update_table(books, 'book'), self.app.processEvents())))
+        self.close(manager, panel, table)
+        return summary(runs, rows=len(books))
+
+    def bench_filter_by_type(self):
+        manager, panel, table = self.widgets()
+        runs = []
+        for _ in range(self.repeat):
+            panel.filter_by_type("Hepsi")
+            self.app.processEvents()
+            runs.append(timed(lambda: (panel.filter_by_type(FILTER_GENRE), self.app.processEvents())))
+        rows = table.table_model.rowCount()
+        self.close(manager, panel, table)
+        return summary(runs, genre=FILTER_GENRE, rows=rows)
+
+    def bench_search_items(self):
+        """Type a query into the search box and wait until the table shows the results.
+
+        The first run includes building the collection's search index.
+        """
+        from PyQt5.QtCore import QEventLoop
+
+        manager, panel, table = self.widgets()
+        panel.search_pipeline.set_debounce(0)
+        loop = QEventLoop()
+        panel.search_pipeline.results_ready.connect(lambda *_: loop.quit())
+
+        def search():
+            panel.search_input.setText(SEARCH_QUERY)
+            loop.exec_()
+            self.app.processEvents()
+
+        runs = []
+        for _ in range(self.repeat):
+            panel.search_input.setText("")
+            self.app.processEvents()
+            runs.append(timed(search))
+        rows = table.table_model.rowCount()
+        self.close(manager, panel, table)
+        return summary(runs, query=SEARCH_QUERY, rows=rows)
+
+    def bench_export_to_pdf(self):
+        """Draw the books shown in the table to a PDF, as the PDF button's job does."""
+        from src import pdf_export
+
+        font_file = self.font_file or os.path.join(REPO_DIR, pdf_export.FONT_FILE)
+        if not os.path.exists(font_file):
+            return {'skipped': f"font file not found: {font_file} (pass --font)"}
+        pdf_export.register_font(pdf_export.FONT_NAME, font_file)
+
+        manager, panel, table = self.widgets()
+        items = list(islice(panel.get_filtered_items(), PDF_ROWS))
+        headers, col_props = panel.pdf_layout('book')
+
+        def export():
+            exporter = pdf_export.PdfTableExporter(
+                "bench.pdf", headers, col_props, "Kütüphane Yönetim Sistemi", "KİTAP – HEPSİ"
+            )
+            exporter.export(panel.pdf_rows(items, 'book'), len(items))
+
+        runs = [timed(export) for _ in range(self.repeat)]
+        self.close(manager, panel, table)
+        return summary(runs, rows=len(items))
+
+    def bench_export_to_excel(self):
+        """Stream the books shown in the table to an .xlsx file, as the Excel export button's job does."""
+        manager, panel, table = self.widgets()
+        items = list(islice(table.table_model.items, EXCEL_ROWS))
+        runs = [timed(lambda: manager.write_excel_records("export.xlsx", 'book', items)) for _ in range(self.repeat)]
+        self.close(manager, panel, table)
+        return summary(runs, rows=len(items))
+
+    def bench_import_excel(self):
+        """Import an Excel sheet of new books; each run adds to the library, duplicates and all."""
+        rows = min(self.size, EXCEL_ROWS)
+        write_excel([self.generator.book() for _ in range(rows)], "import.xlsx")
+        manager = self.data_manager()
+        manager.collection_items('books')
+        runs = []
+        for _ in range(self.repeat):
+            success, message = None, None
+
+            def run():
+                nonlocal success, message
+                success, message = manager.import_excel("import.xlsx", 'kitap', skip_duplicates=False)
+
+            runs.append(timed(run))
+            if not success:
+                manager.storage.close()
+                return {'failed': message}
+        manager.storage.close()
+        return summary(runs, rows=rows)
+
+
+def describe(result):
+    if 'median' not in result:
+        return json.dumps(result, ensure_ascii=False)
+    return f"median {result['median'] * 1000:9.1f} ms   first {result['first'] * 1000:9.1f} ms"
+
+
+def git_revision():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+                                    capture_output=True, text=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+
+def compare(report, baseline, ratio=REGRESSION_RATIO):
+    """Print median ratios against a baseline report; returns the regressed benchmarks."""
+    regressions = []
+    print(f"Compared with {baseline.get('commit') or 'baseline'}:")
+    if baseline.get('storage') != report['storage']:
+        print(f"  (baseline used {baseline.get('storage')} storage, this run {report['storage']})")
+    for size, results in report['results'].items():
+        for name, result in results.items():
+            before = baseline.get('results', {}).get(size, {}).get(name)
+            if not isinstance(result, dict) or not isinstance(before, dict):
+                continue
+            if 'median' not in result or not before.get('median'):
+                continue
+            change = result['median'] / before['median']
+            slower = change > ratio and result['median'] >= NOISE_FLOOR
+            flag = "  SLOWER" if slower else ""
+            print(f"  {size:>6} {name:<16}{before['median'] * 1000:9.1f} -> {result['median'] * 1000:9.1f} ms"
+                  f"  x{change:.2f}{flag}")
+            if flag:
+                regressions.append((size, name))
+    return regressions
+
+
+def main(argv=None):
+    from src.storage import DEFAULT_STORAGE, STORAGE_FILES
+
+    parser = argparse.ArgumentParser(description="Kütüphane uygulaması performans ölçümleri")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="virgülle ayrılmış: 1k,10k,100k,1m")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--storage", choices=sorted(STORAGE_FILES), default=DEFAULT_STORAGE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--font", help="PDF ölçümü için TrueType yazı tipi (varsayılan: times.ttf)")
+    parser.add_argument("--output", help="sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--compare", help="karşılaştırılacak önceki JSON sonuç dosyası")
+    parser.add_argument("--ratio", type=float, default=REGRESSION_RATIO)
+    args = parser.parse_args(argv)
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    commit, dirty = git_revision()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'storage': args.storage,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': {}
+    }
+    for label in args.sizes.split(','):
+        size = parse_size(label)
+        print(f"{label.strip()} ({size} kayıt, {args.storage}):", flush=True)
+        bench = LibraryBench(app, size, args.storage, args.seed, args.repeat, args.font)
+        report['results'][label.strip()] = bench.run()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.ratio):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Synthetic library data for the benchmarks.
+
+    python benchmarks/synthetic_library.py 100k library_data.pkl
+    python benchmarks/synthetic_library.py 10k kitap.xlsx --excel kitap
+
+Records look like the ones the app stores: Turkish names, titles and genres,
+canonical DD/MM/YYYY reading dates and MM/YYYY magazine dates. The same
+size and seed always give the same library.
+"""
+import argparse
+import random
+import uuid
+
+# Share of each collection in a generated library
+COLLECTION_SHARES = {'books': 0.7, 'articles': 0.2, 'magazines': 0.1}
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+GENRES = [
+    "Anı", "Askeri", "Bilim", "Dil", "Din",
+    "Ekonomi", "Eleştiri", "Felsefe", "Günce Yazılar",
+    "Hikaye/Öykü", "Roman", "Sanat", "Senaryo",
+    "Siyaset", "Şiir", "Tarih", "Tiyatro", "Edebiyat"
+]
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Ayşe", "Fatma", "Emre", "Elif", "Zeynep", "Mustafa",
+    "Hüseyin", "Şule", "Gülşen", "Oğuz", "İsmail", "Ümit", "Çağrı", "Özlem",
+    "Sabahattin", "Orhan", "Yaşar", "Nazım", "Sait Faik", "Halide Edib",
+    "Cemil", "Tomris", "Oğuz Atay", "Sevgi", "Attilâ", "Bilge", "Ferit", "Leyla"
+]
+
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Öztürk", "Aydın",
+    "Özdemir", "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç",
+    "Kurt", "Özkan", "Şimşek", "Polat", "Ali", "Pamuk", "Kemal", "Hikmet",
+    "Abasıyanık", "Adıvar", "Meriç", "Uyar", "Soysal", "İlhan"
+]
+
+TITLE_WORDS = [
+    "Işık", "Gölge", "Deniz", "Dağ", "Şehir", "Köy", "Zaman", "Yol", "Gece",
+    "Sabah", "Rüzgâr", "Ağaç", "Ayna", "Düş", "Sessizlik", "Çığlık", "Göç",
+    "Ömür", "Hüzün", "Bahçe", "Kuyu", "Sokak", "Sevda", "Yalnızlık", "Özgürlük",
+    "Kâğıt", "Çınar", "Güz", "Kış", "Ilgın", "Şafak", "Umut", "İz", "Bellek"
+]
+
+TITLE_FORMS = [
+    "{0}", "{0} ve {1}", "Son {0}", "{0} Üzerine", "Uzak {0}",
+    "Bir {0} Hikâyesi", "Kayıp {0}", "{0} Günlüğü", "{0}, {1} ve {2}"
+]
+
+ARTICLE_FORMS = [
+    "{0} Üzerine Bir İnceleme", "{0} ve {1} İlişkisi", "Türk Edebiyatında {0}",
+    "{0} Kavramının Gelişimi", "{0} ile {1} Arasında"
+]
+
+MAGAZINES = [
+    "Tarih Dergisi", "Bilim ve Teknik", "Varlık", "Kitap-lık", "Yeni Dergi",
+    "Toplumsal Tarih", "Atlas", "Sanat Dünyamız", "Virgül", "Hece", "Türk Dili"
+]
+
+
+class LibraryGenerator:
+    """Deterministic source of records for one seed."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def library(self, size):
+        """Return {collection: [records]} with size records in total."""
+        counts = {name: int(size * share) for name, share in COLLECTION_SHARES.items()}
+        counts['books'] += size - sum(counts.values())
+        return {
+            'books': [self.book() for _ in range(counts['books'])],
+            'articles': [self.article() for _ in range(counts['articles'])],
+            'magazines': [self.magazine() for _ in range(counts['magazines'])]
+        }
+
+    def book(self):
+        started, finished = self.reading_dates()
+        return {
+            'Yazar': self.author(),
+            'Kitap': self.title(TITLE_FORMS),
+            'Tür': self.rng.choice(GENRES),
+            'Başlama Tarihi': started,
+            'Bitirme Tarihi': finished,
+            'type': 'book',
+            'id': self.item_id()
+        }
+
+    def article(self):
+        started, finished = self.reading_dates()
+        return {
+            'Yazar': self.author(),
+            'Makale': self.title(ARTICLE_FORMS),
+            'Tür': self.rng.choice(GENRES),
+            'Başlama Tarihi': started,
+            'Bitirme Tarihi': finished,
+            'type': 'article',
+            'id': self.item_id()
+        }
+
+    def magazine(self):
+        rng = self.rng
+        started, finished = self.reading_dates()
+        return {
+            'Dergi': rng.choice(MAGAZINES),
+            'Sayı': str(rng.randint(1, 400)),
+            'Cilt': str(rng.randint(1, 60)),
+            'Tarih': f"{rng.randint(1, 12):02d}/{rng.randint(1950, 2025)}",
+            'Başlama Tarihi': started,
+            'Bitirme Tarihi': finished,
+            'type': 'magazine',
+            'id': self.item_id()
+        }
+
+    def author(self):
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def title(self, forms):
+        return self.rng.choice(forms).format(*self.rng.sample(TITLE_WORDS, 3))
+
+    def reading_dates(self):
+        """Return a start date and, most of the time, a later finish date."""
+        rng = self.rng
+        year, month, day = rng.randint(2000, 2025), rng.randint(1, 12), rng.randint(1, 28)
+        started = f"{day:02d}/{month:02d}/{year}"
+        if rng.random() < 0.15:
+            return started, ""  # Still being read
+        month += rng.randint(0, 3)
+        year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        return started, f"{rng.randint(1, 28):02d}/{month:02d}/{year}"
+
+    def item_id(self):
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+
+def parse_size(text):
+    """Turn '10k', '1m' or a plain number into a record count."""
+    text = text.strip().lower()
+    if text in SIZES:
+        return SIZES[text]
+    if text[-1:] in ('k', 'm'):
+        return int(float(text[:-1]) * (1_000 if text[-1] == 'k' else 1_000_000))
+    return int(text)
+
+
+def generate_library(size, seed=0):
+    return LibraryGenerator(seed).library(size)
+
+
+def write_library(data, kind, path):
+    """Store a generated library with the storage backend named kind."""
+    from src.storage import create_storage
+    storage = create_storage(kind, path)
+    storage.write_snapshot(data)
+    storage.close()
+
+
+def write_excel(records, path):
+    """Write records as an Excel sheet in the layout import_excel reads."""
+    import pandas as pd
+    columns = [field for field in records[0] if field not in ('type', 'id')] if records else []
+    pd.DataFrame(records, columns=columns).to_excel(path, index=False)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from src.storage import STORAGE_FILES
+
+    excel_types = {'kitap': 'books', 'makale': 'articles', 'dergi': 'magazines'}
+    parser = argparse.ArgumentParser(description="Sentetik kütüphane verisi üret")
+    parser.add_argument("size", help="kayıt sayısı: 1k, 10k, 100k, 1m veya bir sayı")
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--storage", choices=sorted(STORAGE_FILES), default="pickle")
+    parser.add_argument("--excel", choices=sorted(excel_types),
+                        help="tüm kayıtları bu türde bir Excel dosyası olarak yaz")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    generator = LibraryGenerator(args.seed)
+    if args.excel:
+        make = {'books': generator.book, 'articles': generator.article, 'magazines': generator.magazine}
+        write_excel([make[excel_types[args.excel]]() for _ in range(size)], args.path)
+    else:
+        write_library(generator.library(size), args.storage, args.path)
+    print(f"{size} kayıt yazıldı: {args.path}")
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QLineEdit, QComboBox, QLabel
 from .base_section import BaseSection
-from src.constants import GENRES, add_genre
+from src.constants import genre_registry, add_genre
 
 class ArticleSection(BaseSection):
     def __init__(self, data_manager):
@@ -17,7 +17,7 @@ class ArticleSection(BaseSection):
         }
 
         # Configure type combobox
-        self.inputs['Tür'].addItems(GENRES)
+        self.inputs['Tür'].addItems(genre_registry.genres())
         self.inputs['Tür'].setFixedWidth(200)
 
         for label, input_field in self.inputs.items():
@@ -35,5 +35,7 @@ class ArticleSection(BaseSection):
             'Bitirme Tarihi': self.inputs['Bitirme Tarihi'].text(),
             'type': 'article'
         }
+        if not self.confirm_not_duplicate('article', article_data):
+            return
         self.data_manager.add_article(article_data)
         self.clear_inputs()
\ No newline at end of file
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 from datetime import datetime
-from src.constants import GENRES, add_genre, delete_genre, genre_signals
+from src.constants import genre_registry, add_genre, delete_genre
 
 class BaseSection(QWidget):
     def __init__(self, title, data_manager):
@@ -12,8 +12,9 @@ class BaseSection(QWidget):
         self.data_manager = data_manager
         self.setup_ui(title)
         
-        # Connect to genre changes signal
-        genre_signals.genre_changed.connect(self.update_genre_list)
+        # Keep the genre combo in step with the registry, one item at a time
+        genre_registry.genre_added.connect(self.on_genre_added)
+        genre_registry.genre_removed.connect(self.on_genre_removed)
         
     def setup_ui(self, title):
         # Set fixed size for the entire section
@@ -200,17 +201,15 @@ class BaseSection(QWidget):
         
         return row_layout  # Return the layout instead of a widget
     
-    def update_genre_list(self):
-        """Update the genre list in combobox when genres change"""
+    def on_genre_added(self, genre, position):
         if 'Tür' in self.inputs and isinstance(self.inputs['Tür'], QComboBox):
-            current_text = self.inputs['Tür'].currentText()
-            self.inputs['Tür'].clear()
-            self.inputs['Tür'].addItems(sorted(GENRES))
-            
-            # Try to restore previous selection
-            index = self.inputs['Tür'].findText(current_text)
+            self.inputs['Tür'].insertItem(position, genre)
+
+    def on_genre_removed(self, genre, position):
+        if 'Tür' in self.inputs and isinstance(self.inputs['Tür'], QComboBox):
+            index = self.inputs['Tür'].findText(genre)
             if index >= 0:
-                self.inputs['Tür'].setCurrentIndex(index)
+                self.inputs['Tür'].removeItem(index)
         
     def add_new_genre(self):
         genre, ok = QInputDialog.getText(
@@ -229,7 +228,7 @@ class BaseSection(QWidget):
     
     def delete_genre(self):
         """Delete a genre from the list"""
-        if not GENRES:
+        if not len(genre_registry):
             QMessageBox.warning(self, "Uyarı", "Silinecek tür bulunamadı!")
             return
             
@@ -237,7 +236,7 @@ class BaseSection(QWidget):
             self,
             "Tür Sil",
             "Silinecek türü seçin:",
-            sorted(GENRES),
+            genre_registry.genres(),
             0,
             False
         )
@@ -266,6 +265,25 @@ class BaseSection(QWidget):
             elif isinstance(input_field, QComboBox):
                 input_field.setCurrentIndex(0)
             
+    def confirm_not_duplicate(self, item_type, item_data):
+        """Warn about a stored item that duplicates item_data; returns True to add it anyway."""
+        exact, near = self.data_manager.find_duplicates(item_type, item_data)
+        if exact:
+            text = "Bu kayıt zaten mevcut."
+        elif near:
+            fields = [field for field in ('Yazar', 'Kitap', 'Makale', 'Dergi', 'Sayı', 'Cilt') if field in near[0]]
+            text = "Çok benzer bir kayıt mevcut:\n" + ", ".join(str(near[0][field]) for field in fields)
+        else:
+            return True
+        answer = QMessageBox.question(
+            self,
+            "Yinelenen Kayıt",
+            f"{text}\nYine de eklemek istiyor musunuz?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        return answer == QMessageBox.Yes
+
     def validate_date(self, date_str, is_month_year=False):
         if not date_str:
             return True
@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import QLineEdit, QComboBox
 from .base_section import BaseSection
-from src.constants import GENRES, add_genre
+from src.constants import genre_registry, add_genre
 
 class BookSection(BaseSection):
     def __init__(self, data_manager):
@@ -17,7 +17,7 @@ class BookSection(BaseSection):
         }
         
         # Configure type combobox
-        self.inputs['Tür'].addItems(GENRES)
+        self.inputs['Tür'].addItems(genre_registry.genres())
         self.inputs['Tür'].setFixedWidth(200)
 
         for label, input_field in self.inputs.items():
@@ -35,5 +35,7 @@ class BookSection(BaseSection):
             'Bitirme Tarihi': self.inputs['Bitirme Tarihi'].text(),
             'type': 'book'
         }
+        if not self.confirm_not_duplicate('book', book_data):
+            return
         self.data_manager.add_book(book_data)
         self.clear_inputs()
\ No newline at end of file
@@ -1,16 +1,18 @@
 from PyQt5.QtWidgets import (QWidget, QHBoxLayout, QVBoxLayout, QComboBox, QSizePolicy,
-                           QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit)
+                           QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit,
+                           QProgressDialog)
 from PyQt5.QtCore import Qt
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.lib import colors
-from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from textwrap import wrap
+import time
 from datetime import datetime
 from PyQt5.QtGui import QIcon
-from src.constants import GENRES, genre_signals
+from src.constants import genre_registry
+from src.dates import display_month
+from src.search_pipeline import SearchPipeline
+from src.search_index import item_matches
+from src.jobs import Job
+from src.instrumentation import measure, timed
+from data_manager import TYPE_COLLECTIONS
+from components.statistics_dialog import StatisticsDialog
 
 class ButtonPanel(QWidget):
     def __init__(self, data_manager, table_widget, book_section, article_section, magazine_section):
@@ -20,10 +22,16 @@ class ButtonPanel(QWidget):
         self.book_section = book_section
         self.article_section = article_section
         self.magazine_section = magazine_section
+        self.search_pipeline = SearchPipeline(data_manager, parent=self)
+        self.search_pipeline.results_ready.connect(self.show_search_results)
+        self.jobs = set()  # Keep running jobs (and their signal objects) alive
+        self.statistics_dialog = None
         self.setup_ui()
         
-        # Connect to genre changes signal
-        genre_signals.genre_changed.connect(self.update_genre_list)
+        # Keep the genre combo in step with the registry, one item at a time
+        genre_registry.genre_added.connect(self.on_genre_added)
+        genre_registry.genre_removed.connect(self.on_genre_removed)
+        self.data_manager.collection_changed.connect(self.on_collection_changed)
         
     def setup_ui(self):
         main_layout = QVBoxLayout(self)
@@ -58,22 +66,29 @@ class ButtonPanel(QWidget):
         self.excel_btn.setIcon(QIcon("icons/excel.ico"))
         self.pdf_btn = QPushButton("PDF")
         self.pdf_btn.setIcon(QIcon("icons/pdf.ico"))
+        self.excel_export_btn = QPushButton("Excel'e Aktar")
+        self.excel_export_btn.setIcon(QIcon("icons/excel.ico"))
         self.delete_selected_btn = QPushButton("Seçilenleri Sil")
         self.delete_selected_btn.setIcon(QIcon("icons/trash.ico"))
+        self.stats_btn = QPushButton("İstatistikler")
         
         self.book_btn.clicked.connect(self.show_books)
         self.article_btn.clicked.connect(self.show_articles)
         self.magazine_btn.clicked.connect(self.show_magazines)
         self.excel_btn.clicked.connect(self.import_excel)
         self.pdf_btn.clicked.connect(self.export_to_pdf)
+        self.excel_export_btn.clicked.connect(self.export_to_excel)
         self.delete_selected_btn.clicked.connect(self.table_widget.delete_selected_rows)
+        self.stats_btn.clicked.connect(self.show_statistics)
         
         button_layout.addWidget(self.book_btn)
         button_layout.addWidget(self.article_btn)
         button_layout.addWidget(self.magazine_btn)
         button_layout.addWidget(self.excel_btn)
         button_layout.addWidget(self.pdf_btn)
+        button_layout.addWidget(self.excel_export_btn)
         button_layout.addWidget(self.delete_selected_btn)
+        button_layout.addWidget(self.stats_btn)
         button_layout.addStretch()
         
         # Bottom layout for type filter
@@ -87,10 +102,9 @@ class ButtonPanel(QWidget):
         self.type_combo.setFixedWidth(200)
         
         # Add items to combo box
-        self.type_combo.addItem("Hepsi")
-        self.type_combo.addItems(sorted(GENRES))
+        self.fill_genre_combo()
         
-        self.type_combo.currentTextChanged.connect(self.filter_by_type)
+        self.type_combo.currentIndexChanged.connect(self.on_genre_selected)
         
         filter_layout.addWidget(type_label)
         filter_layout.addWidget(self.type_combo)
@@ -130,19 +144,64 @@ class ButtonPanel(QWidget):
             }
         """)
 
-    def update_genre_list(self):
-        """Update the genre list in combobox when genres change"""
-        current_text = self.type_combo.currentText()
-        self.type_combo.clear()
-        self.type_combo.addItem("Hepsi")
-        self.type_combo.addItems(sorted(GENRES))
-        
-        # Try to restore previous selection
-        index = self.type_combo.findText(current_text)
-        if index >= 0:
-            self.type_combo.setCurrentIndex(index)
-        else:
+    def on_genre_added(self, genre, position):
+        # Position 0 of the combo is "Hepsi"
+        self.type_combo.insertItem(position + 1, genre, genre)
+        self.update_genre_counts()
+
+    def on_genre_removed(self, genre, position):
+        index = self.type_combo.findData(genre)
+        if index < 0:
+            return
+        if index == self.type_combo.currentIndex():
             self.type_combo.setCurrentIndex(0)
+        self.type_combo.removeItem(index)
+
+    def fill_genre_combo(self):
+        """Add "Hepsi" and every genre to the combo, with the genre as item data."""
+        self.type_combo.addItem("Hepsi", "Hepsi")
+        for genre in genre_registry.genres():
+            self.type_combo.addItem(genre, genre)
+        self.update_genre_counts()
+
+    def current_genre(self):
+        return self.type_combo.currentData() or "Hepsi"
+
+    def on_genre_selected(self, index):
+        self.filter_by_type(self.current_genre())
+
+    def on_collection_changed(self, change):
+        current_type = self.data_manager.current_type
+        if TYPE_COLLECTIONS.get(current_type) != change.collection:
+            return
+        self.update_genre_counts()
+        # An empty collection is not shown at all, so its first item needs a full refresh
+        if change.inserted and self.table_widget.table_model.current_type != current_type:
+            self.filter_by_type(self.current_genre())
+
+    def update_genre_counts(self):
+        """Show per-genre item counts of the current collection next to each genre."""
+        if self.data_manager.current_type:
+            counts = self.data_manager.genre_counts(self.data_manager.current_type)
+            total = len(self.data_manager.current_items)
+        else:
+            counts, total = None, None
+            
+        for index in range(self.type_combo.count()):
+            genre = self.type_combo.itemData(index)
+            if counts is None:
+                label = genre
+            elif genre == "Hepsi":
+                label = f"Hepsi ({total})"
+            else:
+                label = f"{genre} ({counts.get(genre, 0)})"
+            self.type_combo.setItemText(index, label)
+
+    def show_statistics(self):
+        if self.statistics_dialog is None:
+            self.statistics_dialog = StatisticsDialog(self.data_manager, self)
+        self.statistics_dialog.show()
+        self.statistics_dialog.raise_()
 
     def get_current_type_turkish(self):
         """Get the Turkish name for the current type."""
@@ -155,7 +214,7 @@ class ButtonPanel(QWidget):
 
     def get_current_filter_turkish(self):
         """Get the current filter in Turkish."""
-        current_filter = self.type_combo.currentText()
+        current_filter = self.current_genre()
         return "HEPSİ" if current_filter == "Hepsi" else current_filter
 
     def format_current_date(self):
@@ -166,32 +225,24 @@ class ButtonPanel(QWidget):
     # Add this method to your class to get filtered items
     def get_filtered_items(self):
         """Return the currently filtered/displayed items based on selected genre/filter."""
-        current_filter = self.type_combo.currentText()
-        current_type = self.data_manager.current_type
-        
-        # Filter items based on genre/type
-        filtered_items = []
-        for item in self.data_manager.current_items:
-            if current_filter == "Hepsi":
-                filtered_items.append(item)
-            elif item.get("Tür") == current_filter:
-                filtered_items.append(item)
-                
-        return filtered_items
+        current_filter = self.current_genre()
+        if current_filter == "Hepsi" or not self.data_manager.current_type:
+            return list(self.data_manager.current_items)
+        return self.data_manager.items_by_genre(self.data_manager.current_type, current_filter)
 
+    @timed("filter.view")
     def filter_by_type(self, selected_type):
         if not self.data_manager.current_items or not self.data_manager.current_type:
             return
             
         if selected_type == "Hepsi":
             filtered_items = self.data_manager.current_items
+            matches = None
         else:
-            filtered_items = [
-                item for item in self.data_manager.current_items 
-                if item.get('Tür', '') == selected_type
-            ]
+            filtered_items = self.data_manager.items_by_genre(self.data_manager.current_type, selected_type)
+            matches = lambda item: item.get('Tür') == selected_type
             
-        self.table_widget.update_table(filtered_items, self.data_manager.current_type)
+        self.table_widget.update_table(filtered_items, self.data_manager.current_type, matches)
         
     def show_books(self):
         try:
@@ -199,7 +250,8 @@ class ButtonPanel(QWidget):
                 QMessageBox.information(self, "Bilgi", "Henüz kitap kaydı bulunmamaktadır.")
             self.data_manager.current_type = 'book'
             self.data_manager.current_items = self.data_manager.books
-            self.filter_by_type(self.type_combo.currentText())
+            self.update_genre_counts()
+            self.filter_by_type(self.current_genre())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Kitaplar listelenirken hata oluştu: {str(e)}")
             
@@ -209,7 +261,8 @@ class ButtonPanel(QWidget):
                 QMessageBox.information(self, "Bilgi", "Henüz makale kaydı bulunmamaktadır.")
             self.data_manager.current_type = 'article'
             self.data_manager.current_items = self.data_manager.articles
-            self.filter_by_type(self.type_combo.currentText())
+            self.update_genre_counts()
+            self.filter_by_type(self.current_genre())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Makaleler listelenirken hata oluştu: {str(e)}")
             
@@ -219,7 +272,8 @@ class ButtonPanel(QWidget):
                 QMessageBox.information(self, "Bilgi", "Henüz dergi kaydı bulunmamaktadır.")
             self.data_manager.current_type = 'magazine'
             self.data_manager.current_items = self.data_manager.magazines
-            self.filter_by_type(self.type_combo.currentText())
+            self.update_genre_counts()
+            self.filter_by_type(self.current_genre())
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Dergiler listelenirken hata oluştu: {str(e)}")
         
@@ -254,47 +308,140 @@ class ButtonPanel(QWidget):
                 )
                 
                 if file_path:
-                    success, message = self.data_manager.import_excel(file_path, data_type)
-                    if success:
-                        QMessageBox.information(self, "Başarılı", message)
-                        # Update the display based on the imported data type
-                        if data_type == 'kitap':
-                            self.show_books()
-                        elif data_type == 'makale':
-                            self.show_articles()
-                        else:
-                            self.show_magazines()
-                    else:
-                        QMessageBox.warning(self, "Hata", message)
+                    started = time.perf_counter()
+                    collection = self.data_manager.prepare_import(data_type)
+
+                    def work(progress):
+                        _, records = self.data_manager.read_excel_records(file_path, data_type, progress)
+                        # Duplicate checking is the slow part of applying a large import
+                        report = self.data_manager.check_import(collection, records, progress)
+                        return collection, records, report
+
+                    self.run_job(
+                        "Excel verisi yükleniyor...",
+                        work,
+                        lambda result: self.finish_import(data_type, result, started),
+                        "Veri yükleme hatası"
+                    )
                         
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Excel içe aktarma hatası: {str(e)}")
 
+    def finish_import(self, data_type, result, started):
+        """Apply a finished background import to the data manager in one step."""
+        collection, records, report = result
+        message = self.data_manager.apply_import(collection, records, started, report=report)
+        QMessageBox.information(self, "Başarılı", message)
+        # Update the display based on the imported data type
+        if data_type == 'kitap':
+            self.show_books()
+        elif data_type == 'makale':
+            self.show_articles()
+        else:
+            self.show_magazines()
+
+    def run_job(self, label, work, on_finished, error_title):
+        """Run work(progress) off the GUI thread behind a cancellable progress dialog."""
+        dialog = QProgressDialog(label, "İptal", 0, 0, self)
+        dialog.setWindowTitle("Lütfen Bekleyin")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(300)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+
+        # Everything is connected before the job is queued, so no signal of a
+        # job that ends at once is emitted into nothing
+        job = Job(work)
+        self.jobs.add(job)
+
+        def on_progress(done, total):
+            dialog.setMaximum(total)
+            dialog.setValue(done)
+
+        def finish():
+            self.jobs.discard(job)
+            dialog.close()
+
+        def on_success(result):
+            finish()
+            on_finished(result)
+
+        def on_failure(message):
+            finish()
+            QMessageBox.warning(self, "Hata", f"{error_title}: {message}")
+
+        job.signals.progress.connect(on_progress)
+        job.signals.finished.connect(on_success)
+        job.signals.failed.connect(on_failure)
+        job.signals.cancelled.connect(finish)
+        dialog.canceled.connect(job.cancel)
+        job.start()
+        return job
+
     def search_items(self, text):
         """Filter items based on search text"""
         if not self.data_manager.current_items:
+            self.search_pipeline.cancel()
             return
             
         if not text:
-            self.filter_by_type(self.type_combo.currentText())
+            self.search_pipeline.cancel()
+            self.filter_by_type(self.current_genre())
             return
             
-        text = text.lower()
-        filtered_items = []
-        
-        for item in self.data_manager.current_items:
-            # Search in all text fields
-            for value in item.values():
-                if isinstance(value, str) and text in value.lower():
-                    filtered_items.append(item)
-                    break
-                    
-        self.table_widget.update_table(filtered_items, self.data_manager.current_type)
+        # Runs once typing pauses; see SearchPipeline
+        self.search_pipeline.submit(self.data_manager.current_type, text)
+
+    def show_search_results(self, current_type, filtered_items):
+        # Drop results for a collection the user has since switched away from
+        text = self.search_input.text()
+        if current_type == self.data_manager.current_type and text:
+            self.table_widget.update_table(filtered_items, current_type, lambda item: item_matches(item, text))
+
+    def pdf_layout(self, current_type):
+        """Return the PDF table headers and column proportions for an item type."""
+        if current_type == 'magazine':
+            headers = ["Sıra", "Dergi", "Sayı", "Cilt", "Tarih", "Başlama", "Bitirme"]
+            col_props = [0.05, 0.24, 0.09, 0.09, 0.17, 0.17, 0.19]
+        else:
+            headers = ["Sıra", "Yazar", 
+                    "Kitap" if current_type == 'book' else "Makale",
+                    "Tür", "Başlama", "Bitirme"]
+            col_props = [0.05, 0.22, 0.33, 0.15, 0.125, 0.125]
+        return headers, col_props
+
+    def pdf_rows(self, items, current_type):
+        """Yield the PDF cells of each item as they are needed.
+
+        Runs on the export job's thread, so current_type is passed in as it
+        was when the export started rather than read as rows are taken.
+        """
+        for i, item in enumerate(items, start=1):
+            if current_type == 'magazine':
+                yield [
+                    str(i),
+                    str(item.get("Dergi", "")),
+                    str(item.get("Sayı", "")),
+                    str(item.get("Cilt", "")),
+                    display_month(str(item.get("Tarih", ""))),
+                    str(item.get("Başlama Tarihi", "")),
+                    str(item.get("Bitirme Tarihi", ""))
+                ]
+            else:
+                yield [
+                    str(i),
+                    str(item.get("Yazar", "")),
+                    str(item.get("Kitap" if current_type == 'book' else "Makale", "")),
+                    str(item.get("Tür", "")),
+                    str(item.get("Başlama Tarihi", "")),
+                    str(item.get("Bitirme Tarihi", ""))
+                ]
 
     def export_to_pdf(self):
         try:
             # Get the currently filtered/displayed items instead of all items
-            filtered_items = self.get_filtered_items()  # You'll need to implement this method
+            filtered_items = self.get_filtered_items()
+            current_type = self.data_manager.current_type
             
             if not filtered_items:
                 QMessageBox.warning(self, "Uyarı", "Listelenecek veri bulunamadı!")
@@ -305,236 +452,57 @@ class ButtonPanel(QWidget):
             )
             
             if file_path:
-                pdfmetrics.registerFont(TTFont('TimesNewRoman', 'times.ttf'))
-                pdf = canvas.Canvas(file_path, pagesize=A4)
-                width, height = A4
-                
-                # Set margins and spacing - reduce margins to make table wider
-                left_margin = 1.5 * cm  # Reduced from 3cm
-                right_margin = 1.5 * cm  # Reduced from 3cm
-                top_margin = 1.2 * cm
-                bottom_margin = 1.2 * cm
-                line_height = 15  # Adjusted for better spacing
-                
-                usable_width = width - left_margin - right_margin
-                
-                def draw_title(y_pos):
-                    pdf.setFont("TimesNewRoman", 16)
-                    title = "Kütüphane Yönetim Sistemi"
-                    title_width = pdf.stringWidth(title, "TimesNewRoman", 16)
-                    # Ensure title is centered properly with more space on sides
-                    pdf.drawString((width - title_width) / 2, y_pos, title)
-                    
-                    # Fixed spacing for subtitle
-                    y_pos -= 35
-                    
-                    # Get the current filter/genre
-                    current_type = self.get_current_type_turkish()
-                    current_filter = self.get_current_filter_turkish()
-                    current_date = self.format_current_date()
-                    
-                    subtitle = f"{current_type} – {current_filter} – {current_date}"
-                    pdf.setFont("TimesNewRoman", 11)
-                    subtitle_width = pdf.stringWidth(subtitle, "TimesNewRoman", 11)
-                    pdf.drawString((width - subtitle_width) / 2, y_pos, subtitle)
-                    
-                    # Fixed return value with consistent spacing
-                    return y_pos - 35  # Consistent spacing after subtitle
-
-                if self.data_manager.current_type == 'magazine':
-                    headers = ["Sıra", "Dergi", "Sayı", "Cilt", "Tarih", "Başlama", "Bitirme"]
-                    # Adjusted column proportions for wider table
-                    col_props = [0.05, 0.24, 0.09, 0.09, 0.17, 0.17, 0.19]
-                else:
-                    headers = ["Sıra", "Yazar", 
-                            "Kitap" if self.data_manager.current_type == 'book' else "Makale",
-                            "Tür", "Başlama", "Bitirme"]
-                    col_props = [0.05, 0.22, 0.33, 0.15, 0.125, 0.125]  # Adjusted for wider display
-
-                col_widths = [prop * usable_width for prop in col_props]
-
-                def wrap_text(text, width, font_name, font_size):
-                    """Improved text wrapping function to handle long text properly."""
-                    pdf.setFont(font_name, font_size)
-                    text = str(text)
-                    
-                    # Handle very long words by breaking them if necessary
-                    words = []
-                    for word in text.split():
-                        if pdf.stringWidth(word, font_name, font_size) > width - 10:
-                            # Break long word into chunks
-                            current_word = ""
-                            for char in word:
-                                if pdf.stringWidth(current_word + char, font_name, font_size) > width - 20:
-                                    words.append(current_word + "-")
-                                    current_word = char
-                                else:
-                                    current_word += char
-                            if current_word:
-                                words.append(current_word)
-                        else:
-                            words.append(word)
-                    
-                    lines = []
-                    current_line = []
-                    
-                    for word in words:
-                        test_line = current_line + [word]
-                        line_width = pdf.stringWidth(' '.join(test_line), font_name, font_size)
-                        
-                        if line_width > width - 10:  # 10 points padding
-                            if current_line:  # Only add if we have content
-                                lines.append(' '.join(current_line))
-                                current_line = [word]
-                            else:
-                                # Word is too long for a line by itself
-                                lines.append(word)
-                        else:
-                            current_line = test_line
-                    
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    
-                    # Ensure we have at least one line
-                    if not lines:
-                        lines = [""]
-                        
-                    return lines
-
-                def draw_wrapped_cell(pdf, text, x, y, width, height, font_name, font_size):
-                    """Draw cell text with wrapping and vertical centering."""
-                    lines = wrap_text(text, width, font_name, font_size)
-                    total_lines_height = len(lines) * line_height
-                    
-                    # Calculate starting position to center text vertically
-                    start_y = y - (height - total_lines_height) / 2
-                    if start_y > y - line_height:
-                        start_y = y - line_height  # Ensure we start with enough space from top
-                    
-                    # Draw each line of text
-                    current_y = start_y
-                    for line in lines:
-                        text_width = pdf.stringWidth(line, font_name, font_size)
-                        x_centered = x + (width - text_width) / 2
-                        
-                        # Only draw if within cell bounds
-                        if current_y > y - height + 2:  # Add a small buffer (2 points)
-                            pdf.drawString(x_centered, current_y, line)
-                        
-                        current_y -= line_height
-
-                def calculate_row_height(row_data, widths, font_name, font_size):
-                    """Calculate the maximum height needed for the row."""
-                    max_height = line_height
-                    for text, width in zip(row_data, widths):
-                        lines = wrap_text(text, width, font_name, font_size)
-                        height = len(lines) * line_height
-                        max_height = max(max_height, height)
-                    return max_height + 8  # Added slightly more padding for readability
-
-                def draw_header(y_pos):
-                    header_height = 20
-                    
-                    # Draw header background
-                    pdf.setFillColor(colors.Color(0.9, 0.9, 0.9))
-                    pdf.rect(left_margin, y_pos - header_height, usable_width, header_height, fill=True, stroke=True)
-                    
-                    # Draw header text - ensure perfect alignment with columns
-                    pdf.setFillColor(colors.black)
-                    pdf.setFont("TimesNewRoman", 12)
-                    
-                    x_position = left_margin
-                    for i, (header, width) in enumerate(zip(headers, col_widths)):
-                        # Draw cell borders
-                        pdf.rect(x_position, y_pos - header_height, width, header_height, stroke=True)
-                        
-                        # Center text in header cell
-                        header_width = pdf.stringWidth(header, "TimesNewRoman", 12)
-                        x_centered = x_position + (width - header_width) / 2
-                        y_centered = y_pos - (header_height / 2) - 2
-                        
-                        pdf.drawString(x_centered, y_centered, header)
-                        x_position += width
-                    
-                    # Return a consistent position
-                    return y_pos - header_height - 5  # Consistent spacing after header
-
-                # Variable to track if we're on the first page
-                is_first_page = True
-                
-                def new_page():
-                    nonlocal is_first_page
-                    pdf.showPage()
-                    
-                    # Start from the same position on each new page
-                    y_pos = height - top_margin
-                    
-                    # Only draw title on the first page
-                    if is_first_page:
-                        y_pos = draw_title(y_pos)
-                        is_first_page = False
-                        
-                    return draw_header(y_pos)
-
-                y_position = height - top_margin
-                # Draw title only on the first page
-                y_position = draw_title(y_position)
-                # Mark that we've passed the first page for subsequent new pages
-                is_first_page = False
-                y_position = draw_header(y_position)
-
-                # Use filtered items instead of all items
-                for i, item in enumerate(filtered_items, start=1):
-                    if self.data_manager.current_type == 'magazine':
-                        row_data = [
-                            str(i),
-                            str(item.get("Dergi", "")),
-                            str(item.get("Sayı", "")),
-                            str(item.get("Cilt", "")),
-                            str(item.get("Tarih", "")),
-                            str(item.get("Başlama Tarihi", "")),
-                            str(item.get("Bitirme Tarihi", ""))
-                        ]
-                    else:
-                        row_data = [
-                            str(i),
-                            str(item.get("Yazar", "")),
-                            str(item.get("Kitap" if self.data_manager.current_type == 'book' else "Makale", "")),
-                            str(item.get("Tür", "")),
-                            str(item.get("Başlama Tarihi", "")),
-                            str(item.get("Bitirme Tarihi", ""))
-                        ]
-
-                    row_height = calculate_row_height(row_data, col_widths, "TimesNewRoman", 10)
-
-                    # Check if we need a new page (with some buffer space to avoid tight fits)
-                    if y_position - row_height < bottom_margin + 5:
-                        y_position = new_page()
-
-                    # Draw row background for even rows
-                    if i % 2 == 0:
-                        pdf.setFillColor(colors.Color(0.95, 0.95, 0.95))
-                        pdf.rect(left_margin, y_position - row_height, usable_width, row_height, fill=True, stroke=True)
-
-                    # Draw cell contents
-                    x_position = left_margin
-                    for text, width in zip(row_data, col_widths):
-                        # Draw cell border explicitly for each cell
-                        pdf.setFillColor(colors.black)
-                        pdf.rect(x_position, y_position - row_height, width, row_height, stroke=True)
-                        
-                        # Draw text with proper vertical alignment
-                        draw_wrapped_cell(
-                            pdf, text, x_position, y_position, width, row_height,
-                            "TimesNewRoman", 10
+                headers, col_props = self.pdf_layout(current_type)
+                subtitle = f"{self.get_current_type_turkish()} – {self.get_current_filter_turkish()} – {self.format_current_date()}"
+                rows = self.pdf_rows(filtered_items, current_type)
+                total = len(filtered_items)
+
+                def export(progress):
+                    # reportlab is only imported once a PDF is actually exported
+                    from src.pdf_export import PdfTableExporter
+                    with measure("export.pdf"):
+                        exporter = PdfTableExporter(
+                            file_path, headers, col_props, "Kütüphane Yönetim Sistemi", subtitle
                         )
-                        
-                        x_position += width
+                        exporter.export(rows, total, progress)
+
+                self.run_job(
+                    "PDF oluşturuluyor...",
+                    export,
+                    lambda result: QMessageBox.information(self, "Başarılı", "PDF başarıyla oluşturuldu!"),
+                    "PDF oluşturma hatası"
+                )
+
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"PDF oluşturma hatası: {str(e)}")
 
-                    y_position -= row_height
+    def export_to_excel(self):
+        try:
+            # Export the rows the table shows: filtered, searched and sorted as on screen
+            current_type = self.table_widget.table_model.current_type
+            items = self.table_widget.table_model.items
 
-                pdf.save()
-                QMessageBox.information(self, "Başarılı", "PDF başarıyla oluşturuldu!")
+            if not items or not current_type:
+                QMessageBox.warning(self, "Uyarı", "Aktarılacak veri bulunamadı!")
+                return
+
+            file_path, _ = QFileDialog.getSaveFileName(
+                self, "Excel Olarak Kaydet", "", "Excel Files (*.xlsx)"
+            )
+
+            if file_path:
+                if not file_path.lower().endswith('.xlsx'):
+                    file_path += '.xlsx'
+                # Only references to the records; the view may change while the job runs
+                rows = list(items)
+                self.run_job(
+                    "Excel dosyası oluşturuluyor...",
+                    lambda progress: self.data_manager.write_excel_records(file_path, current_type, rows, progress),
+                    lambda count: QMessageBox.information(
+                        self, "Başarılı", f"{count} kayıt Excel dosyasına aktarıldı!"
+                    ),
+                    "Excel oluşturma hatası"
+                )
 
         except Exception as e:
-            QMessageBox.critical(self, "Hata", f"PDF oluşturma hatası: {str(e)}")
\ No newline at end of file
+            QMessageBox.critical(self, "Hata", f"Excel oluşturma hatası: {str(e)}")
@@ -0,0 +1,84 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                           QPushButton, QCheckBox, QFileDialog, QMessageBox, QHeaderView)
+from PyQt5.QtCore import Qt, QTimer
+from src import instrumentation
+
+# (header, summary key) of each column after the operation name
+COLUMNS = [
+    ("Çağrı", 'count'),
+    ("Ortalama (ms)", 'mean_ms'),
+    ("p50 (ms)", 'p50_ms'),
+    ("p90 (ms)", 'p90_ms'),
+    ("p99 (ms)", 'p99_ms'),
+    ("En uzun (ms)", 'max_ms'),
+    ("Toplam (ms)", 'total_ms')
+]
+
+REFRESH_MS = 1000
+
+
+class DiagnosticsDialog(QDialog):
+    """Hidden performance panel (Ctrl+Shift+D) showing the instrumentation numbers."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Tanılama")
+        self.resize(820, 420)
+        self.setup_ui()
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.enabled_box = QCheckBox("Ölçüm açık")
+        self.enabled_box.setChecked(instrumentation.enabled())
+        self.enabled_box.toggled.connect(instrumentation.enable)
+
+        self.table = QTableWidget(0, len(COLUMNS) + 1)
+        self.table.setHorizontalHeaderLabels(["İşlem"] + [header for header, _ in COLUMNS])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+
+        reset_btn = QPushButton("Sıfırla")
+        reset_btn.clicked.connect(self.reset)
+        save_btn = QPushButton("JSON Kaydet")
+        save_btn.clicked.connect(self.save_json)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.enabled_box)
+        button_layout.addStretch()
+        button_layout.addWidget(reset_btn)
+        button_layout.addWidget(save_btn)
+
+        layout.addLayout(button_layout)
+        layout.addWidget(self.table)
+
+    def refresh(self):
+        operations = instrumentation.snapshot()
+        self.table.setRowCount(len(operations))
+        for row, (name, summary) in enumerate(operations.items()):
+            self.table.setItem(row, 0, QTableWidgetItem(name))
+            for column, (_, key) in enumerate(COLUMNS, start=1):
+                value = summary[key]
+                cell = QTableWidgetItem(str(value) if key == 'count' else f"{value:.2f}")
+                cell.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, cell)
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def save_json(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "JSON Olarak Kaydet", "", "JSON Files (*.json)")
+        if not file_path:
+            return
+        try:
+            instrumentation.dump(file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Hata", f"Tanılama verisi kaydedilemedi: {str(e)}")
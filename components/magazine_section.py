@@ -34,5 +34,7 @@ class MagazineSection(BaseSection):
             
         magazine_data = {key: input_field.text() for key, input_field in self.inputs.items()}
         magazine_data['type'] = 'magazine'
+        if not self.confirm_not_duplicate('magazine', magazine_data):
+            return
         self.data_manager.add_magazine(magazine_data)
         self.clear_inputs()
\ No newline at end of file
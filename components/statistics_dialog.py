@@ -0,0 +1,101 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                           QComboBox, QLabel, QTabWidget, QHeaderView)
+from PyQt5.QtCore import Qt
+from src.dates import display_month
+from data_manager import TYPE_COLLECTIONS
+
+TYPES = [("Kitaplar", 'book'), ("Makaleler", 'article'), ("Dergiler", 'magazine')]
+
+# (tab title, ReadingStats dimension, header of the key column)
+TABS = [
+    ("Yıllara Göre", 'year', "Yıl"),
+    ("Aylara Göre", 'month', "Ay"),
+    ("Türlere Göre", 'genre', "Tür"),
+    ("Yazarlara Göre", 'author', "Yazar")
+]
+
+
+def format_key(dimension, key):
+    if dimension == 'month':
+        return display_month(f"{key % 100:02d}/{key // 100}")
+    return str(key) if key != '' else "(boş)"
+
+
+def format_days(days):
+    return "-" if days is None else f"{days:.1f}"
+
+
+class StatisticsDialog(QDialog):
+    """Reading statistics per year, month, genre and author.
+
+    The numbers are kept up to date by DataManager as items come and go, so
+    opening the dialog or switching tabs only formats what is on screen.
+    """
+
+    def __init__(self, data_manager, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self.setWindowTitle("Okuma İstatistikleri")
+        self.resize(640, 480)
+        self.setup_ui()
+        self.data_manager.collection_changed.connect(self.on_collection_changed)
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.type_combo = QComboBox()
+        for label, _ in TYPES:
+            self.type_combo.addItem(label)
+        self.type_combo.currentIndexChanged.connect(self.refresh)
+        self.total_label = QLabel()
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(self.type_combo)
+        top_layout.addWidget(self.total_label)
+        top_layout.addStretch()
+
+        self.tabs = QTabWidget()
+        self.tables = []
+        for title, _, key_header in TABS:
+            table = QTableWidget(0, 3)
+            table.setHorizontalHeaderLabels([key_header, "Kayıt", "Ort. Okuma Süresi (gün)"])
+            table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+            table.verticalHeader().setVisible(False)
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            self.tabs.addTab(table, title)
+            self.tables.append(table)
+        self.tabs.currentChanged.connect(self.refresh)
+
+        layout.addLayout(top_layout)
+        layout.addWidget(self.tabs)
+
+    def current_type(self):
+        return TYPES[self.type_combo.currentIndex()][1]
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+
+    def on_collection_changed(self, change):
+        if self.isVisible() and change.collection == TYPE_COLLECTIONS[self.current_type()]:
+            self.refresh()
+
+    def refresh(self):
+        stats = self.data_manager.statistics(self.current_type())
+        count, days = stats.total()
+        self.total_label.setText(f"Toplam {count} kayıt, ortalama okuma süresi {format_days(days)} gün")
+
+        # Only the visible tab is filled; the others are filled when shown
+        position = self.tabs.currentIndex()
+        _, dimension, _ = TABS[position]
+        table = self.tables[position]
+        rows = stats.summary(dimension)
+        table.setUpdatesEnabled(False)
+        table.setRowCount(len(rows))
+        for row, (key, items, average) in enumerate(rows):
+            table.setItem(row, 0, QTableWidgetItem(format_key(dimension, key)))
+            for column, text in ((1, str(items)), (2, format_days(average))):
+                cell = QTableWidgetItem(text)
+                cell.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, cell)
+        table.setUpdatesEnabled(True)
@@ -0,0 +1,254 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from src.dates import display_month
+from src.paged_collection import PagedCollection
+
+# Column layout per item type: (header, record field, centered, month/year date)
+# A field of None is the running "Sıra No" column
+COLUMNS = {
+    None: [
+        ("Sıra No", None, True, False),
+        ("Yazar", 'Yazar', False, False),
+        ("Kitap/Makale/Dergi", None, False, False),
+        ("Tür", 'Tür', False, False),
+        ("Başlama Tarihi", 'Başlama Tarihi', True, False),
+        ("Bitirme Tarihi", 'Bitirme Tarihi', True, False)
+    ],
+    'book': [
+        ("Sıra No", None, True, False),
+        ("Yazar", 'Yazar', False, False),
+        ("Kitap", 'Kitap', False, False),
+        ("Tür", 'Tür', False, False),
+        ("Başlama Tarihi", 'Başlama Tarihi', True, False),
+        ("Bitirme Tarihi", 'Bitirme Tarihi', True, False)
+    ],
+    'article': [
+        ("Sıra No", None, True, False),
+        ("Yazar", 'Yazar', False, False),
+        ("Makale", 'Makale', False, False),
+        ("Tür", 'Tür', False, False),
+        ("Başlama Tarihi", 'Başlama Tarihi', True, False),
+        ("Bitirme Tarihi", 'Bitirme Tarihi', True, False)
+    ],
+    'magazine': [
+        ("Sıra No", None, True, False),
+        ("Dergi", 'Dergi', False, False),
+        ("Sayı", 'Sayı', True, False),
+        ("Cilt", 'Cilt', True, False),
+        ("Tarih", 'Tarih', True, True),
+        ("Başlama Tarihi", 'Başlama Tarihi', True, False),
+        ("Bitirme Tarihi", 'Bitirme Tarihi', True, False)
+    ]
+}
+
+# Beyond this many changed row ranges a model reset is cheaper than per-range signals
+MAX_ROW_RANGES = 64
+
+
+class LibraryTableModel(QAbstractTableModel):
+    """Read-only model over a list of library records.
+
+    Cells are only formatted when the view asks for them in data(), so the
+    cost of showing a collection does not grow with its size. A collection
+    that is not loaded yet is shown as is, so only the pages of rows the view
+    paints are ever read.
+
+    Change sets find their rows through an id -> row map, built the first
+    time one arrives for the rows shown. Rows inserted or removed after that
+    are logged as shifts that lookups replay, rather than renumbering every
+    row behind them, and the map is rebuilt once MAX_ROW_RANGES shifts have
+    piled up, so a change costs about as much as the rows it names.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self.rows = 0  # Fixed when items are set; a shown collection may grow underneath
+        self.current_type = None
+        self.columns = COLUMNS[None]
+        self._ids = None  # Id of each row, alongside _row_of
+        self._row_of = None  # id -> (row, len(_shifts) then); None until a change set needs it
+        self._shifts = []  # (position, rows inserted, or removed if negative) since _row_of was built
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columns[section][0]
+        return QVariant()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.items):
+            return QVariant()
+
+        _, field, centered, month_year = self.columns[index.column()]
+        if role == Qt.DisplayRole:
+            if field is None:
+                return str(index.row() + 1) if index.column() == 0 else ""
+            value = str(self.items[index.row()].get(field, ''))
+            return display_month(value) if month_year else value
+        if role == Qt.TextAlignmentRole and centered:
+            return Qt.AlignCenter
+        return QVariant()
+
+    def item_at(self, row):
+        return self.items[row]
+
+    def set_items(self, items, current_type):
+        """Show items, signalling only the rows that appeared or disappeared."""
+        # A collection shown unloaded is live data; never diff or edit it in place
+        paged = is_unloaded(items) or isinstance(self.items, PagedCollection)
+        if not is_unloaded(items):
+            items = list(items)
+        if current_type != self.current_type or paged:
+            self.beginResetModel()
+            self.current_type = current_type
+            self.columns = COLUMNS.get(current_type, COLUMNS['book'])
+            self.items = items
+            self.rows = len(items)
+            self._row_of = None
+            self.endResetModel()
+            return
+
+        if len(items) <= len(self.items):
+            runs = missing_runs(self.items, items)
+            if runs is not None and len(runs) <= MAX_ROW_RANGES:
+                self._remove_runs(runs)
+                return
+        else:
+            runs = missing_runs(items, self.items)
+            if runs is not None and len(runs) <= MAX_ROW_RANGES:
+                self._insert_runs(runs, items)
+                return
+
+        self.beginResetModel()
+        self.items = items
+        self.rows = len(items)
+        self._row_of = None
+        self.endResetModel()
+
+    def insert_item(self, row, item):
+        """Insert one item at row."""
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.items.insert(row, item)
+        self.rows = len(self.items)
+        self._shift_rows(row, [item])
+        self.endInsertRows()
+        self._renumber_from(row)
+
+    def remove_ids(self, ids):
+        """Remove the rows of the items with the given ids; returns the items removed."""
+        rows = sorted(row for row in map(self.row_of, ids) if row is not None)
+        removed = [self.items[row] for row in rows]
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+        if len(runs) <= MAX_ROW_RANGES:
+            self._remove_runs(runs)
+        else:
+            self.beginResetModel()
+            self.items = [item for row, item in enumerate(self.items) if self._ids[row] not in ids]
+            self.rows = len(self.items)
+            self._row_of = None
+            self.endResetModel()
+        return removed
+
+    def refresh_ids(self, ids):
+        """Repaint the rows of the items with the given ids."""
+        last_column = len(self.columns) - 1
+        for row in map(self.row_of, ids):
+            if row is not None:
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+    def row_of(self, item_id):
+        """Return the row showing the item with item_id, or None."""
+        if self._row_of is None or len(self._shifts) > MAX_ROW_RANGES:
+            if self._ids is None or self._row_of is None:
+                self._ids = [item['id'] for item in self.items]
+            self._row_of = {item_id: (row, 0) for row, item_id in enumerate(self._ids)}
+            self._shifts = []
+        entry = self._row_of.get(item_id)
+        if entry is None:
+            return None
+        row, seen = entry
+        # Replay the row moves made since the entry was written
+        for position, count in self._shifts[seen:]:
+            if row >= (position if count > 0 else position - count):
+                row += count
+        return row
+
+    def _shift_rows(self, position, inserted=(), removed=0):
+        """Keep the id -> row map current after rows were inserted or removed at position."""
+        if self._row_of is None:
+            return
+        if removed:
+            for item_id in self._ids[position:position + removed]:
+                del self._row_of[item_id]
+            del self._ids[position:position + removed]
+            self._shifts.append((position, -removed))
+        if inserted:
+            ids = [item['id'] for item in inserted]
+            self._ids[position:position] = ids
+            self._shifts.append((position, len(ids)))
+            seen = len(self._shifts)
+            for offset, item_id in enumerate(ids):
+                self._row_of[item_id] = (position + offset, seen)
+
+    def _remove_runs(self, runs):
+        for start, end in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), start, end)
+            del self.items[start:end + 1]
+            self.rows = len(self.items)
+            self._shift_rows(start, removed=end - start + 1)
+            self.endRemoveRows()
+        if runs:
+            self._renumber_from(runs[0][0])
+
+    def _insert_runs(self, runs, items):
+        for start, end in runs:
+            self.beginInsertRows(QModelIndex(), start, end)
+            self.items[start:start] = items[start:end + 1]
+            self.rows = len(self.items)
+            self._shift_rows(start, items[start:end + 1])
+            self.endInsertRows()
+        if runs:
+            self._renumber_from(runs[0][0])
+
+    def _renumber_from(self, row):
+        """Refresh the Sıra No cells that shifted after a row change."""
+        if row < len(self.items):
+            self.dataChanged.emit(self.index(row, 0), self.index(len(self.items) - 1, 0))
+
+
+def is_unloaded(items):
+    return isinstance(items, PagedCollection) and not items.loaded
+
+
+def missing_runs(longer, shorter):
+    """Return (start, end) ranges of positions in longer whose records are not in shorter.
+
+    Records are matched by identity in order. Returns None if shorter is not a
+    subsequence of longer.
+    """
+    runs = []
+    run_start = None
+    j = 0
+    for i, item in enumerate(longer):
+        if j < len(shorter) and item is shorter[j]:
+            j += 1
+            if run_start is not None:
+                runs.append((run_start, i - 1))
+                run_start = None
+        elif run_start is None:
+            run_start = i
+    if j < len(shorter):
+        return None
+    if run_start is not None:
+        runs.append((run_start, len(longer) - 1))
+    return runs
@@ -1,20 +1,34 @@
-from PyQt5.QtWidgets import (QTableWidget, QTableWidgetItem, QPushButton, 
+from PyQt5.QtWidgets import (QTableView, QPushButton, 
                            QHeaderView, QWidget, QHBoxLayout, QMessageBox,
-                           QAbstractItemView, QSizePolicy)
+                           QAbstractItemView, QSizePolicy, QApplication)
 from PyQt5.QtCore import Qt
-from datetime import datetime
-from src.constants import TURKISH_MONTHS
 from PyQt5.QtGui import QIcon
+from .table_model import COLUMNS, MAX_ROW_RANGES, LibraryTableModel
+from src.paged_collection import PagedCollection
+from data_manager import TYPE_COLLECTIONS
+from src.instrumentation import timed
 
-class TableWidget(QTableWidget):
+# Column widths per item type; the stretch column fills the remaining space
+COLUMN_WIDTHS = {
+    'magazine': ([70, 200, 80, 80, 120, 120, 120], 1),
+    'default': ([70, 200, 250, 150, 120, 120], 2)
+}
+
+class TableWidget(QTableView):
     def __init__(self, data_manager):
         super().__init__()
         self.data_manager = data_manager
+        self.table_model = LibraryTableModel(self)
+        self.setModel(self.table_model)
+        self.source_items = []  # Items as given to update_table, before sorting
+        self.sort_order = []  # (field, descending), most significant first
+        self.matches = None  # Whether an item added later belongs in the view; None = all do
         self.setup_ui()
+        self.data_manager.collection_changed.connect(self.on_collection_changed)
         
     def setup_ui(self):
         self.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 border: 1px solid #ddd;
                 border-radius: 5px;
                 background: white;
@@ -26,7 +40,7 @@ class TableWidget(QTableWidget):
                 border: 1px solid #ddd;
                 font-weight: bold;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
             QPushButton {
@@ -48,30 +62,18 @@ class TableWidget(QTableWidget):
         self.setSelectionMode(QAbstractItemView.MultiSelection)
         self.setSelectionBehavior(QAbstractItemView.SelectRows)
         
-        # Initialize with default columns
-        self.setColumnCount(6)
-        self.setHorizontalHeaderLabels([
-            "Sıra No", "Yazar", "Kitap/Makale/Dergi", "Tür", 
-            "Başlama Tarihi", "Bitirme Tarihi"
-        ])
-        
         # Set header properties
         header = self.horizontalHeader()
         header.setDefaultAlignment(Qt.AlignLeft)
         
+        # Click a header to sort by it, click again to reverse; Shift+click adds
+        # a further sort column. The Sıra No header restores the original order
+        header.setSectionsClickable(True)
+        header.sectionClicked.connect(self.on_header_clicked)
+        
         # Allow user to resize columns
         header.setSectionResizeMode(QHeaderView.Interactive)
-        
-        # Set specific column widths
-        self.setColumnWidth(0, 70)  # Sıra No
-        self.setColumnWidth(1, 200)  # Yazar
-        self.setColumnWidth(2, 250)  # Kitap/Makale/Dergi
-        self.setColumnWidth(3, 150)  # Tür
-        self.setColumnWidth(4, 120)  # Başlama Tarihi
-        self.setColumnWidth(5, 120)  # Bitirme Tarihi
-        
-        # Make other columns stretch to fill space
-        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        self.apply_column_layout(None)
         
         # Hide vertical header (row numbers)
         self.verticalHeader().setVisible(False)
@@ -83,133 +85,121 @@ class TableWidget(QTableWidget):
         # Set size policy to expand
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
-    def update_table(self, items, current_type):
-        """Update the table with the given items."""
+    @timed("table.refresh")
+    def update_table(self, items, current_type, matches=None):
+        """Update the table with the given items.
+
+        matches(item) tells whether an item added to the collection later
+        should appear too (e.g. it has the genre filtered on); by default all do.
+        """
         try:
-            self.setRowCount(0)  # Clear existing rows
-            if not items:
-                return
-                
-            self.setRowCount(len(items))
-            
-            if current_type == 'magazine':
-                self.setup_magazine_table(items)
-            else:
-                self.setup_book_article_table(items, current_type)
+            type_changed = current_type != self.table_model.current_type
+            self.source_items = items or []
+            self.matches = matches
+            if type_changed:
+                # Keep only the sort columns the new type also has
+                fields = {field for _, field, _, _ in self.columns_for(current_type)}
+                self.sort_order = [(field, descending) for field, descending in self.sort_order if field in fields]
+            self.table_model.set_items(self.sorted_items(current_type), current_type)
+            if type_changed:
+                self.apply_column_layout(current_type)
+            self.update_sort_indicator()
                 
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Tablo güncellenirken hata oluştu: {str(e)}")
 
-    def format_date(self, date_str, is_month_year=False):
-        if not date_str:
-            return ""
-            
-        try:
-            if is_month_year:
-                # Convert MM/YYYY to Turkish Month YYYY format
-                try:
-                    # First try with MM/YYYY format
-                    date = datetime.strptime(date_str, '%m/%Y')
-                    month_num = date.month
-                    turkish_month = TURKISH_MONTHS.get(month_num, '')
-                    return f"{turkish_month} {date.year}"
-                except ValueError:
-                    # If that fails, try with YYYY-MM-DD format and extract month/year
-                    try:
-                        date = datetime.strptime(date_str, '%Y-%m-%d')
-                        month_num = date.month
-                        turkish_month = TURKISH_MONTHS.get(month_num, '')
-                        return f"{turkish_month} {date.year}"
-                    except ValueError:
-                        # If all parsing fails, return original
-                        return date_str
+    def on_collection_changed(self, change):
+        """Apply a DataManager change set to the shown rows, touching only the rows it names."""
+        current_type = self.table_model.current_type
+        if TYPE_COLLECTIONS.get(current_type) != change.collection:
+            return
+        if change.reset:
+            self.viewport().update()
+            if not (change.inserted or change.deleted):
+                return
+        collection = getattr(self.data_manager, change.collection)
+        live = self.source_items is collection  # Already holds the change
+        inserted = [item for item in change.inserted_items() if self.matches is None or self.matches(item)]
+        if isinstance(self.table_model.items, PagedCollection) or len(inserted) > MAX_ROW_RANGES:
+            # Many scattered inserts cost more than one refresh
+            if not live:
+                gone = set(change.deleted)
+                self.source_items = [item for item in self.source_items if item['id'] not in gone] + inserted
+            self.update_table(self.source_items, current_type, self.matches)
+            return
+
+        if change.deleted:
+            gone = set(change.deleted)
+            self.table_model.remove_ids(gone)
+            if not live:
+                self.source_items = [item for item in self.source_items if item['id'] not in gone]
+        if change.updated:
+            self.table_model.refresh_ids(set(change.updated))
+        for item in inserted:
+            if self.sort_order:
+                row = self.data_manager.sort_keys[change.collection].insertion_point(
+                    self.table_model.items, item, self.sort_order)
             else:
-                # Try different date formats for full dates
-                try:
-                    # First try with DD/MM/YYYY format
-                    date = datetime.strptime(date_str, '%d/%m/%Y')
-                    return date.strftime('%d/%m/%Y')
-                except ValueError:
-                    # Then try with YYYY-MM-DD format
-                    try:
-                        date = datetime.strptime(date_str, '%Y-%m-%d')
-                        return date.strftime('%d/%m/%Y')
-                    except ValueError:
-                        # If all parsing fails, return original
-                        return date_str
-        except Exception:
-            return date_str
+                row = len(self.table_model.items)
+            self.table_model.insert_item(row, item)
+        if inserted and not live:
+            self.source_items = list(self.source_items) + inserted
 
-    def create_centered_item(self, text):
-        item = QTableWidgetItem(text)
-        item.setTextAlignment(Qt.AlignCenter)
-        return item
+    def columns_for(self, current_type):
+        return COLUMNS.get(current_type, COLUMNS['book'])
 
-    def setup_magazine_table(self, items):
-        headers = ["Sıra No", "Dergi", "Sayı", "Cilt", "Tarih", "Başlama Tarihi", "Bitirme Tarihi"]
-        self.setColumnCount(7)
-        self.setHorizontalHeaderLabels(headers)
-        
-        # Set column widths for magazine table
-        self.setColumnWidth(0, 70)  # Sıra No
-        self.setColumnWidth(1, 200)  # Dergi
-        self.setColumnWidth(2, 80)  # Sayı
-        self.setColumnWidth(3, 80)  # Cilt
-        self.setColumnWidth(4, 120)  # Tarih
-        self.setColumnWidth(5, 120)  # Başlama Tarihi
-        self.setColumnWidth(6, 120)  # Bitirme Tarihi
-        
-        # Set stretch for content column
+    def sorted_items(self, current_type):
+        if not self.sort_order or current_type not in TYPE_COLLECTIONS:
+            return self.source_items
+        return self.data_manager.sort_items(current_type, self.source_items, self.sort_order)
+
+    def on_header_clicked(self, column):
+        field = self.table_model.columns[column][1]
+        if field is None:
+            self.sort_order = []
+        elif QApplication.keyboardModifiers() & Qt.ShiftModifier:
+            fields = [sort_field for sort_field, _ in self.sort_order]
+            if field in fields:
+                position = fields.index(field)
+                self.sort_order[position] = (field, not self.sort_order[position][1])
+            else:
+                self.sort_order.append((field, False))
+        elif self.sort_order and self.sort_order[0][0] == field:
+            self.sort_order = [(field, not self.sort_order[0][1])]
+        else:
+            self.sort_order = [(field, False)]
+
+        try:
+            self.clearSelection()
+            current_type = self.table_model.current_type
+            self.table_model.set_items(self.sorted_items(current_type), current_type)
+            self.update_sort_indicator()
+        except Exception as e:
+            QMessageBox.critical(self, "Hata", f"Tablo sıralanırken hata oluştu: {str(e)}")
+
+    def update_sort_indicator(self):
+        """Show the arrow on the most significant sort column."""
         header = self.horizontalHeader()
-        header.setSectionResizeMode(1, QHeaderView.Stretch)  # Make Dergi column stretch
+        fields = [field for _, field, _, _ in self.table_model.columns]
+        if not self.sort_order or self.sort_order[0][0] not in fields:
+            header.setSortIndicatorShown(False)
+            return
+        field, descending = self.sort_order[0]
+        header.setSortIndicator(fields.index(field), Qt.DescendingOrder if descending else Qt.AscendingOrder)
+        header.setSortIndicatorShown(True)
 
-        for row, item in enumerate(items):
-            self.setItem(row, 0, self.create_centered_item(str(row + 1)))
-            self.setItem(row, 1, QTableWidgetItem(str(item.get('Dergi', ''))))
-            self.setItem(row, 2, self.create_centered_item(str(item.get('Sayı', ''))))
-            self.setItem(row, 3, self.create_centered_item(str(item.get('Cilt', ''))))
-            self.setItem(row, 4, self.create_centered_item(
-                self.format_date(str(item.get('Tarih', '')), is_month_year=True)
-            ))
-            self.setItem(row, 5, self.create_centered_item(
-                self.format_date(str(item.get('Başlama Tarihi', '')))
-            ))
-            self.setItem(row, 6, self.create_centered_item(
-                self.format_date(str(item.get('Bitirme Tarihi', '')))
-            ))
-            
-    def setup_book_article_table(self, items, current_type):
-        headers = ["Sıra No", "Yazar", "Kitap" if current_type == 'book' else "Makale", 
-                  "Tür", "Başlama Tarihi", "Bitirme Tarihi"]
-        self.setColumnCount(6)
-        self.setHorizontalHeaderLabels(headers)
-        
-        # Set column widths for book/article table
-        self.setColumnWidth(0, 70)  # Sıra No
-        self.setColumnWidth(1, 200)  # Yazar
-        self.setColumnWidth(2, 250)  # Kitap/Makale
-        self.setColumnWidth(3, 150)  # Tür
-        self.setColumnWidth(4, 120)  # Başlama Tarihi
-        self.setColumnWidth(5, 120)  # Bitirme Tarihi
+    def apply_column_layout(self, current_type):
+        widths, stretch_column = COLUMN_WIDTHS.get(current_type, COLUMN_WIDTHS['default'])
+        header = self.horizontalHeader()
+        for column, width in enumerate(widths):
+            header.setSectionResizeMode(column, QHeaderView.Interactive)
+            self.setColumnWidth(column, width)
         
         # Set stretch for content column
-        header = self.horizontalHeader()
-        header.setSectionResizeMode(2, QHeaderView.Stretch)  # Make content column stretch
+        header.setSectionResizeMode(stretch_column, QHeaderView.Stretch)
 
-        for row, item in enumerate(items):
-            self.setItem(row, 0, self.create_centered_item(str(row + 1)))
-            self.setItem(row, 1, QTableWidgetItem(str(item.get('Yazar', ''))))
-            self.setItem(row, 2, QTableWidgetItem(str(item.get('Kitap' if current_type == 'book' else 'Makale', ''))))
-            self.setItem(row, 3, QTableWidgetItem(str(item.get('Tür', ''))))
-            self.setItem(row, 4, self.create_centered_item(
-                self.format_date(str(item.get('Başlama Tarihi', '')))
-            ))
-            self.setItem(row, 5, self.create_centered_item(
-                self.format_date(str(item.get('Bitirme Tarihi', '')))
-            ))
-            
     def delete_selected_rows(self):
-        selected_rows = sorted(set(item.row() for item in self.selectedItems()), reverse=True)
+        selected_rows = sorted((index.row() for index in self.selectionModel().selectedRows()), reverse=True)
         if not selected_rows:
             QMessageBox.warning(self, "Uyarı", "Lütfen silinecek satırları seçin!")
             return
@@ -223,9 +213,10 @@ class TableWidget(QTableWidget):
         
         if confirm == QMessageBox.Yes:
             try:
-                for row in selected_rows:
-                    self.data_manager.delete_item(row)
-                self.update_table(self.data_manager.current_items, self.data_manager.current_type)
+                ids = {self.table_model.item_at(row)['id'] for row in selected_rows}
+                self.clearSelection()
+                # The rows go away through collection_changed
+                self.data_manager.delete_items(self.data_manager.current_type, ids)
                 QMessageBox.information(self, "Başarılı", "Seçili satırlar başarıyla silindi!")
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Satırlar silinirken hata oluştu: {str(e)}")
\ No newline at end of file
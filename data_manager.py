@@ -1,151 +1,435 @@
 import os
-import pandas as pd
 from PyQt5.QtWidgets import QMessageBox
-from datetime import datetime
 from PyQt5.QtCore import QObject, pyqtSignal
+import time
 import uuid
+from contextlib import contextmanager
+from src.storage import COLLECTIONS, DEFAULT_STORAGE, create_storage
+from src.search_index import SearchIndex, turkish_lower
+from src.genre_index import GenreIndex
+from src.paged_collection import PagedCollection
+from src.record_store import RecordStore
+from src.sort_keys import SortKeyIndex
+from src.reading_stats import ReadingStats
+from src.change_events import ChangeSet
+from src.duplicate_index import FINGERPRINT_FIELDS, DuplicateIndex
+from src.dates import normalize_date, normalize_month
+from src.excel_import import DATE_NORMALIZERS, IMPORT_SCHEMAS, normalize_frame, read_excel_records
+from src.excel_export import write_excel_records
+from src.instrumentation import measure, timed
+
+# Collection attribute holding each item type
+TYPE_COLLECTIONS = {'book': 'books', 'article': 'articles', 'magazine': 'magazines'}
+
+# {field: kind} of the records in each collection
+COLLECTION_SCHEMAS = {collection: fields for collection, _, fields in IMPORT_SCHEMAS.values()}
+# Scalar counterparts of DATE_NORMALIZERS, for records added one at a time
+RECORD_DATE_NORMALIZERS = {'date': normalize_date, 'month': normalize_month}
 
 class DataManager(QObject):
     genre_added = pyqtSignal()  # Signal for when a new genre is added
+    # ChangeSet of one collection: ids inserted, updated and deleted since the
+    # last one, so views and caches can apply just that delta
+    collection_changed = pyqtSignal(object)
     
-    def __init__(self):
+    def __init__(self, storage_kind=None):
         super(DataManager, self).__init__()  # Properly initialize QObject
         self.books = []
         self.articles = []
         self.magazines = []
         self.current_type = None
         self.current_items = []
+        self.last_import_stats = None
+        # Backend is 'pickle' (snapshot + journal), 'mmap' (mapped snapshot + journal)
+        # or 'sqlite'; see migrate_storage.py
+        self.storage = create_storage(storage_kind or os.environ.get('LIBRARY_STORAGE', DEFAULT_STORAGE))
+        self.search_indexes = {name: SearchIndex() for name in COLLECTIONS}
+        self.genre_indexes = {name: GenreIndex() for name in COLLECTIONS}
+        self.reading_stats = {name: ReadingStats() for name in COLLECTIONS}
+        self.duplicate_indexes = {name: DuplicateIndex(FINGERPRINT_FIELDS[name]) for name in COLLECTIONS}
+        # Records live in columnar stores; the collections hold their row views
+        self.stores = {name: RecordStore() for name in COLLECTIONS}
+        self.sort_keys = {name: SortKeyIndex(self.stores[name], COLLECTION_SCHEMAS[name]) for name in COLLECTIONS}
+        self.indexed = set(COLLECTIONS)  # Collections whose records are loaded and indexed
+        self.versions = dict.fromkeys(COLLECTIONS, 0)  # Change sets published per collection
+        self._batch_depth = 0
+        self._pending_changes = {}  # collection -> ChangeSet held back by batch_changes()
 
+    def collections_snapshot(self):
+        # Copies of the row lists with their columns frozen, so a background
+        # compaction sees a stable view while the GUI thread keeps editing
+        return {name: self.stores[name].snapshot(getattr(self, name)) for name in COLLECTIONS}
+
+    @timed("persist.snapshot")
     def save_data(self):
-        data = {
-            'books': self.books,
-            'articles': self.articles,
-            'magazines': self.magazines
-        }
-        pd.to_pickle(data, "library_data.pkl")
+        self.storage.write_snapshot(self.collections_snapshot())
 
+    @timed("load.attach")
     def load_data(self):
-        if os.path.exists("library_data.pkl"):
-            data = pd.read_pickle("library_data.pkl")
-            self.books = data.get('books', [])
-            self.articles = data.get('articles', [])
-            self.magazines = data.get('magazines', [])
-            
-            # Ensure all items have IDs
-            for item_list in [self.books, self.articles, self.magazines]:
-                for item in item_list:
-                    if 'id' not in item:
-                        item['id'] = str(uuid.uuid4())
+        """Attach the stored collections without reading them.
+
+        Records are fetched when a collection is first shown, a page at a
+        time where the backend allows it; see PagedCollection.
+        """
+        for collection in COLLECTIONS:
+            self.stores[collection] = store = RecordStore()
+            self.sort_keys[collection] = SortKeyIndex(store, COLLECTION_SCHEMAS[collection])
+            setattr(self, collection, PagedCollection(self.storage, collection, store.add_many))
+            self.indexed.discard(collection)
+            self.search_indexes[collection].clear()
+            self.genre_indexes[collection].build([])
+            self.reading_stats[collection].clear()
+            self.duplicate_indexes[collection].clear()
+            self.publish(collection, reset=True)
+
+    def collection_items(self, collection):
+        """Return a collection with its secondary indexes built, loading it on first use."""
+        items = getattr(self, collection)
+        if collection not in self.indexed:
+            self.indexed.add(collection)
+            with measure("load.collection"):
+                if isinstance(items, PagedCollection):
+                    items.load()
+                # The search index is built lazily on the first query
+                self.genre_indexes[collection].build(items)
+
+                # Bring dates stored by older versions into canonical form once
+                changed = self.normalize_record_dates(items, COLLECTION_SCHEMAS[collection])
+                self.sort_keys[collection].build(items)
+                self.reading_stats[collection].build(items)
+            if changed:
+                self.journal('update', collection, records=changed)
+            self.publish(collection, updated=changed, reset=True)
+        return items
+
+    def normalize_record_dates(self, items, schema):
+        """Rewrite the date fields of items in canonical form; returns the items that changed."""
+        # pandas is only imported once it is needed; see src/warmup.py
+        import pandas as pd
+        changed = {}
+        for field, kind in schema.items():
+            if kind not in DATE_NORMALIZERS or not items:
+                continue
+            column = pd.Series([item.get(field, "") for item in items], dtype=object)
+            normalized = DATE_NORMALIZERS[kind](column)
+            for position in (column != normalized).to_numpy().nonzero()[0]:
+                if field in items[position]:
+                    items[position][field] = normalized[position]
+                    changed[position] = items[position]
+        return list(changed.values())
+
+    def normalize_dates(self, record, schema):
+        """Rewrite the date fields of one record in canonical form, without pandas."""
+        for field, kind in schema.items():
+            if kind in RECORD_DATE_NORMALIZERS and field in record:
+                record[field] = RECORD_DATE_NORMALIZERS[kind](record[field])
+
+    def index_items(self, collection, items):
+        """Add newly stored items to the secondary indexes of their collection."""
+        self.search_indexes[collection].add_many(items)
+        self.genre_indexes[collection].add_many(items)
+        self.sort_keys[collection].add_many(items)
+        self.reading_stats[collection].add_many(items)
+        self.duplicate_indexes[collection].add_many(items)
+        self.publish(collection, inserted=items)
+
+    def unindex_items(self, collection, items):
+        """Remove deleted items from the secondary indexes of their collection."""
+        store = self.stores[collection]
+        for item in items:
+            store.discard(item)
+            self.search_indexes[collection].remove(item['id'])
+            self.genre_indexes[collection].remove(item)
+            self.sort_keys[collection].remove(item)
+            self.duplicate_indexes[collection].remove(item)
+        self.reading_stats[collection].remove_many(items)
+        self.publish(collection, deleted=items)
+
+    def publish(self, collection, inserted=(), updated=(), deleted=(), reset=False):
+        """Announce changes to a collection through collection_changed.
+
+        Inside batch_changes() they are merged into the batch's change set
+        instead, which is published when the batch ends.
+        """
+        change = self._pending_changes.get(collection) or ChangeSet(collection)
+        change.insert(inserted)
+        change.update(updated)
+        change.delete(deleted)
+        change.reset = change.reset or reset
+        if self._batch_depth:
+            self._pending_changes[collection] = change
+        elif change:
+            self._emit_change(change)
+
+    @contextmanager
+    def batch_changes(self):
+        """Publish everything changed inside the block as one change set per collection."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                pending, self._pending_changes = self._pending_changes, {}
+                for change in pending.values():
+                    if change:
+                        self._emit_change(change)
+
+    def _emit_change(self, change):
+        self.versions[change.collection] += 1
+        change.version = self.versions[change.collection]
+        self.collection_changed.emit(change)
+
+    def journal(self, op, collection, **payload):
+        """Record a mutation in the journal, compacting in the background when it grows."""
+        with measure("persist.journal"):
+            wants_compaction = self.storage.append(op, collection, **payload)
+        if wants_compaction:
+            self.storage.compact(self.collections_snapshot())
 
     def add_book(self, book_data):
         # Ensure book has an ID
         if 'id' not in book_data:
             book_data['id'] = str(uuid.uuid4())
             
-        self.books.append(book_data)
-        self.save_data()
+        self.normalize_dates(book_data, IMPORT_SCHEMAS['kitap'][2])
+        record = self.stores['books'].add(book_data)
+        self.collection_items('books').append(record)
+        self.index_items('books', [record])
+        self.journal('add', 'books', record=book_data)
 
     def add_article(self, article_data):
         # Ensure article has an ID
         if 'id' not in article_data:
             article_data['id'] = str(uuid.uuid4())
             
-        self.articles.append(article_data)
-        self.save_data()
+        self.normalize_dates(article_data, IMPORT_SCHEMAS['makale'][2])
+        record = self.stores['articles'].add(article_data)
+        self.collection_items('articles').append(record)
+        self.index_items('articles', [record])
+        self.journal('add', 'articles', record=article_data)
 
     def add_magazine(self, magazine_data):
         # Ensure magazine has an ID
         if 'id' not in magazine_data:
             magazine_data['id'] = str(uuid.uuid4())
             
-        self.magazines.append(magazine_data)
-        self.save_data()
+        self.normalize_dates(magazine_data, IMPORT_SCHEMAS['dergi'][2])
+        record = self.stores['magazines'].add(magazine_data)
+        self.collection_items('magazines').append(record)
+        self.index_items('magazines', [record])
+        self.journal('add', 'magazines', record=magazine_data)
 
     def delete_item(self, row):
-        if self.current_type == 'book':
-            del self.books[row]
-        elif self.current_type == 'article':
-            del self.articles[row]
-        elif self.current_type == 'magazine':
-            del self.magazines[row]
-        else:
+        if self.current_type not in TYPE_COLLECTIONS:
             return
-            
-        self.save_data()
+        item = self.items_of_type(self.current_type)[row]
+        self.delete_items(self.current_type, [item['id']])
+
+    def delete_items(self, current_type, ids):
+        """Delete the items with the given ids in one pass and one journal entry.
+
+        Returns the number of items deleted.
+        """
+        collection = TYPE_COLLECTIONS[current_type]
+        with self.batch_changes():
+            items = self.collection_items(collection)
+            deleted = self.stores[collection].find_many(list(ids))
+            if not deleted:
+                return 0
+
+            # Filter by identity; reading every item's id would decode the whole id column
+            gone = {id(item) for item in deleted}
+            # Slice assignment keeps the list object that current_items may refer to
+            items[:] = [item for item in items if id(item) not in gone]
+            self.unindex_items(collection, deleted)
+        self.journal('delete', collection, ids=[item['id'] for item in deleted])
+        return len(deleted)
+
+    def get_item(self, current_type, item_id):
+        collection = TYPE_COLLECTIONS[current_type]
+        self.collection_items(collection)
+        return self.stores[collection].find(item_id)
+
+    def items_of_type(self, current_type):
+        return self.collection_items(TYPE_COLLECTIONS[current_type])
+
+    def search_index(self, current_type):
+        """Return the in-memory search index, or None when the backend runs searches."""
+        if self.storage.supports_queries:
+            return None
+        return self.search_indexes[TYPE_COLLECTIONS[current_type]]
+
+    def items_for_ids(self, current_type, ids):
+        collection = TYPE_COLLECTIONS[current_type]
+        if collection not in self.indexed:
+            # Fetch just these records rather than the whole collection
+            return getattr(self, collection).records_for_ids(ids)
+        return self.stores[collection].find_many(ids)
+
+    @timed("search.query")
+    def search(self, current_type, text):
+        """Return the items of a collection whose text fields match the search text."""
+        if self.storage.supports_queries:
+            query = turkish_lower(text.strip())
+            if not query:
+                return list(self.items_of_type(current_type))
+            ids = self.storage.search(TYPE_COLLECTIONS[current_type], query)
+            return self.items_for_ids(current_type, ids)
+
+        index = self.search_index(current_type)
+        if not index.built:
+            index.build(self.items_of_type(current_type))
+        return index.search(text)
+
+    @timed("filter.genre")
+    def items_by_genre(self, current_type, genre):
+        """Return the items of a collection with the given genre, in collection order."""
+        collection = TYPE_COLLECTIONS[current_type]
+        if self.storage.supports_queries:
+            return self.items_for_ids(current_type, self.storage.ids_by_genre(collection, genre))
+        self.collection_items(collection)
+        return self.genre_indexes[collection].items(genre)
+
+    def genre_counts(self, current_type):
+        """Return {genre: item count} for a collection."""
+        collection = TYPE_COLLECTIONS[current_type]
+        if self.storage.supports_queries:
+            return self.storage.genre_counts(collection)
+        self.collection_items(collection)
+        return self.genre_indexes[collection].counts()
+
+    def find_duplicates(self, current_type, record):
+        """Return (exact, near): stored items that duplicate record, or look like they might."""
+        collection = TYPE_COLLECTIONS[current_type]
+        index = self.duplicate_index(collection)
+        return index.exact_matches(record), index.near_matches(record)
+
+    def duplicate_index(self, collection):
+        """Return the DuplicateIndex of a collection, building it on first use."""
+        items = self.collection_items(collection)
+        index = self.duplicate_indexes[collection]
+        if not index.built:
+            with measure("import.dedup_build"):
+                index.build(items)
+        return index
+
+    @timed("stats.read")
+    def statistics(self, current_type):
+        """Return the ReadingStats of a collection, loading it on first use."""
+        collection = TYPE_COLLECTIONS[current_type]
+        self.collection_items(collection)
+        return self.reading_stats[collection]
+
+    @timed("table.sort")
+    def sort_items(self, current_type, items, order):
+        """Return items of a collection sorted by order, a list of (field, descending).
+
+        Keys come from the collection's SortKeyIndex, so re-sorting is a key
+        lookup per item. Sorting a whole collection loads and indexes it first.
+        """
+        collection = TYPE_COLLECTIONS[current_type]
+        if items is getattr(self, collection):
+            items = self.collection_items(collection)
+        return self.sort_keys[collection].sort(items, order)
 
     def format_date(self, date_value):
-        if pd.isna(date_value):
-            return ""
-        
-        try:
-            # Try parsing as datetime first
-            if isinstance(date_value, pd.Timestamp):
-                return date_value.strftime('%d/%m/%Y')
-                
-            # Try different date formats
-            date_formats = [
-                '%Y-%m-%d',      # 2023-12-31
-                '%d.%m.%Y',      # 31.12.2023
-                '%d/%m/%Y',      # 31/12/2023
-                '%Y/%m/%d',      # 2023/12/31
-                '%d-%m-%Y',      # 31-12-2023
-                '%Y.%m.%d'       # 2023.12.31
-            ]
-            
-            for date_format in date_formats:
-                try:
-                    parsed_date = datetime.strptime(str(date_value).strip(), date_format)
-                    return parsed_date.strftime('%d/%m/%Y')
-                except ValueError:
-                    continue
-                    
-            # If all parsing fails, return the original value as string
-            return str(date_value)
-        except Exception:
-            return str(date_value)
-
-    def import_excel(self, file_path, data_type):
+        return normalize_date(date_value)
+
+    def bulk_add(self, collection, records):
+        """Insert a batch of records into a collection with a single persist."""
+        if not records:
+            return 0
+        records = self.stores[collection].add_many(records)
+        self.collection_items(collection).extend(records)
+        self.index_items(collection, records)
+        with measure("persist.batch"):
+            self.storage.store_batch(collection, records, self.collections_snapshot)
+        return len(records)
+
+    def normalize_frame(self, df, data_type):
+        """Turn a raw Excel DataFrame into import-ready records, column by column."""
+        return normalize_frame(df, data_type)
+
+    @timed("import.read_excel")
+    def read_excel_records(self, file_path, data_type, progress=None):
+        """Read and normalise an Excel file without touching the collections.
+
+        Safe to run off the GUI thread; progress(done, total) is called as rows
+        are read. Large workbooks are read by a process pool; see src/excel_import.py.
+        """
+        return read_excel_records(file_path, data_type, progress)
+
+    def prepare_import(self, data_type):
+        """Get the collection an import of data_type goes into ready for check_import.
+
+        Runs on the GUI thread: loads the collection and builds its duplicate
+        index if need be. Returns the collection name.
+        """
+        collection = IMPORT_SCHEMAS[data_type][0]
+        self.duplicate_index(collection).settle()
+        return collection
+
+    @timed("import.dedup")
+    def check_import(self, collection, records, progress=None):
+        """Return a DuplicateReport for records read by read_excel_records.
+
+        Safe to run off the GUI thread after prepare_import, while the
+        collection is not edited; apply_import checks again if it was.
+        progress(done, total) is called as records are checked.
+        """
+        return self.duplicate_indexes[collection].check_batch(records, progress)
+
+    @timed("import.apply")
+    def apply_import(self, collection, records, started, skip_duplicates=True, report=None):
+        """Store records read by read_excel_records and return the success message.
+
+        Records that exactly duplicate a stored item (or an earlier row) are
+        skipped unless skip_duplicates is False; near-duplicates are only counted.
+        report is check_import's result, if it ran; the records are checked
+        here otherwise, or if the collection has changed since.
+        """
+        # Loading the collection and adding the records reach views as one change set
+        with self.batch_changes():
+            index = self.duplicate_index(collection)
+            if report is None or report.version != index.version:
+                with measure("import.dedup"):
+                    report = index.check_batch(records)
+            if skip_duplicates and report.exact:
+                exact = set(report.exact)
+                records = [record for position, record in enumerate(records) if position not in exact]
+            count = self.bulk_add(collection, records)
+        elapsed = time.perf_counter() - started
+
+        rows_per_sec = count / elapsed if elapsed > 0 else 0.0
+        self.last_import_stats = {
+            'rows': count,
+            'seconds': elapsed,
+            'rows_per_sec': rows_per_sec,
+            'duplicates': len(report.exact),
+            'near_duplicates': len(report.near)
+        }
+        message = f"Excel verisi başarıyla yüklendi! ({count} kayıt, {rows_per_sec:.0f} kayıt/sn)"
+        if report.exact:
+            message += (f"\n{len(report.exact)} yinelenen kayıt atlandı." if skip_duplicates
+                        else f"\n{len(report.exact)} kayıt zaten vardı.")
+        if report.near:
+            message += f"\n{len(report.near)} kayıt mevcut kayıtlara çok benziyor; kontrol etmeniz önerilir."
+        return message
+
+    @timed("export.excel")
+    def write_excel_records(self, file_path, current_type, items, progress=None):
+        """Write items to an .xlsx file in the column layout import_excel reads.
+
+        Safe to run off the GUI thread; rows are streamed to disk one at a
+        time, so memory stays flat however many there are. See src/excel_export.py.
+        """
+        return write_excel_records(file_path, current_type, items, progress)
+
+    def import_excel(self, file_path, data_type, skip_duplicates=True):
         try:
-            df = pd.read_excel(file_path)
-            
-            # Convert column names to lowercase and strip whitespace
-            df.columns = df.columns.str.strip().str.lower()
-            
-            if data_type == "kitap":
-                for _, row in df.iterrows():
-                    self.add_book({
-                        "Yazar": str(row.get("yazar", "")),
-                        "Kitap": str(row.get("kitap", "")),
-                        "Tür": str(row.get("tür", "")),
-                        "Başlama Tarihi": self.format_date(row.get("başlama tarihi", "")),
-                        "Bitirme Tarihi": self.format_date(row.get("bitirme tarihi", "")),
-                        "type": "book",
-                        "id": str(uuid.uuid4())
-                    })
-            elif data_type == "makale":
-                for _, row in df.iterrows():
-                    self.add_article({
-                        "Yazar": str(row.get("yazar", "")),
-                        "Makale": str(row.get("makale", "")),
-                        "Tür": str(row.get("tür", "")),
-                        "Başlama Tarihi": self.format_date(row.get("başlama tarihi", "")),
-                        "Bitirme Tarihi": self.format_date(row.get("bitirme tarihi", "")),
-                        "type": "article",
-                        "id": str(uuid.uuid4())
-                    })
-            elif data_type == "dergi":
-                for _, row in df.iterrows():
-                    self.add_magazine({
-                        "Dergi": str(row.get("dergi", "")),
-                        "Sayı": str(row.get("sayı", "")),
-                        "Cilt": str(row.get("cilt", "")),
-                        "Tarih": self.format_date(row.get("tarih", "")),
-                        "Başlama Tarihi": self.format_date(row.get("başlama tarihi", "")),
-                        "Bitirme Tarihi": self.format_date(row.get("bitirme tarihi", "")),
-                        "type": "magazine",
-                        "id": str(uuid.uuid4())
-                    })
-            
-            return True, "Excel verisi başarıyla yüklendi!"
+            started = time.perf_counter()
+            collection, records = self.read_excel_records(file_path, data_type)
+            return True, self.apply_import(collection, records, started, skip_duplicates)
         except Exception as e:
-            return False, f"Veri yükleme hatası: {str(e)}"
\ No newline at end of file
+            return False, f"Veri yükleme hatası: {str(e)}"
@@ -1,9 +1,11 @@
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QSizePolicy
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout, QSizePolicy, QShortcut
+from PyQt5.QtGui import QKeySequence
 from components.book_section import BookSection
 from components.article_section import ArticleSection
 from components.magazine_section import MagazineSection
 from components.table_widget import TableWidget
 from components.button_panel import ButtonPanel
+from components.diagnostics_dialog import DiagnosticsDialog
 from data_manager import DataManager
 
 class LibraryManagementApp(QMainWindow):
@@ -18,8 +20,23 @@ class LibraryManagementApp(QMainWindow):
         # Setup UI
         self.setup_ui()
         
+        # Hidden performance panel
+        self.diagnostics_dialog = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self).activated.connect(self.show_diagnostics)
+
         # Load initial data
         self.data_manager.load_data()
+
+    def closeEvent(self, event):
+        # Let queued journal writes and a running compaction reach the disk
+        self.data_manager.storage.close()
+        super().closeEvent(event)
+
+    def show_diagnostics(self):
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
         
     def setup_ui(self):
         # Create central widget
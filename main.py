@@ -1,10 +1,30 @@
+import multiprocessing
 import sys
-from PyQt5.QtWidgets import QApplication
-from library_app import LibraryManagementApp
+from src import startup_profile
 
 
-if __name__ == "__main__":
+def main():
+    # Imported here so the Excel import's worker processes, which re-run this
+    # module under spawn, do not load the whole UI
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from library_app import LibraryManagementApp
+    from src.warmup import WARMUP_DELAY_MS, warm_up
+
+    startup_profile.mark("imports")
     app = QApplication(sys.argv)
     window = LibraryManagementApp()
     window.show()
-    sys.exit(app.exec_())
+    startup_profile.mark("window")
+    if startup_profile.active():
+        QTimer.singleShot(0, startup_profile.report_and_quit)
+    else:
+        QTimer.singleShot(WARMUP_DELAY_MS, warm_up)
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    if "--profile-startup" in sys.argv:
+        sys.exit(startup_profile.profile(__file__))
+    sys.exit(main())
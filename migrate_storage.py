@@ -0,0 +1,54 @@
+"""One-shot migration of the library between storage backends.
+
+    python migrate_storage.py sqlite                 # library_data.pkl -> library_data.db
+    python migrate_storage.py pickle --source sqlite # and back
+    python migrate_storage.py mmap                   # library_data.pkl -> library_data.libmap
+
+Run the app with LIBRARY_STORAGE=<backend> afterwards to use the new copy.
+"""
+import argparse
+from src.storage import COLLECTIONS, STORAGE_FILES, create_storage
+
+
+def migrate(source_kind, target_kind):
+    """Copy every collection from one backend into another, replacing its contents."""
+    source = create_storage(source_kind)
+    data = source.load()
+    source.close()
+
+    target = create_storage(target_kind)
+    # Loading first moves the target's journal sequence past its old entries,
+    # so the snapshot supersedes them instead of having them replayed on top
+    target.load()
+    target.write_snapshot(data)
+    target.close()
+    verify(target_kind, data)
+    return {name: len(data[name]) for name in COLLECTIONS}
+
+
+def verify(kind, data):
+    """Reopen the migrated copy and check it holds exactly the records of data."""
+    storage = create_storage(kind)
+    try:
+        copied = storage.load()
+    finally:
+        storage.close()
+    for name in COLLECTIONS:
+        expected = [item['id'] for item in data[name]]
+        found = [item['id'] for item in copied[name]]
+        if found != expected:
+            raise RuntimeError(f"{name}: migrated copy has {len(found)} records, expected {len(expected)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kütüphane verisini başka bir depolama biçimine taşı")
+    parser.add_argument("target", choices=sorted(STORAGE_FILES))
+    parser.add_argument("--source", choices=sorted(STORAGE_FILES), default="pickle")
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("source and target backends must differ")
+
+    counts = migrate(args.source, args.target)
+    print(f"{STORAGE_FILES[args.source]} -> {STORAGE_FILES[args.target]}: "
+          + ", ".join(f"{name}={count}" for name, count in counts.items()))
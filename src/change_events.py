@@ -0,0 +1,64 @@
+class ChangeSet:
+    """One batch of changes to a collection, as published by DataManager.collection_changed.
+
+    inserted, updated and deleted hold item ids in the order the changes
+    were made; records maps the inserted and updated ids to their records
+    and the deleted ones to the records they were. version counts the change
+    sets published for the collection so far. A reset change set means the
+    collection was (re)loaded wholesale and consumers should re-read it.
+
+    Changes merged into one set cancel out where they should: an item
+    inserted and deleted within the same batch appears in neither list.
+    """
+
+    __slots__ = ('collection', 'version', 'inserted', 'updated', 'deleted', 'records', 'reset')
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.version = 0
+        self.inserted = {}  # id -> None; dicts keep insertion order
+        self.updated = {}
+        self.deleted = {}
+        self.records = {}
+        self.reset = False
+
+    def insert(self, items):
+        for item in items:
+            item_id = item['id']
+            self.deleted.pop(item_id, None)
+            self.inserted[item_id] = None
+            self.records[item_id] = item
+
+    def update(self, items):
+        for item in items:
+            item_id = item['id']
+            if item_id not in self.inserted:
+                self.updated[item_id] = None
+            self.records[item_id] = item
+
+    def delete(self, items):
+        for item in items:
+            item_id = item['id']
+            self.updated.pop(item_id, None)
+            if item_id in self.inserted:
+                del self.inserted[item_id]
+                del self.records[item_id]
+            else:
+                self.deleted[item_id] = None
+                self.records[item_id] = item
+
+    def inserted_items(self):
+        return [self.records[item_id] for item_id in self.inserted]
+
+    def updated_items(self):
+        return [self.records[item_id] for item_id in self.updated]
+
+    def deleted_items(self):
+        return [self.records[item_id] for item_id in self.deleted]
+
+    def __bool__(self):
+        return bool(self.reset or self.inserted or self.updated or self.deleted)
+
+    def __repr__(self):
+        return (f"ChangeSet({self.collection!r}, version={self.version}, inserted={len(self.inserted)}, "
+                f"updated={len(self.updated)}, deleted={len(self.deleted)}, reset={self.reset})")
@@ -1,13 +1,13 @@
 from typing import List
+from bisect import bisect_left
+import atexit
 import json
 import os
+import threading
 from PyQt5.QtCore import pyqtSignal, QObject
+from src.durable_io import atomic_write
 
-# Create a signal emitter class for genre changes
-class GenreSignals(QObject):
-    genre_changed = pyqtSignal()
-
-genre_signals = GenreSignals()
+GENRES_FILE = "genres.json"
 
 TURKISH_MONTHS = {
     1: "Ocak",
@@ -26,7 +26,7 @@ TURKISH_MONTHS = {
 
 def load_genres() -> List[str]:
     """Load genres from file or return default list"""
-    file_path = "genres.json"
+    file_path = GENRES_FILE
     default_genres = [
         "Anı", "Askeri", "Bilim", "Dil", "Din",
         "Ekonomi", "Eleştiri", "Felsefe", "Günce Yazılar",
@@ -44,32 +44,111 @@ def load_genres() -> List[str]:
         save_genres(default_genres)
         return default_genres
 
-def save_genres(genres: List[str]):
-    """Save genres to file"""
-    with open("genres.json", 'w', encoding='utf-8') as f:
-        json.dump(sorted(list(set(genres))), f, ensure_ascii=False, indent=2)
+def save_genres(genres: List[str], file_path: str = GENRES_FILE):
+    """Save genres to file; a crash leaves either the old or the new file"""
+    genres = sorted(set(genres))
+    atomic_write(file_path, lambda f: json.dump(genres, f, ensure_ascii=False, indent=2), binary=False)
+
+
+class GenreRegistry(QObject):
+    """The genres, kept sorted and deduplicated in memory and saved in the background.
+
+    genre_added and genre_removed carry the genre and its position in sorted
+    order, so combo boxes insert or remove one item instead of refilling.
+    Changes made while a save is running are written by that same writer,
+    and only the latest list is ever written.
+    """
+
+    genre_added = pyqtSignal(str, int)  # genre, sorted position
+    genre_removed = pyqtSignal(str, int)  # genre, position it had
+    genre_changed = pyqtSignal()  # After either of the above
+
+    def __init__(self, genres=(), file_path=GENRES_FILE):
+        super().__init__()
+        self.file_path = file_path
+        self._genres = sorted(set(genres))
+        self._lock = threading.Lock()
+        self._version = 0  # Bumped on every change; the writer saves until it catches up
+        self._writer = None
+
+    def genres(self) -> List[str]:
+        """Return the genres in sorted order."""
+        return list(self._genres)
+
+    def __iter__(self):
+        return iter(self.genres())
+
+    def __len__(self):
+        return len(self._genres)
+
+    def __contains__(self, genre):
+        return self.index(genre) >= 0
+
+    def index(self, genre) -> int:
+        """Return the sorted position of genre, or -1."""
+        position = bisect_left(self._genres, genre)
+        if position < len(self._genres) and self._genres[position] == genre:
+            return position
+        return -1
+
+    def add(self, genre: str) -> bool:
+        with self._lock:
+            position = bisect_left(self._genres, genre)
+            if position < len(self._genres) and self._genres[position] == genre:
+                return False
+            self._genres.insert(position, genre)
+        self._save()
+        self.genre_added.emit(genre, position)
+        self.genre_changed.emit()
+        return True
+
+    def remove(self, genre: str) -> bool:
+        with self._lock:
+            position = self.index(genre)
+            if position < 0:
+                return False
+            del self._genres[position]
+        self._save()
+        self.genre_removed.emit(genre, position)
+        self.genre_changed.emit()
+        return True
+
+    def flush(self):
+        """Block until the latest change is on disk."""
+        writer = self._writer
+        if writer is not None:
+            writer.join()
+
+    def _save(self):
+        with self._lock:
+            self._version += 1
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_pending, name="genre-writer", daemon=True)
+                self._writer.start()
+
+    def _write_pending(self):
+        while True:
+            with self._lock:
+                version = self._version
+                genres = list(self._genres)
+            try:
+                save_genres(genres, self.file_path)
+            except OSError:
+                pass  # Still correct in memory; the next change retries the save
+            with self._lock:
+                if self._version == version:
+                    self._writer = None
+                    return
+
 
 def add_genre(genre: str) -> bool:
     """Add a new genre to the list"""
-    genres = load_genres()
-    if genre not in genres:
-        genres.append(genre)
-        save_genres(genres)
-        # Emit signal that genres have changed
-        genre_signals.genre_changed.emit()
-        return True
-    return False
+    return genre_registry.add(genre)
 
 def delete_genre(genre: str) -> bool:
     """Delete a genre from the list"""
-    genres = load_genres()
-    if genre in genres:
-        genres.remove(genre)
-        save_genres(genres)
-        # Emit signal that genres have changed
-        genre_signals.genre_changed.emit()
-        return True
-    return False
+    return genre_registry.remove(genre)
 
-# Initialize the GENRES list
-GENRES: List[str] = load_genres()
\ No newline at end of file
+# The one registry every combo box and section reads from
+genre_registry = GenreRegistry(load_genres())
+atexit.register(genre_registry.flush)
\ No newline at end of file
@@ -0,0 +1,144 @@
+import re
+from datetime import datetime
+from src.constants import TURKISH_MONTHS
+
+# pandas is imported by the column functions on first use (see src/warmup.py),
+# so display_month and iso_date stay cheap to import
+
+# Canonical storage forms: full dates as DD/MM/YYYY, magazine issue dates as MM/YYYY
+DATE_FORMAT = '%d/%m/%Y'
+MONTH_FORMAT = '%m/%Y'
+DATE_PATTERN = r'\d{2}/\d{2}/\d{4}'
+MONTH_PATTERN = r'\d{2}/\d{4}'
+
+# Accepted input formats, tried in order on whatever is still unparsed
+DATE_INPUT_FORMATS = [
+    '%d/%m/%Y',      # 31/12/2023
+    '%Y-%m-%d',      # 2023-12-31
+    '%d.%m.%Y',      # 31.12.2023
+    '%Y/%m/%d',      # 2023/12/31
+    '%d-%m-%Y',      # 31-12-2023
+    '%Y.%m.%d'       # 2023.12.31
+]
+MONTH_INPUT_FORMATS = [
+    '%m/%Y',         # 12/2023
+    '%m.%Y',         # 12.2023
+    '%m-%Y',         # 12-2023
+    '%Y-%m',         # 2023-12
+    '%Y/%m'          # 2023/12
+] + DATE_INPUT_FORMATS
+
+MONTH_NUMBERS = {name.lower(): number for number, name in TURKISH_MONTHS.items()}
+NAMED_MONTH = re.compile(r'^(\w+)\s+(\d{4})$')
+
+
+def normalize_date_column(values):
+    """Normalise a column of dates to DD/MM/YYYY, keeping unparseable text as is."""
+    return _normalize_column(values, DATE_FORMAT, DATE_PATTERN, DATE_INPUT_FORMATS)
+
+
+def normalize_month_column(values):
+    """Normalise a column of month/year dates (e.g. "Mayıs 2022") to MM/YYYY."""
+    series = _as_series(values)
+    result = _normalize_column(series, MONTH_FORMAT, MONTH_PATTERN, MONTH_INPUT_FORMATS)
+
+    # Turkish month names are not something strptime can read
+    named = series.astype(str).str.strip().str.extract(NAMED_MONTH.pattern)
+    months = named[0].str.lower().map(MONTH_NUMBERS)
+    matched = months.notna()
+    if matched.any():
+        result[matched] = (
+            months[matched].astype(int).map('{:02d}'.format) + '/' + named.loc[matched, 1]
+        )
+    return result
+
+
+def normalize_date(value):
+    """Scalar form of normalize_date_column, for single values; does not need pandas."""
+    return _normalize_value(value, DATE_FORMAT, DATE_PATTERN, DATE_INPUT_FORMATS)
+
+
+def normalize_month(value):
+    """Scalar form of normalize_month_column, for single values; does not need pandas."""
+    if isinstance(value, str):
+        named = NAMED_MONTH.match(value.strip())
+        if named and named.group(1).lower() in MONTH_NUMBERS:
+            return f"{MONTH_NUMBERS[named.group(1).lower()]:02d}/{named.group(2)}"
+    return _normalize_value(value, MONTH_FORMAT, MONTH_PATTERN, MONTH_INPUT_FORMATS)
+
+
+def display_month(value):
+    """Render a canonical MM/YYYY value as "Mayıs 2022"; anything else is returned as is."""
+    if len(value) == 7 and value[2] == '/' and value[:2].isdigit():
+        month = TURKISH_MONTHS.get(int(value[:2]))
+        if month:
+            return f"{month} {value[3:]}"
+    return value
+
+
+def iso_date(value):
+    """Return a canonical DD/MM/YYYY date as sortable YYYY-MM-DD, or None."""
+    if isinstance(value, str) and len(value) == 10 and value[2] == '/' and value[5] == '/':
+        return f"{value[6:]}-{value[3:5]}-{value[:2]}"
+    return None
+
+
+def _normalize_value(value, output_format, canonical_pattern, input_formats):
+    """What _normalize_column does to one value, with strptime in place of pandas."""
+    if value is None or value != value:  # None or NaN
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime(output_format)
+    text = str(value).strip()
+    if not text or re.fullmatch(canonical_pattern, text):
+        return text
+    for input_format in input_formats:
+        try:
+            return datetime.strptime(text, input_format).strftime(output_format)
+        except ValueError:
+            continue
+    return text
+
+
+def _as_series(values):
+    import pandas as pd
+    if isinstance(values, pd.Series):
+        return values.reset_index(drop=True).astype(object)
+    return pd.Series(list(values), dtype=object)
+
+
+def _normalize_column(values, output_format, canonical_pattern, input_formats):
+    import pandas as pd
+    series = _as_series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return pd.to_datetime(series).dt.strftime(output_format).fillna("")
+
+    result = pd.Series("", index=series.index, dtype=object)
+    missing = series.isna()
+
+    # Cells Excel already typed as dates need no parsing at all
+    is_datetime = series.map(lambda value: isinstance(value, datetime)).astype(bool)
+    if is_datetime.any():
+        result[is_datetime] = pd.to_datetime(series[is_datetime]).dt.strftime(output_format)
+
+    text = series.where(~missing & ~is_datetime, "").astype(str).str.strip()
+    pending = ~missing & ~is_datetime & (text != "")
+
+    # Values already in canonical form are kept verbatim
+    canonical = pending & text.str.fullmatch(canonical_pattern)
+    result[canonical] = text[canonical]
+    pending &= ~canonical
+
+    for input_format in input_formats:
+        if not pending.any():
+            break
+        parsed = pd.to_datetime(text[pending], format=input_format, errors='coerce')
+        hit = parsed.notna()
+        if hit.any():
+            hit_index = parsed.index[hit]
+            result[hit_index] = parsed[hit].dt.strftime(output_format)
+            pending[hit_index] = False
+
+    # If all parsing fails, keep the original value as string
+    result[pending] = text[pending]
+    return result
@@ -0,0 +1,333 @@
+import hashlib
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from src.search_index import turkish_lower
+from src.sort_keys import NOT_A_DATE, date_key
+
+# Fields that together identify an item of each collection
+FINGERPRINT_FIELDS = {
+    'books': ('Yazar', 'Kitap', 'Başlama Tarihi', 'Bitirme Tarihi'),
+    'articles': ('Yazar', 'Makale', 'Başlama Tarihi', 'Bitirme Tarihi'),
+    'magazines': ('Dergi', 'Sayı', 'Cilt', 'Tarih', 'Başlama Tarihi', 'Bitirme Tarihi')
+}
+DATE_FIELDS = {'Başlama Tarihi': False, 'Bitirme Tarihi': False, 'Tarih': True}  # field -> month/year
+
+# Sorted-neighbourhood passes: each sorts by these fingerprint positions, so
+# near-duplicates with a typo early in one field still meet in the other pass
+BLOCKING_PASSES = ((1, 0), (0, 1))
+# Neighbours on each side compared against an incoming item; only items with
+# the same dates are neighbours, as no others can be near-duplicates
+WINDOW = 4
+# Batches up to this size are inserted into the sorted blocks one by one;
+# larger ones are appended and the blocks re-sorted once
+INSORT_MAX = 64
+# difflib ratio of the text fields from which two items with the same dates
+# count as near-duplicates; different dates mean a different reading
+NEAR_DUPLICATE_RATIO = 0.9
+# Report check_batch progress every this many records
+PROGRESS_RECORDS = 1000
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+NUMBERS = re.compile(r'\d+')
+SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=65536)
+def normalize_text(value):
+    """Casefold with Turkish rules, drop punctuation and collapse whitespace."""
+    return SPACES.sub(' ', PUNCTUATION.sub(' ', turkish_lower(value))).strip()
+
+
+@lru_cache(maxsize=65536)
+def normalize_date(value, month):
+    key = date_key(value.strip(), month)
+    return str(key) if key != NOT_A_DATE else normalize_text(value)
+
+
+def fingerprint_fields(item, fields):
+    """Return the normalised values of fields; dates compare as dates."""
+    values = []
+    for field in fields:
+        value = item.get(field, '')
+        value = value if isinstance(value, str) else '' if value is None else str(value)
+        if field in DATE_FIELDS:
+            values.append(normalize_date(value, DATE_FIELDS[field]))
+        else:
+            values.append(normalize_text(value))
+    return tuple(values)
+
+
+def fingerprint(values):
+    """Return a 16-byte digest of normalised field values."""
+    return hashlib.blake2b('\x1f'.join(values).encode(), digest_size=16).digest()
+
+
+def similar(a, b, text_positions, date_positions):
+    """Whether two normalised field tuples are close enough to be the same item."""
+    if any(a[position] != b[position] for position in date_positions):
+        return False
+    a = ' '.join(a[position] for position in text_positions)
+    b = ' '.join(b[position] for position in text_positions)
+    # "Cilt 2" and "Cilt 3", or issue 10 and 11, are different items however alike
+    if NUMBERS.findall(a) != NUMBERS.findall(b):
+        return False
+    # SequenceMatcher's real_quick_ratio and quick_ratio bounds first, without
+    # paying for building a matcher for pairs they already rule out
+    if 2 * min(len(a), len(b)) < NEAR_DUPLICATE_RATIO * (len(a) + len(b)):
+        return False
+    if quick_ratio(a, b) < NEAR_DUPLICATE_RATIO:
+        return False
+    return SequenceMatcher(None, a, b, autojunk=False).ratio() >= NEAR_DUPLICATE_RATIO
+
+
+def quick_ratio(a, b):
+    """Return SequenceMatcher(None, a, b).quick_ratio(): an upper bound on ratio()."""
+    if not a and not b:
+        return 1.0
+    counts = Counter(b)
+    matches = 0
+    for char, count in Counter(a).items():
+        other = counts.get(char)
+        if other:
+            matches += min(count, other)
+    return 2.0 * matches / (len(a) + len(b))
+
+
+class DuplicateReport:
+    """What check_batch found in a batch of incoming records.
+
+    exact holds the positions of records whose fingerprint matches a stored
+    item or an earlier record of the batch; near holds (position, match)
+    pairs for records that merely look like one, match being the stored
+    item or the earlier record. version is the index's version at the time.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.exact = []
+        self.near = []
+
+
+class DuplicateIndex:
+    """Fingerprints of the items of one collection, for duplicate checks.
+
+    Exact duplicates are found through a hash of the normalised fingerprint
+    fields, one dict lookup per record. Near-duplicates are found by sorted
+    neighbourhood blocking: the items are kept sorted on their dates and
+    then a few orderings of the other fields, and an incoming record is only
+    compared with the WINDOW items with the same dates either side of where
+    it would sort, which keeps fuzzy checking of a large import at
+    O(n log n) rather than O(n²).
+
+    Like SearchIndex, it is built on the first check and kept current
+    through add_many/remove afterwards; until then those do nothing. Small
+    additions are inserted in sorted position; removed items are left in the
+    blocks as dead entries, skipped by lookups and swept out once they make
+    up half of them.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.date_positions = [position for position, field in enumerate(fields) if field in DATE_FIELDS]
+        self.text_positions = [position for position, field in enumerate(fields) if field not in DATE_FIELDS]
+        self.version = 0  # Bumped by every change, so a report can be told stale
+        self.clear()
+
+    def similar(self, a, b):
+        return similar(a, b, self.text_positions, self.date_positions)
+
+    def dates(self, values):
+        """Return the leading part of the block keys of values: its dates."""
+        return '\x1f'.join(values[position] for position in self.date_positions) + '\x1e'
+
+    def block_key(self, values, positions):
+        return self.dates(values) + block_key(values, positions)
+
+    def clear(self):
+        """Drop everything; the index is rebuilt on the next check."""
+        self.version += 1
+        self.built = False
+        self._digests = {}  # digest -> {item id: item}
+        self._values = {}  # item id -> normalised field values
+        self._items = {}
+        self._blocks = [[] for _ in BLOCKING_PASSES]  # per pass: sorted [(key, item id)]
+        self._blocks_dirty = False
+        self._dead = 0  # Block entries per pass whose item was removed
+
+    def build(self, items):
+        self.clear()
+        self.built = True
+        self.add_many(items)
+        self._sorted_blocks()
+
+    def add_many(self, items):
+        if not self.built:
+            return
+        self.version += 1
+        # Into sorted position while that is cheaper than sorting afterwards
+        add = insort if len(items) <= INSORT_MAX and not self._blocks_dirty else list.append
+        for item in items:
+            values = fingerprint_fields(item, self.fields)
+            item_id = item['id']
+            if item_id in self._values:
+                self.remove(item)
+            self._digests.setdefault(fingerprint(values), {})[item_id] = item
+            self._values[item_id] = values
+            self._items[item_id] = item
+            for blocks, positions in zip(self._blocks, BLOCKING_PASSES):
+                add(blocks, (self.block_key(values, positions), item_id))
+        if items and add is list.append:
+            self._blocks_dirty = True
+
+    def remove(self, item):
+        item_id = item['id']
+        values = self._values.pop(item_id, None)
+        if values is None:
+            return
+        self.version += 1
+        del self._items[item_id]
+        digest = fingerprint(values)
+        matches = self._digests.get(digest)
+        if matches is not None:
+            matches.pop(item_id, None)
+            if not matches:
+                del self._digests[digest]
+        # Its block entries stay behind as dead entries; see _sorted_blocks
+        self._dead += 1
+
+    def settle(self):
+        """Sort pending additions into the blocks now; check_batch then only reads the index."""
+        self._sorted_blocks()
+
+    def exact_matches(self, item):
+        """Return the stored items with the same fingerprint as item."""
+        return list(self._digests.get(fingerprint(fingerprint_fields(item, self.fields)), {}).values())
+
+    def near_matches(self, item):
+        """Return stored items that look like item without being exact duplicates of it."""
+        values = fingerprint_fields(item, self.fields)
+        found = {}
+        for item_id in self._neighbours(values):
+            other = self._values[item_id]
+            if other != values and item_id not in found and self.similar(values, other):
+                found[item_id] = self._items[item_id]
+        return list(found.values())
+
+    def check_batch(self, records, progress=None):
+        """Return a DuplicateReport for records about to be added, in one pass.
+
+        progress(done, total) is called every PROGRESS_RECORDS records of the
+        exact pass and of each blocking pass, and may raise to cancel.
+        """
+        total = len(records) * (1 + len(BLOCKING_PASSES))
+        report = DuplicateReport(self.version)
+        seen = {}  # digest -> position of the first record of the batch with it
+        batch_values = []
+        for position, record in enumerate(records):
+            if progress and position % PROGRESS_RECORDS == 0:
+                progress(position, total)
+            values = fingerprint_fields(record, self.fields)
+            batch_values.append(values)
+            digest = fingerprint(values)
+            if digest in self._digests or digest in seen:
+                report.exact.append(position)
+            else:
+                seen[digest] = position
+
+        # Sorted neighbourhood over the stored items and the new records together
+        exact = set(report.exact)
+        near = {}
+        # (position, stored id or earlier position) pairs already compared, and
+        # the positions whose whole group of equal dates fit in a window: every
+        # later pass would bring up the same neighbours for those
+        compared = set()
+        covered = set()
+        batch_dates = [self.dates(values) for values in batch_values]
+        done = len(records)
+        for blocks, positions in zip(self._sorted_blocks(), BLOCKING_PASSES):
+            incoming = sorted(
+                (batch_dates[position] + block_key(values, positions), position)
+                for position, values in enumerate(batch_values) if position not in exact
+            )
+            for rank, (key, position) in enumerate(incoming):
+                if progress and rank % PROGRESS_RECORDS == 0:
+                    progress(done + rank, total)
+                if position in near or position in covered:
+                    continue
+                values = batch_values[position]
+                dates = batch_dates[position]
+                match = None
+                neighbours, whole_group = self._window(blocks, bisect_left(blocks, (key,)), dates)
+                for item_id in neighbours:
+                    if (position, item_id) in compared:
+                        continue
+                    compared.add((position, item_id))
+                    if self.similar(values, self._values[item_id]):
+                        match = self._items[item_id]
+                        break
+                low, high = max(0, rank - WINDOW), rank + WINDOW + 1
+                if (whole_group and (low == 0 or not incoming[low - 1][0].startswith(dates))
+                        and (high >= len(incoming) or not incoming[high][0].startswith(dates))):
+                    covered.add(position)
+                if match is None:
+                    for other_key, other in incoming[low:high]:
+                        if other >= position or not other_key.startswith(dates) or (position, other) in compared:
+                            continue
+                        compared.add((position, other))
+                        if self.similar(values, batch_values[other]):
+                            match = records[other]
+                            break
+                if match is not None:
+                    near[position] = match
+            done += len(records)
+        report.near = sorted(near.items(), key=lambda pair: pair[0])
+        if progress:
+            progress(total, total)
+        return report
+
+    def _neighbours(self, values):
+        dates = self.dates(values)
+        for blocks, positions in zip(self._sorted_blocks(), BLOCKING_PASSES):
+            yield from self._window(blocks, bisect_left(blocks, (self.block_key(values, positions),)), dates)[0]
+
+    def _window(self, blocks, position, dates):
+        """Return (ids, whole_group) for the entries with these dates around position.
+
+        ids are up to WINDOW live entries on either side; whole_group says
+        whether those are all the entries with these dates.
+        """
+        live = self._values
+        before = []
+        row = position - 1
+        while row >= 0 and len(before) < WINDOW and blocks[row][0].startswith(dates):
+            if blocks[row][1] in live:
+                before.append(blocks[row][1])
+            row -= 1
+        first = row
+        after = []
+        row = position
+        while row < len(blocks) and len(after) < WINDOW and blocks[row][0].startswith(dates):
+            if blocks[row][1] in live:
+                after.append(blocks[row][1])
+            row += 1
+        whole_group = ((first < 0 or not blocks[first][0].startswith(dates))
+                       and (row >= len(blocks) or not blocks[row][0].startswith(dates)))
+        return before[::-1] + after, whole_group
+
+    def _sorted_blocks(self):
+        if self._blocks_dirty or self._dead * 2 > len(self._values) + self._dead:
+            # Mostly already in order, with appended runs; cheap for timsort
+            self._blocks = [
+                sorted(entry for entry in blocks if entry[1] in self._values)
+                for blocks in self._blocks
+            ]
+            self._blocks_dirty = False
+            self._dead = 0
+        return self._blocks
+
+
+def block_key(values, positions):
+    return '\x1f'.join(values[position] for position in positions)
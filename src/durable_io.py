@@ -0,0 +1,143 @@
+import atexit
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+# How long the journal writer waits for more lines before one write + fsync
+FLUSH_WINDOW_MS = int(os.environ.get('LIBRARY_FLUSH_WINDOW_MS', 50))
+
+
+def atomic_write(path, write, binary=True):
+    """Replace path with whatever write(f) writes, so a crash leaves either the old or the new file.
+
+    The data goes to a temporary file in the same directory, is fsynced,
+    and is renamed over path; the directory is then fsynced so the rename
+    itself survives a power cut.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w', **({} if binary else {'encoding': 'utf-8'})) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+
+def fsync_directory(directory):
+    # Directories cannot be opened for syncing on Windows, where the rename is durable anyway
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class CoalescingWriter:
+    """Appends text to a file from a background thread, one flush and fsync per burst.
+
+    write() only queues the text and returns. The writer thread waits
+    window_ms after the first queued line, so a burst of edits costs one
+    write and one fsync. flush() blocks until everything queued so far is
+    on disk; an error from the thread is raised by the next write() or
+    flush(). Writers still open at exit are flushed.
+    """
+
+    def __init__(self, path, window_ms=FLUSH_WINDOW_MS):
+        self.path = path
+        self.window = window_ms / 1000
+        self._file = open(path, 'a', encoding='utf-8')
+        self._condition = threading.Condition()
+        self._queue = []
+        self._queued = 0  # Number of write() calls so far
+        self._synced = 0  # How many of them are on disk
+        self._error = None
+        self._closed = False
+        self._urgent = False  # Someone is waiting in flush(); skip the window
+        self._thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self._thread.start()
+        _open_writers.add(self)
+
+    def write(self, text):
+        with self._condition:
+            self._raise_error()
+            if self._closed:
+                raise ValueError("write to closed CoalescingWriter")
+            self._queue.append(text)
+            self._queued += 1
+            self._condition.notify_all()
+
+    def flush(self):
+        with self._condition:
+            target = self._queued
+            self._urgent = True
+            self._condition.notify_all()
+            while self._synced < target and self._error is None:
+                self._condition.wait()
+            self._raise_error()
+
+    def close(self):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()
+        _open_writers.discard(self)
+        with self._condition:
+            self._raise_error()
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+            if self.window and not self._closed and not self._urgent:
+                time.sleep(self.window)  # Let the rest of the burst arrive
+            with self._condition:
+                batch, self._queue = self._queue, []
+                self._urgent = False
+                count = self._queued
+            try:
+                self._file.write(''.join(batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            except OSError as e:
+                error = e  # The batch is lost; report it rather than wait for it forever
+            else:
+                error = None
+            with self._condition:
+                self._error = self._error or error
+                self._synced = count
+                self._condition.notify_all()
+
+
+_open_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_writers():
+    for writer in list(_open_writers):
+        try:
+            writer.close()
+        except (OSError, ValueError):
+            pass
@@ -0,0 +1,69 @@
+"""Streaming Excel export in the layout read_excel_records reads back.
+
+Rows go through openpyxl's write-only workbook one at a time, which spools
+them to a temporary file instead of building a worksheet (or a DataFrame)
+in memory, so memory use does not grow with the number of rows.
+"""
+from src.durable_io import atomic_write
+from src.excel_import import IMPORT_SCHEMAS
+
+# Excel data type of each item type, as import_excel takes it
+DATA_TYPES = {item_type: data_type for data_type, (_, item_type, _) in IMPORT_SCHEMAS.items()}
+
+SHEET_TITLES = {'book': "Kitaplar", 'article': "Makaleler", 'magazine': "Dergiler"}
+
+# Report progress every this many rows
+PROGRESS_ROWS = 1000
+
+
+def export_columns(item_type):
+    """Return the column headers written for an item type: the import schema's fields."""
+    return list(IMPORT_SCHEMAS[DATA_TYPES[item_type]][2])
+
+
+def write_excel_records(file_path, item_type, items, progress=None):
+    """Write items to an .xlsx file that import_excel reads back as the same records.
+
+    items may be any iterable; progress(done, total) is called every
+    PROGRESS_ROWS rows and may raise to cancel, in which case no file is
+    left behind. Returns the number of rows written.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    columns = export_columns(item_type)
+    total = len(items) if hasattr(items, '__len__') else 0
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_TITLES[item_type])
+    sheet.append(columns)
+
+    def cell(value):
+        if value is None:
+            return ""
+        if not isinstance(value, str):
+            return value
+        value = ILLEGAL_CHARACTERS_RE.sub("", value)
+        if value.startswith("="):
+            # Would otherwise be written as a formula
+            text = WriteOnlyCell(sheet, value)
+            text.data_type = 's'
+            return text
+        return value
+
+    count = 0
+    try:
+        for item in items:
+            sheet.append([cell(item.get(column, "")) for column in columns])
+            count += 1
+            if progress and count % PROGRESS_ROWS == 0:
+                progress(count, total)
+    except BaseException:
+        # Finish the spooled sheet so its temporary file is closed cleanly
+        sheet.close()
+        raise
+
+    atomic_write(file_path, workbook.save)
+    if progress:
+        progress(count, total)
+    return count
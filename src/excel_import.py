@@ -0,0 +1,198 @@
+"""Reading Excel files into import-ready records, in parallel for large workbooks.
+
+.xlsx workbooks are streamed with openpyxl in read-only mode, and every
+sheet whose header has the data type's columns is imported. Large ones are
+spread over a process pool: with several such sheets each sheet is parsed
+and normalised by its own worker, otherwise this process streams the rows
+and workers normalise them in chunks while parsing continues. Results are
+merged in sheet and row order either way. Legacy .xls files go through
+pandas.read_excel.
+"""
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from src.dates import normalize_date_column, normalize_month_column
+
+# Record layout per Excel data type: (collection, item type, {field: kind})
+# where kind is 'text', 'date' (DD/MM/YYYY) or 'month' (MM/YYYY)
+IMPORT_SCHEMAS = {
+    'kitap': ('books', 'book', {
+        'Yazar': 'text', 'Kitap': 'text', 'Tür': 'text',
+        'Başlama Tarihi': 'date', 'Bitirme Tarihi': 'date'
+    }),
+    'makale': ('articles', 'article', {
+        'Yazar': 'text', 'Makale': 'text', 'Tür': 'text',
+        'Başlama Tarihi': 'date', 'Bitirme Tarihi': 'date'
+    }),
+    'dergi': ('magazines', 'magazine', {
+        'Dergi': 'text', 'Sayı': 'text', 'Cilt': 'text', 'Tarih': 'month',
+        'Başlama Tarihi': 'date', 'Bitirme Tarihi': 'date'
+    })
+}
+
+DATE_NORMALIZERS = {'date': normalize_date_column, 'month': normalize_month_column}
+
+# Workbooks with fewer data rows than this are read in-process
+PARALLEL_MIN_ROWS = 20_000
+# Rows handed to a worker at a time when one sheet is split up
+CHUNK_ROWS = 10_000
+# Worker processes; defaults to the number of cores
+IMPORT_WORKERS = int(os.environ.get('LIBRARY_IMPORT_WORKERS', 0)) or os.cpu_count() or 1
+
+STREAMED_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+def normalize_frame(df, data_type):
+    """Turn a raw Excel DataFrame into import-ready records, column by column."""
+    import pandas as pd
+    collection, item_type, schema = IMPORT_SCHEMAS[data_type]
+
+    # Convert column names to lowercase and strip whitespace
+    df.columns = df.columns.astype(str).str.strip().str.lower()
+
+    normalized = pd.DataFrame(index=df.index)
+    for field, kind in schema.items():
+        column = field.lower()
+        if column not in df.columns:
+            normalized[field] = ""
+        elif kind in DATE_NORMALIZERS:
+            normalized[field] = DATE_NORMALIZERS[kind](df[column]).to_numpy()
+        else:
+            normalized[field] = df[column].fillna("").astype(str)
+    normalized["type"] = item_type
+    normalized["id"] = [str(uuid.uuid4()) for _ in range(len(normalized))]
+
+    return collection, normalized.to_dict("records")
+
+
+def read_excel_records(file_path, data_type, progress=None, workers=IMPORT_WORKERS):
+    """Read and normalise an Excel file; returns (collection, records).
+
+    progress(done, total) is called as rows are processed and may raise to
+    cancel, which also stops the workers.
+    """
+    if data_type not in IMPORT_SCHEMAS:
+        raise ValueError(f"bilinmeyen veri türü '{data_type}'")
+    collection = IMPORT_SCHEMAS[data_type][0]
+
+    if not file_path.lower().endswith(STREAMED_EXTENSIONS):
+        return collection, _read_with_pandas(file_path, data_type, progress)
+
+    sheets = importable_sheets(file_path, data_type)
+    total = sum(rows for _, rows in sheets)
+    report = progress or (lambda done, total: None)
+    report(0, total)
+    if workers < 2 or total < PARALLEL_MIN_ROWS:
+        records = []
+        done = 0
+        for name, rows in sheets:
+            records.extend(_read_sheet(file_path, name, data_type))
+            done += rows
+            report(done, total)
+        return collection, records
+
+    # spawn, not fork: this runs on a worker thread of a Qt application
+    context = multiprocessing.get_context('spawn')
+    executor = ProcessPoolExecutor(max_workers=min(workers, max(len(sheets), total // CHUNK_ROWS)),
+                                   mp_context=context)
+    try:
+        if len(sheets) > 1:
+            futures = [(executor.submit(_read_sheet, file_path, name, data_type), rows) for name, rows in sheets]
+        else:
+            # Parsing here is the slow part, so report it as it goes
+            futures = []
+            submitted = 0
+            for future, rows in _submit_chunks(executor, file_path, sheets[0][0], data_type):
+                futures.append((future, rows))
+                submitted += rows
+                report(min(submitted, total), total)
+        records = []
+        done = 0
+        for future, rows in futures:
+            records.extend(future.result())
+            done += rows
+            report(min(done, total), total)
+        return collection, records
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def importable_sheets(file_path, data_type):
+    """Return [(sheet name, data row count)] of sheets whose header has any of the schema's columns.
+
+    Falls back to the first sheet, as a plain read_excel would read, when none has.
+    """
+    import openpyxl
+    columns = {field.lower() for field in IMPORT_SCHEMAS[data_type][2]}
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheets = []
+        for sheet in workbook.worksheets:
+            header = next(sheet.iter_rows(max_row=1, values_only=True), ())
+            if columns & {str(cell).strip().lower() for cell in header if cell is not None}:
+                sheets.append((sheet.title, max((sheet.max_row or 1) - 1, 0)))
+        if not sheets and workbook.worksheets:
+            first = workbook.worksheets[0]
+            sheets.append((first.title, max((first.max_row or 1) - 1, 0)))
+        return sheets
+    finally:
+        workbook.close()
+
+
+def _read_with_pandas(file_path, data_type, progress):
+    import pandas as pd
+    if progress:
+        progress(0, 2)
+    df = pd.read_excel(file_path)
+    if progress:
+        progress(1, 2)
+    _, records = normalize_frame(df, data_type)
+    if progress:
+        progress(2, 2)
+    return records
+
+
+def _submit_chunks(executor, file_path, sheet_name, data_type):
+    """Stream one sheet here and hand its rows to the workers CHUNK_ROWS at a time."""
+    header, chunk = None, []
+    for row in _sheet_rows(file_path, sheet_name):
+        if header is None:
+            header = row
+            continue
+        chunk.append(row)
+        if len(chunk) == CHUNK_ROWS:
+            yield executor.submit(_normalize_rows, header, chunk, data_type), len(chunk)
+            chunk = []
+    if chunk or header is None:
+        yield executor.submit(_normalize_rows, header or (), chunk, data_type), len(chunk)
+
+
+def _sheet_rows(file_path, sheet_name):
+    """Yield the non-empty rows of a sheet as tuples, numbers converted as read_excel would."""
+    import openpyxl
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for row in workbook[sheet_name].iter_rows(values_only=True):
+            if any(cell is not None for cell in row):
+                yield tuple(
+                    int(cell) if isinstance(cell, float) and cell.is_integer() else cell for cell in row
+                )
+    finally:
+        workbook.close()
+
+
+def _read_sheet(file_path, sheet_name, data_type):
+    """Worker: parse and normalise a whole sheet."""
+    rows = _sheet_rows(file_path, sheet_name)
+    header = next(rows, ())
+    return _normalize_rows(header, list(rows), data_type)
+
+
+def _normalize_rows(header, rows, data_type):
+    """Worker: normalise rows read under header into records."""
+    import pandas as pd
+    width = len(header)
+    df = pd.DataFrame([row[:width] + (None,) * (width - len(row)) for row in rows], columns=list(header))
+    _, records = normalize_frame(df, data_type)
+    return records
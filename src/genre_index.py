@@ -0,0 +1,39 @@
+class GenreIndex:
+    """Secondary index from genre (Tür) to the items of one collection.
+
+    Each genre maps to an insertion-ordered dict keyed by the items
+    themselves (records hash by identity), so a genre's items come back in
+    collection order in O(result size) and its count is a len() call.
+    """
+
+    def __init__(self):
+        self._postings = {}
+
+    def build(self, items):
+        self._postings = {}
+        self.add_many(items)
+
+    def add(self, item):
+        self._postings.setdefault(item.get('Tür', ''), {})[item] = None
+
+    def add_many(self, items):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item):
+        genre = item.get('Tür', '')
+        postings = self._postings.get(genre)
+        if postings is None:
+            return
+        postings.pop(item, None)
+        if not postings:
+            del self._postings[genre]
+
+    def items(self, genre):
+        return list(self._postings.get(genre, ()))
+
+    def count(self, genre):
+        return len(self._postings.get(genre, ()))
+
+    def counts(self):
+        return {genre: len(postings) for genre, postings in self._postings.items()}
@@ -0,0 +1,169 @@
+"""Latency histograms and call counts for the app's hot paths.
+
+Recording is off unless LIBRARY_DIAGNOSTICS is set (or enable() is called,
+e.g. from the diagnostics dialog); while off, a timed() function costs one
+flag check and measure() hands out a shared do-nothing context. With
+LIBRARY_DIAGNOSTICS_DUMP=<file> the numbers are also written to that file
+as JSON when the app exits.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+from time import perf_counter
+
+DIAGNOSTICS_ENV = "LIBRARY_DIAGNOSTICS"
+DUMP_ENV = "LIBRARY_DIAGNOSTICS_DUMP"
+
+PERCENTILES = (50, 90, 99)
+
+_enabled = bool(os.environ.get(DIAGNOSTICS_ENV) or os.environ.get(DUMP_ENV))
+_lock = threading.Lock()
+_histograms = {}
+
+
+class LatencyHistogram:
+    """Call count, total, min/max and a histogram of one operation's latency.
+
+    Bucket i holds durations of under 2**i microseconds (and at least half
+    that), so percentiles are accurate to within a factor of two at any scale
+    and recording a sample is a few integer operations.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = {}
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = int(seconds * 1_000_000).bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, percent):
+        """Return the upper bound in seconds of the bucket holding the percentile."""
+        if not self.count:
+            return 0.0
+        rank = self.count * percent / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(2 ** bucket / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        result = {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'min_ms': (self.min or 0.0) * 1000,
+            'max_ms': self.max * 1000
+        }
+        for percent in PERCENTILES:
+            result[f'p{percent}_ms'] = self.percentile(percent) * 1000
+        # Bucket upper bound in microseconds -> samples
+        result['histogram_us'] = {str(2 ** bucket): count for bucket, count in sorted(self.buckets.items())}
+        return result
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def record(name, seconds):
+    """Add one sample of operation name (only while enabled)."""
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = LatencyHistogram()
+        histogram.add(seconds)
+
+
+class _Measurement:
+    __slots__ = ('name', 'started')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record(self.name, perf_counter() - self.started)
+        return False
+
+
+class _NoMeasurement:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_MEASUREMENT = _NoMeasurement()
+
+
+def measure(name):
+    """Context manager recording how long its block takes as operation name."""
+    return _Measurement(name) if _enabled else _NO_MEASUREMENT
+
+
+def timed(name):
+    """Decorator recording every call of a function as operation name.
+
+    Only for functions called directly: Qt passes signal arguments to a
+    wrapped slot that the slot itself might not accept.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            started = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - started)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """Return {operation: summary} of everything recorded so far."""
+    with _lock:
+        return {name: histogram.summary() for name, histogram in sorted(_histograms.items())}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def dump(path):
+    """Write the current numbers to path as JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'enabled': _enabled, 'operations': snapshot()}, f, ensure_ascii=False, indent=2)
+
+
+if os.environ.get(DUMP_ENV):
+    atexit.register(dump, os.environ[DUMP_ENV])
@@ -0,0 +1,74 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function once the job has been cancelled."""
+
+
+class JobSignals(QObject):
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(object)  # result of the work function
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """Runs work(progress) on a QThreadPool thread and reports back through Qt signals.
+
+    work receives a progress(done, total) callback; calling it emits the
+    progress signal and raises JobCancelled if cancel() was called, so long
+    loops only need to report progress to become cancellable. Signals are
+    delivered on the GUI thread, which is where results should be applied.
+    """
+
+    def __init__(self, work):
+        super().__init__()
+        self.work = work
+        self.signals = JobSignals()
+        self._cancelled = threading.Event()
+        self.setAutoDelete(False)
+
+    def start(self):
+        """Queue the job on the global thread pool.
+
+        Connect to its signals first: a short job can be done, and its
+        signals emitted, before start() returns.
+        """
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, done, total):
+        if self._cancelled.is_set():
+            raise JobCancelled()
+        self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.work(self.report)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            if self._cancelled.is_set():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(result)
+
+
+def start_job(work):
+    """Create a Job for work and queue it on the global thread pool.
+
+    Only for jobs whose signals nobody listens to; anything connected after
+    this returns may miss them. Build a Job, connect, then call start().
+    """
+    job = Job(work)
+    job.start()
+    return job
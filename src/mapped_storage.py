@@ -0,0 +1,354 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import uuid
+from array import array
+from src.durable_io import atomic_write
+from src.storage import COLLECTIONS, JournalStorage, entry_weight
+
+# File layout:
+#   magic, header length          PREFIX
+#   header                        JSON: journal_seq and per collection the row
+#                                 count, field names and section offsets
+#   per collection, at the offsets given in the header (relative to the end
+#   of the header):
+#     one column per field        rows x uint32 string pool index, ABSENT if the record lacks the field
+#     string pool offsets         (pool size + 1) x uint64 into the pool data
+#     string pool data            tag byte + UTF-8; tag 's' is a str, 'j' any other JSON value
+#     id order                    rows x uint32 row numbers, sorted by id
+MAGIC = b'LIBMAP01'
+PREFIX = struct.Struct('<8sQ')
+ABSENT = 0xFFFFFFFF
+STRING_TAG = b's'
+JSON_TAG = b'j'
+
+
+def write_mapped_snapshot(path, data, journal_seq=0):
+    """Write {collection: [records]} to path in the mapped snapshot format."""
+    atomic_write(path, encode_mapped_snapshot(data, journal_seq))
+
+
+def encode_mapped_snapshot(data, journal_seq=0):
+    """Encode {collection: [records]} in the mapped snapshot format; returns write(f)."""
+    body = bytearray()
+    header = {'journal_seq': journal_seq, 'collections': {}}
+    for name in COLLECTIONS:
+        header['collections'][name] = _encode_collection(data.get(name, []), body)
+    header_bytes = json.dumps(header, ensure_ascii=False).encode()
+
+    def write(f):
+        f.write(PREFIX.pack(MAGIC, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(body)
+
+    return write
+
+
+def _encode_collection(records, body):
+    """Append one collection's columns, string pool and id order to body; returns its header."""
+    # Records without an id get one, as JournalStorage.load would give them
+    records = [record if 'id' in record else dict(record, id=str(uuid.uuid4())) for record in records]
+    fields = list(dict.fromkeys(field for record in records for field in record))
+
+    pool = {}  # str, or ('j', json text) for other values -> pool index
+    entries = []
+
+    def intern(value):
+        key = value if isinstance(value, str) else (JSON_TAG, json.dumps(value, ensure_ascii=False, default=dict))
+        index = pool.get(key)
+        if index is None:
+            index = pool[key] = len(entries)
+            entries.append(STRING_TAG + value.encode() if isinstance(value, str) else JSON_TAG + key[1].encode())
+        return index
+
+    missing = object()
+    section = {'rows': len(records), 'fields': fields, 'columns': []}
+    for field in fields:
+        values = [record.get(field, missing) for record in records]
+        try:
+            distinct = dict.fromkeys(values)
+        except TypeError:
+            distinct = None
+        if distinct is not None and all(type(value) is str or value is missing for value in distinct):
+            # All strings: intern each distinct value once, then map the column in one go
+            distinct = {value: ABSENT if value is missing else intern(value) for value in distinct}
+            codes = array('I', map(distinct.__getitem__, values))
+        else:
+            codes = array('I', [ABSENT if value is missing else intern(value) for value in values])
+        section['columns'].append(len(body))
+        body += codes.tobytes()
+
+    offsets = array('Q', [0])
+    for entry in entries:
+        offsets.append(offsets[-1] + len(entry))
+    section['pool_size'] = len(entries)
+    section['pool_offsets'] = len(body)
+    body += offsets.tobytes()
+    section['pool_data'] = len(body)
+    body += b''.join(entries)
+
+    ids = [record['id'] for record in records]
+    section['id_order'] = len(body)
+    body += array('I', sorted(range(len(ids)), key=ids.__getitem__)).tobytes()
+    return section
+
+
+class MappedSection:
+    """Read access to one collection of a mapped snapshot.
+
+    Nothing is decoded up front: a record is built from its column cells
+    when asked for, and each pooled value is decoded once.
+    """
+
+    def __init__(self, buffer, base, header):
+        self.buffer = buffer
+        self.rows = header['rows']
+        self.fields = header['fields']
+        self.columns = [base + offset for offset in header['columns']]
+        self.pool_offsets = base + header['pool_offsets']
+        self.pool_data = base + header['pool_data']
+        self.id_order = base + header['id_order']
+        self.id_column = self.columns[self.fields.index('id')] if 'id' in self.fields else None
+        self._values = {}  # pool index -> decoded value
+
+    def value(self, index):
+        try:
+            return self._values[index]
+        except KeyError:
+            pass
+        start, end = struct.unpack_from('<QQ', self.buffer, self.pool_offsets + 8 * index)
+        raw = self.buffer[self.pool_data + start:self.pool_data + end]
+        if raw[:1] == STRING_TAG:
+            value = self._values[index] = raw[1:].decode()
+        else:
+            value = json.loads(raw[1:])
+            if not isinstance(value, (list, dict)):
+                self._values[index] = value  # Mutable values are decoded fresh for each record
+        return value
+
+    def records(self, start, stop):
+        """Decode rows start..stop-1 into dicts."""
+        count = max(0, min(stop, self.rows) - start)
+        if not count:
+            return []
+        columns = [
+            (field, struct.unpack_from(f'<{count}I', self.buffer, column + 4 * start))
+            for field, column in zip(self.fields, self.columns)
+        ]
+        value = self.value
+        records = []
+        for i in range(count):
+            record = {}
+            for field, codes in columns:
+                code = codes[i]
+                if code != ABSENT:
+                    record[field] = value(code)
+            records.append(record)
+        return records
+
+    def item_id(self, row):
+        code, = struct.unpack_from('<I', self.buffer, self.id_column + 4 * row)
+        return self.value(code)
+
+    def find_row(self, item_id):
+        """Binary search the id order for item_id; returns its row or -1."""
+        if self.id_column is None:
+            return -1
+        low, high = 0, self.rows
+        while low < high:
+            middle = (low + high) // 2
+            row, = struct.unpack_from('<I', self.buffer, self.id_order + 4 * middle)
+            current = self.item_id(row)
+            if current < item_id:
+                low = middle + 1
+            elif current > item_id:
+                high = middle
+            else:
+                return row
+        return -1
+
+
+class MappedCollection:
+    """A mapped collection with the journal entries written after the snapshot laid over it."""
+
+    def __init__(self, section):
+        self.section = section
+        self.updated = {}  # id -> record replacing a snapshot record
+        self.added = {}  # id -> record added after the snapshot, in order
+        self.deleted = set()  # Snapshot rows deleted since
+        self._live = None  # Snapshot rows still present, once any are deleted
+
+    def apply(self, entry):
+        """Replay one journal entry with the same outcome as JournalStorage.load."""
+        op = entry['op']
+        if op == 'add':
+            for record in entry.get('records') or [entry['record']]:
+                self._store(record, add=True)
+        elif op == 'update':
+            for record in entry['records']:
+                self._store(record, add=False)
+        elif op == 'delete':
+            for item_id in entry['ids']:
+                if self.added.pop(item_id, None) is None:
+                    row = self._snapshot_row(item_id)
+                    if row >= 0:
+                        self.deleted.add(row)
+                        self.updated.pop(item_id, None)
+                        self._live = None
+
+    def _store(self, record, add):
+        item_id = record['id']
+        if item_id in self.added:
+            self.added[item_id] = record
+        elif self._snapshot_row(item_id) >= 0:
+            self.updated[item_id] = record
+        elif add:
+            self.added[item_id] = record
+
+    def _snapshot_row(self, item_id):
+        row = self.section.find_row(item_id)
+        return -1 if row in self.deleted else row
+
+    def __len__(self):
+        return self.section.rows - len(self.deleted) + len(self.added)
+
+    def records(self, offset, limit):
+        base = self.section.rows - len(self.deleted)
+        stop = offset + limit
+        records = []
+        if offset < base:
+            if not self.deleted:
+                records = self.section.records(offset, min(stop, base))
+            else:
+                if self._live is None:
+                    self._live = array('I', (row for row in range(self.section.rows) if row not in self.deleted))
+                for row in self._live[offset:min(stop, base)]:
+                    records.extend(self.section.records(row, row + 1))
+            if self.updated:
+                records = [self.updated.get(record['id'], record) for record in records]
+        if stop > base and self.added:
+            records.extend(list(self.added.values())[max(0, offset - base):stop - base])
+        return records
+
+    def records_for_ids(self, ids):
+        records = []
+        for item_id in ids:
+            record = self.added.get(item_id) or self.updated.get(item_id)
+            if record is None:
+                row = self._snapshot_row(item_id)
+                if row < 0:
+                    continue
+                record = self.section.records(row, row + 1)[0]
+            records.append(record)
+        return records
+
+
+class MappedStorage(JournalStorage):
+    """Snapshot + journal persistence whose snapshot is memory-mapped.
+
+    The snapshot keeps every collection as fixed-width columns of indexes
+    into a string pool, so opening the library only maps the file and reads
+    its header; records are decoded a page at a time as they are shown. The
+    mapping is read-only, so several running copies of the app share its
+    pages. Mutations go to the same JSON-lines journal as JournalStorage,
+    and the entries written since the snapshot are replayed as an overlay.
+
+    Compaction replaces the snapshot from another thread, so mapping,
+    reading and unmapping the file all happen under one lock: a page is
+    never read from a mapping that is being closed.
+    """
+
+    supports_paging = True
+
+    def __init__(self, snapshot_path="library_data.libmap", journal_path=None, compact_threshold=1000):
+        super().__init__(snapshot_path, journal_path or snapshot_path + ".journal", compact_threshold)
+        self._file = None
+        self._map = None
+        self._collections = None
+        self._map_lock = threading.RLock()  # Held while the mapping is opened, read or closed
+
+    def _open(self):
+        """Map the snapshot and replay the journal over it, once; call with _map_lock held."""
+        if self._collections is not None:
+            return self._collections
+        # Entries appended since a compaction may still be waiting to be written
+        self.flush()
+        previous_seq = self._seq
+        header = {'journal_seq': 0, 'collections': {}}
+        base = 0
+        if os.path.exists(self.snapshot_path):
+            self._file = open(self.snapshot_path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, header_length = PREFIX.unpack_from(self._map, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.snapshot_path} is not a mapped library snapshot")
+            header = json.loads(self._map[PREFIX.size:PREFIX.size + header_length])
+            base = PREFIX.size + header_length
+
+        empty = {'rows': 0, 'fields': [], 'columns': [], 'pool_offsets': 0, 'pool_data': 0, 'id_order': 0}
+        collections = {
+            name: MappedCollection(MappedSection(self._map, base, header['collections'].get(name, empty)))
+            for name in COLLECTIONS
+        }
+
+        snapshot_seq = header['journal_seq']
+        self._seq = snapshot_seq
+        self._pending = 0
+        for entry in self._read_journal():
+            if entry['seq'] <= snapshot_seq:
+                continue  # Already folded into the snapshot
+            collections[entry['collection']].apply(entry)
+            self._seq = entry['seq']
+            self._pending += entry_weight(entry)
+        # Reopened after a compaction: entries appended meanwhile keep their numbers
+        self._seq = max(self._seq, previous_seq)
+
+        # Later appends would be glued onto a torn line, so cut it off now
+        if self._torn:
+            self._trim_journal(snapshot_seq)
+        self._collections = collections
+        return collections
+
+    def load(self):
+        return {name: self.load_collection(name) for name in COLLECTIONS}
+
+    def load_collection(self, collection):
+        with self._map_lock:
+            records = self._open()[collection]
+            return records.records(0, len(records))
+
+    def count(self, collection):
+        with self._map_lock:
+            return len(self._open()[collection])
+
+    def load_page(self, collection, offset, limit):
+        with self._map_lock:
+            return self._open()[collection].records(offset, limit)
+
+    def load_records(self, collection, ids):
+        with self._map_lock:
+            return self._open()[collection].records_for_ids(ids)
+
+    def close(self):
+        super().close()
+        with self._map_lock:
+            self._unmap()
+
+    def _unmap(self):
+        # Call with _map_lock held; records already handed out are decoded copies
+        self._collections = None
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = self._file = None
+
+    def _write_snapshot(self, data, seq):
+        # Runs on the compactor thread: encode first, then hold the lock only
+        # for the swap, as a mapped file cannot be replaced on Windows
+        write = encode_mapped_snapshot(data, seq)
+        with self._map_lock:
+            self._unmap()
+            atomic_write(self.snapshot_path, write)
+        self._trim_journal(seq)
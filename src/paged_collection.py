@@ -0,0 +1,97 @@
+from src.instrumentation import measure
+
+PAGE_SIZE = 200
+
+
+class PagedCollection:
+    """List-like stand-in for one stored collection that is read lazily.
+
+    Nothing is read until the collection is used. On backends that support
+    paging, len() is a count query and indexing fetches only the page the row
+    falls on, so showing a large collection reads just the rows on screen.
+    Iterating, slicing or mutating loads the whole collection once, after
+    which it behaves like the plain list it replaces. Records are shared by
+    id, so a record fetched twice is always the same object; wrap(records)
+    turns a batch of stored dicts into those objects when first read.
+    """
+
+    def __init__(self, storage, collection, wrap=None, page_size=PAGE_SIZE):
+        self.storage = storage
+        self.collection = collection
+        self.wrap = wrap
+        self.page_size = page_size
+        self._count = None
+        self._pages = {}  # Page number -> records, until the collection is loaded
+        self._by_id = {}
+        self._items = None
+
+    @property
+    def loaded(self):
+        return self._items is not None
+
+    def load(self):
+        """Read the whole collection (once) and return it as a list."""
+        if self._items is None:
+            self._items = self._shared(self.storage.load_collection(self.collection))
+            self._pages = {}
+            self._by_id = {}
+        return self._items
+
+    def records_for_ids(self, ids):
+        """Return the records with the given ids, in the order of ids."""
+        if self._items is not None or not self.storage.supports_paging:
+            by_id = {item['id']: item for item in self.load()}
+            return [by_id[item_id] for item_id in ids if item_id in by_id]
+        missing = [item_id for item_id in ids if item_id not in self._by_id]
+        self._shared(self.storage.load_records(self.collection, missing))
+        return [self._by_id[item_id] for item_id in ids if item_id in self._by_id]
+
+    def __len__(self):
+        if self._items is not None or not self.storage.supports_paging:
+            return len(self.load())
+        if self._count is None:
+            self._count = self.storage.count(self.collection)
+        return self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if self._items is not None or not self.storage.supports_paging or isinstance(index, slice):
+            return self.load()[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PagedCollection index out of range")
+        number, offset = divmod(index, self.page_size)
+        return self._page(number)[offset]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __setitem__(self, index, value):
+        self.load()[index] = value
+
+    def __delitem__(self, index):
+        del self.load()[index]
+
+    def append(self, item):
+        self.load().append(item)
+
+    def extend(self, items):
+        self.load().extend(items)
+
+    def _page(self, number):
+        page = self._pages.get(number)
+        if page is None:
+            with measure("load.page"):
+                records = self.storage.load_page(self.collection, number * self.page_size, self.page_size)
+                page = self._pages[number] = self._shared(records)
+        return page
+
+    def _shared(self, records):
+        """Return the shared object of each record, wrapping those not seen before."""
+        by_id = self._by_id
+        fresh = [record for record in records if record['id'] not in by_id]
+        by_id.update(zip([record['id'] for record in fresh], self.wrap(fresh) if self.wrap else fresh))
+        return [by_id[record['id']] for record in records]
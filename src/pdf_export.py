@@ -0,0 +1,224 @@
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
+
+FONT_NAME = "TimesNewRoman"
+FONT_FILE = "times.ttf"
+
+
+class GlyphWidths(dict):
+    """Per-font table of glyph advance widths at size 1000, filled on first use.
+
+    TrueType string widths are the plain sum of glyph widths, so after the
+    first sighting of a character no reportlab call is needed to measure text.
+    """
+
+    def __init__(self, font_name):
+        super().__init__()
+        self.font_name = font_name
+
+    def __missing__(self, char):
+        width = self[char] = pdfmetrics.stringWidth(char, self.font_name, 1000)
+        return width
+
+    def string_width(self, text, font_size):
+        return sum(map(self.__getitem__, text)) * font_size / 1000
+
+
+_glyph_widths = {}
+
+
+def glyph_widths(font_name):
+    """Return the shared glyph width table for a registered font."""
+    widths = _glyph_widths.get(font_name)
+    if widths is None:
+        widths = _glyph_widths[font_name] = GlyphWidths(font_name)
+    return widths
+
+
+def register_font(font_name=FONT_NAME, font_file=FONT_FILE):
+    if font_name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(font_name, font_file))
+
+
+class PdfTableExporter:
+    """Draws a titled, paginated table to a PDF, one row at a time.
+
+    Each cell is wrapped exactly once; the wrapped lines and their widths are
+    used both to size the row and to draw it. Rows can come from any iterable
+    and are drawn as they arrive, so the row data never has to be held in
+    memory as a whole.
+    """
+
+    # Set margins and spacing - reduce margins to make table wider
+    left_margin = 1.5 * cm
+    right_margin = 1.5 * cm
+    top_margin = 1.2 * cm
+    bottom_margin = 1.2 * cm
+    line_height = 15
+    header_height = 20
+    font_size = 10
+    PROGRESS_EVERY = 100
+
+    def __init__(self, file_path, headers, col_props, title, subtitle, font_name=FONT_NAME):
+        register_font(font_name)
+        self.font_name = font_name
+        self.widths = glyph_widths(font_name)
+        self.headers = headers
+        self.title = title
+        self.subtitle = subtitle
+
+        self.pdf = canvas.Canvas(file_path, pagesize=A4)
+        self.page_width, self.page_height = A4
+        self.usable_width = self.page_width - self.left_margin - self.right_margin
+        self.col_widths = [prop * self.usable_width for prop in col_props]
+
+    def export(self, rows, total=0, progress=None):
+        """Draw every row (a sequence of cell strings) and save the file.
+
+        progress(done, total) is called every PROGRESS_EVERY rows if given.
+        """
+        y_position = self.draw_title(self.page_height - self.top_margin)
+        y_position = self.draw_header(y_position)
+
+        for i, row_data in enumerate(rows, start=1):
+            cells = [self.wrap_text(text, width) for text, width in zip(row_data, self.col_widths)]
+            row_height = max(self.line_height, max(len(lines) for lines in cells) * self.line_height) + 8
+
+            # Check if we need a new page (with some buffer space to avoid tight fits)
+            if y_position - row_height < self.bottom_margin + 5:
+                y_position = self.new_page()
+
+            self.draw_row(i, cells, y_position, row_height)
+            y_position -= row_height
+
+            if progress and i % self.PROGRESS_EVERY == 0:
+                progress(i, total)
+
+        self.pdf.save()
+
+    def draw_title(self, y_pos):
+        pdf = self.pdf
+        pdf.setFont(self.font_name, 16)
+        title_width = self.widths.string_width(self.title, 16)
+        pdf.drawString((self.page_width - title_width) / 2, y_pos, self.title)
+
+        # Fixed spacing for subtitle
+        y_pos -= 35
+        pdf.setFont(self.font_name, 11)
+        subtitle_width = self.widths.string_width(self.subtitle, 11)
+        pdf.drawString((self.page_width - subtitle_width) / 2, y_pos, self.subtitle)
+        return y_pos - 35
+
+    def draw_header(self, y_pos):
+        pdf = self.pdf
+        header_height = self.header_height
+
+        # Draw header background
+        pdf.setFillColor(colors.Color(0.9, 0.9, 0.9))
+        pdf.rect(self.left_margin, y_pos - header_height, self.usable_width, header_height, fill=True, stroke=True)
+
+        pdf.setFillColor(colors.black)
+        pdf.setFont(self.font_name, 12)
+        x_position = self.left_margin
+        for header, width in zip(self.headers, self.col_widths):
+            pdf.rect(x_position, y_pos - header_height, width, header_height, stroke=True)
+
+            # Center text in header cell
+            header_width = self.widths.string_width(header, 12)
+            x_centered = x_position + (width - header_width) / 2
+            y_centered = y_pos - (header_height / 2) - 2
+            pdf.drawString(x_centered, y_centered, header)
+            x_position += width
+
+        return y_pos - header_height - 5
+
+    def new_page(self):
+        # Only the first page carries the title
+        self.pdf.showPage()
+        return self.draw_header(self.page_height - self.top_margin)
+
+    def draw_row(self, index, cells, y_position, row_height):
+        pdf = self.pdf
+
+        # Draw row background for even rows
+        if index % 2 == 0:
+            pdf.setFillColor(colors.Color(0.95, 0.95, 0.95))
+            pdf.rect(self.left_margin, y_position - row_height, self.usable_width, row_height, fill=True, stroke=True)
+
+        pdf.setFillColor(colors.black)
+        # One text object per row instead of one per drawString call
+        text = pdf.beginText()
+        text.setFont(self.font_name, self.font_size)
+        x_position = self.left_margin
+        for lines, width in zip(cells, self.col_widths):
+            pdf.rect(x_position, y_position - row_height, width, row_height, stroke=True)
+            self.draw_wrapped_cell(text, lines, x_position, y_position, width, row_height)
+            x_position += width
+        pdf.drawText(text)
+
+    def draw_wrapped_cell(self, text, lines, x, y, width, height):
+        """Add pre-wrapped (line, line width) pairs, centered in a cell, to a text object."""
+        line_height = self.line_height
+        total_lines_height = len(lines) * line_height
+
+        # Calculate starting position to center text vertically
+        start_y = y - (height - total_lines_height) / 2
+        if start_y > y - line_height:
+            start_y = y - line_height
+
+        current_y = start_y
+        for line, line_width in lines:
+            # Only draw if within cell bounds
+            if current_y > y - height + 2:
+                text.setTextOrigin(x + (width - line_width) / 2, current_y)
+                text.textOut(line)
+            current_y -= line_height
+
+    def wrap_text(self, text, width):
+        """Wrap text to the cell width; returns a list of (line, line width) pairs."""
+        font_size = self.font_size
+        measure = self.widths.string_width
+        space_width = measure(' ', font_size)
+
+        # Break words that do not fit on a line by themselves into hyphenated chunks
+        words = []
+        for word in str(text).split():
+            word_width = measure(word, font_size)
+            if word_width <= width - 10:
+                words.append((word, word_width))
+                continue
+            current_word, current_width = "", 0.0
+            for char in word:
+                char_width = measure(char, font_size)
+                if current_width + char_width > width - 20:
+                    words.append((current_word + "-", current_width + measure("-", font_size)))
+                    current_word, current_width = char, char_width
+                else:
+                    current_word += char
+                    current_width += char_width
+            if current_word:
+                words.append((current_word, current_width))
+
+        lines = []
+        current_line, current_width = [], 0.0
+        for word, word_width in words:
+            line_width = current_width + space_width + word_width if current_line else word_width
+            if line_width > width - 10 and current_line:
+                lines.append((' '.join(current_line), current_width))
+                current_line, current_width = [word], word_width
+            elif line_width > width - 10:
+                # Word is too long for a line by itself
+                lines.append((word, word_width))
+            else:
+                current_line.append(word)
+                current_width = line_width
+
+        if current_line:
+            lines.append((' '.join(current_line), current_width))
+
+        # Ensure we have at least one line
+        return lines or [("", 0.0)]
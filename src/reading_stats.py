@@ -0,0 +1,204 @@
+from datetime import date
+from functools import lru_cache
+from src.sort_keys import EMPTY_DATE, NOT_A_DATE, collation_key, date_key
+
+# Ways the statistics are broken down; year and month are those of the
+# finishing date, or of the starting date for items not finished yet
+DIMENSIONS = ('year', 'month', 'genre', 'author')
+
+START_FIELD = 'Başlama Tarihi'
+FINISH_FIELD = 'Bitirme Tarihi'
+# Record field behind each text dimension (magazines have neither)
+DIMENSION_FIELDS = {'genre': 'Tür', 'author': 'Yazar'}
+
+# Per-key counters: [items, total reading days, items with a reading duration]
+COUNT, DAYS, TIMED = range(3)
+
+# Batches at least this large (an Excel import) are counted with build()
+VECTORIZED_MIN_ITEMS = 1000
+
+
+@lru_cache(maxsize=65536)
+def day_number(key):
+    """Return the day ordinal of a YYYYMMDD date key, or None if it is no real date."""
+    if not EMPTY_DATE < key < NOT_A_DATE:
+        return None
+    try:
+        return date(key // 10000, key // 100 % 100, key % 100).toordinal()
+    except ValueError:
+        return None
+
+
+def reading_facts(item):
+    """Return (period, days): the YYYYMMDD date an item is counted under and how long it took to read."""
+    start = day_number(date_key(item.get(START_FIELD)))
+    finish = day_number(date_key(item.get(FINISH_FIELD)))
+    days = finish - start if start is not None and finish is not None and finish >= start else None
+    period = date_key(item.get(FINISH_FIELD)) if finish is not None else \
+        date_key(item.get(START_FIELD)) if start is not None else None
+    return period, days
+
+
+class ReadingStats:
+    """Item counts and average reading durations of one collection, per year, month, genre and author.
+
+    The counters are updated as items are added and deleted, so reading them
+    costs nothing however large the collection is; build() recomputes them
+    for a whole collection with NumPy when it is loaded. A reading duration
+    is the days from Başlama Tarihi to Bitirme Tarihi, for items that have
+    both.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.totals = [0, 0, 0]
+        self.groups = {dimension: {} for dimension in DIMENSIONS}
+
+    def add_many(self, items):
+        if len(items) >= VECTORIZED_MIN_ITEMS:
+            batch = ReadingStats()
+            batch.build(items)
+            self.merge(batch)
+            return
+        for item in items:
+            self._apply(item, 1)
+
+    def merge(self, other):
+        """Add the counters of another ReadingStats to these."""
+        for position, value in enumerate(other.totals):
+            self.totals[position] += value
+        for dimension, group in other.groups.items():
+            mine = self.groups[dimension]
+            for key, counters in group.items():
+                current = mine.get(key)
+                if current is None:
+                    mine[key] = list(counters)
+                else:
+                    for position, value in enumerate(counters):
+                        current[position] += value
+
+    def remove_many(self, items):
+        for item in items:
+            self._apply(item, -1)
+
+    def _apply(self, item, sign):
+        period, days = reading_facts(item)
+        keys = {
+            'year': None if period is None else period // 10000,
+            'month': None if period is None else period // 100
+        }
+        for dimension, field in DIMENSION_FIELDS.items():
+            keys[dimension] = item.get(field)
+        self._count(self.totals, sign, days)
+        for dimension, key in keys.items():
+            if key is None:
+                continue
+            group = self.groups[dimension]
+            counters = group.get(key)
+            if counters is None:
+                counters = group[key] = [0, 0, 0]
+            self._count(counters, sign, days)
+            if not counters[COUNT]:
+                del group[key]
+
+    @staticmethod
+    def _count(counters, sign, days):
+        counters[COUNT] += sign
+        if days is not None:
+            counters[DAYS] += sign * days
+            counters[TIMED] += sign
+
+    def build(self, items):
+        """Recompute every counter from items in a few vectorised passes."""
+        import numpy as np
+        self.clear()
+        if not len(items):
+            return
+        starts = _date_keys(items, START_FIELD)
+        finishes = _date_keys(items, FINISH_FIELD)
+        start_days, start_valid = _day_numbers(starts)
+        finish_days, finish_valid = _day_numbers(finishes)
+
+        timed = start_valid & finish_valid & (finish_days >= start_days)
+        days = np.where(timed, finish_days - start_days, 0)
+        period = np.where(finish_valid, finishes, np.where(start_valid, starts, 0))
+        dated = period > 0
+
+        self.totals = [len(items), int(days.sum()), int(timed.sum())]
+        self._group('year', period // 10000, dated, days, timed)
+        self._group('month', period // 100, dated, days, timed)
+        for dimension, field in DIMENSION_FIELDS.items():
+            lookup = {}
+            codes = np.fromiter(
+                (-1 if value is None else lookup.setdefault(value, len(lookup))
+                 for value in (item.get(field) for item in items)),
+                dtype=np.int64, count=len(items)
+            )
+            labels = list(lookup)
+            self._group(dimension, codes, codes >= 0, days, timed, labels)
+
+    def _group(self, dimension, keys, present, days, timed, labels=None):
+        import numpy as np
+        keys = keys[present]
+        if not len(keys):
+            return
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse)
+        total_days = np.bincount(inverse, weights=days[present])
+        timed_counts = np.bincount(inverse, weights=timed[present])
+        group = self.groups[dimension]
+        for position, key in enumerate(unique.tolist()):
+            group[labels[key] if labels is not None else key] = [
+                int(counts[position]), int(total_days[position]), int(timed_counts[position])
+            ]
+
+    def summary(self, dimension):
+        """Return [(key, items, average reading days or None)] in key order.
+
+        Years and months (YYYYMM) are integers in date order; genres and
+        authors come in Turkish alphabetical order.
+        """
+        group = self.groups[dimension]
+        keys = sorted(group, key=collation_key if dimension in DIMENSION_FIELDS else None)
+        return [(key, group[key][COUNT], average_days(group[key])) for key in keys]
+
+    def total(self):
+        """Return (items, average reading days or None) over the whole collection."""
+        return self.totals[COUNT], average_days(self.totals)
+
+
+def average_days(counters):
+    return counters[DAYS] / counters[TIMED] if counters[TIMED] else None
+
+
+def _date_keys(items, field):
+    import numpy as np
+    computed = {}  # Dates repeat a lot; parse each once
+
+    def key(value):
+        try:
+            return computed[value]
+        except KeyError:
+            result = computed[value] = date_key(value)
+            return result
+        except TypeError:
+            return date_key(value)
+
+    return np.fromiter((key(item.get(field)) for item in items), dtype=np.int64, count=len(items))
+
+
+def _day_numbers(keys):
+    """Return (day ordinals, valid) for an array of YYYYMMDD keys; invalid dates are marked."""
+    import numpy as np
+    candidate = (keys > EMPTY_DATE) & (keys < NOT_A_DATE)
+    safe = np.where(candidate, keys, 19700101)
+    years, months, days = safe // 10000, safe // 100 % 100, safe % 100
+    valid = candidate & (months >= 1) & (months <= 12) & (days >= 1)
+    month_start = ((years - 1970) * 12 + np.clip(months, 1, 12) - 1).astype('datetime64[M]')
+    day = month_start.astype('datetime64[D]') + (days - 1)
+    valid &= day.astype('datetime64[M]') == month_start  # 31/02 and the like
+    # Same numbering as date.toordinal(), so both paths agree
+    ordinals = day.astype(np.int64) + date(1970, 1, 1).toordinal()
+    return ordinals, valid
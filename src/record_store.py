@@ -0,0 +1,395 @@
+from array import array
+from collections.abc import MutableMapping, Sequence
+from itertools import accumulate
+import re
+
+MISSING = object()  # Marks a field a record does not have
+
+UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+# How each known field is kept; any other field is stored as packed text
+FIELD_ENCODINGS = {
+    'Yazar': 'category',
+    'Tür': 'category',
+    'Sayı': 'category',
+    'Cilt': 'category',
+    'type': 'category',
+    'Başlama Tarihi': 'date',
+    'Bitirme Tarihi': 'date',
+    'Tarih': 'month'
+}
+
+
+# Code array type to move to once a column outgrows its current one
+WIDER_CODES = {'B': ('H', 0xFF), 'H': ('I', 0xFFFF)}
+
+
+class CategoryColumn:
+    """Dictionary-encoded column: each distinct value is kept once and rows hold
+    codes, one byte wide until there are more distinct values than that fits.
+    """
+
+    def __init__(self):
+        self.codes = array('B')
+        self.values = [MISSING]
+        self.lookup = {MISSING: 0}
+
+    def encode(self, value):
+        try:
+            return self.lookup[value]
+        except KeyError:
+            value = own_copy(value)
+            code = self.lookup[value] = self.new_code(value)
+            return code
+        except TypeError:  # Unhashable values are kept, just not shared
+            return self.new_code(value)
+
+    def new_code(self, value):
+        self.values.append(value)
+        code = len(self.values) - 1
+        wider = WIDER_CODES.get(self.codes.typecode)
+        if wider and code > wider[1]:
+            self.codes = array(wider[0], self.codes)
+        return code
+
+    def extend(self, values):
+        # Encode first: a new value may widen self.codes
+        codes = [self.encode(value) for value in values]
+        self.codes.extend(codes)
+
+    def get(self, row):
+        return self.values[self.codes[row]]
+
+    def set(self, row, value):
+        self.codes[row] = self.encode(value)
+
+
+class DateColumn(CategoryColumn):
+    """Canonical DD/MM/YYYY (or MM/YYYY) dates as YYYYMMDD (or YYYYMM) integers.
+
+    Anything else, including empty strings, is dictionary-encoded under
+    negative codes so it reads back exactly as stored.
+    """
+
+    def __init__(self, month=False):
+        super().__init__()
+        self.codes = array('i')
+        self.month = month
+        self.decoded = {0: MISSING}  # code -> value, for every code handed out
+
+    def new_code(self, value):
+        code = 0
+        if isinstance(value, str) and value.isascii():
+            if self.month:
+                if len(value) == 7 and value[2] == '/' and value[:2].isdigit() and value[3:].isdigit():
+                    code = int(value[3:] + value[:2])
+            elif len(value) == 10 and value[2] == '/' and value[5] == '/' \
+                    and value[:2].isdigit() and value[3:5].isdigit() and value[6:].isdigit():
+                code = int(value[6:] + value[3:5] + value[:2])
+        if code <= 0:
+            code = -super().new_code(value)
+        self.decoded[code] = value
+        return code
+
+    def get(self, row):
+        return self.decoded[self.codes[row]]
+
+
+class TextColumn:
+    """Strings packed as UTF-8 into one buffer; rows hold an offset and a length.
+
+    Values that are not strings are kept as is in a side table. Rewritten
+    values are appended, so the buffer only grows within a session.
+    """
+
+    OTHER = 0xFFFFFFFF  # Length marking a value kept in self.other
+    ABSENT = 0xFFFFFFFE
+
+    def __init__(self):
+        self.data = bytearray()
+        self.starts = array('Q')
+        self.lengths = array('I')
+        self.other = {}
+
+    def extend(self, values):
+        if not values:
+            return
+        first_row = len(self.lengths)
+        encoded = [value.encode() if isinstance(value, str) else b'' for value in values]
+        lengths = list(map(len, encoded))
+        self.starts.extend(accumulate(lengths[:-1], initial=len(self.data)))
+        self.lengths.extend(lengths)
+        self.data += b''.join(encoded)
+        for row, value in enumerate(values, start=first_row):
+            if not isinstance(value, str):
+                self.set(row, value)
+
+    def get(self, row):
+        length = self.lengths[row]
+        if length == self.ABSENT:
+            return MISSING
+        if length == self.OTHER:
+            return self.other[row]
+        start = self.starts[row]
+        return self.data[start:start + length].decode()
+
+    def set(self, row, value):
+        self.other.pop(row, None)
+        if value is MISSING:
+            self.lengths[row] = self.ABSENT
+        elif isinstance(value, str):
+            encoded = value.encode()
+            self.starts[row] = len(self.data)
+            self.lengths[row] = len(encoded)
+            self.data += encoded
+        else:
+            self.lengths[row] = self.OTHER
+            self.other[row] = value
+
+
+class IdColumn:
+    """uuid4 ids as 16 raw bytes per row, with a dict from id to row for lookups.
+
+    Ids that are not canonical lowercase uuid strings are kept verbatim in a
+    side table and indexed as they are. The string of a row is decoded once,
+    the first time it is read, and kept; views and deletes read ids a lot.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.other = {}  # row -> id
+        self.index = {}  # 16 id bytes (or the verbatim id) -> row
+        self.strings = []  # row -> decoded id, None until first read
+
+    def extend(self, values):
+        row = len(self.data) // 16
+        packed = []
+        for offset, value in enumerate(values):
+            key = uuid_bytes(value)
+            if key is None:
+                self.other[row + offset] = value
+                if value is not MISSING:
+                    self.index[value] = row + offset
+                packed.append(bytes(16))
+            else:
+                self.index[key] = row + offset
+                packed.append(key)
+        self.data += b''.join(packed)
+        self.strings.extend([None] * len(values))
+
+    def get(self, row):
+        value = self.strings[row]
+        if value is None:
+            if row in self.other:
+                value = self.other[row]
+            else:
+                raw = self.data[row * 16:row * 16 + 16].hex()
+                value = f"{raw[:8]}-{raw[8:12]}-{raw[12:16]}-{raw[16:20]}-{raw[20:]}"
+            self.strings[row] = value
+        return value
+
+    def set(self, row, value):
+        self.forget(row)
+        self.strings[row] = None
+        key = uuid_bytes(value)
+        if key is None:
+            self.other[row] = value
+            if value is not MISSING:
+                self.index[value] = row
+            key = bytes(16)
+        else:
+            self.index[key] = row
+        self.data[row * 16:row * 16 + 16] = key
+
+    def forget(self, row):
+        """Drop the index entry of a row, as when it is discarded."""
+        key = self.other.pop(row, None) if row in self.other else bytes(self.data[row * 16:row * 16 + 16])
+        if self.index.get(key) == row:
+            del self.index[key]
+
+    def row_for(self, item_id):
+        """Return the row holding item_id, or None."""
+        key = uuid_bytes(item_id)
+        return self.index.get(item_id if key is None else key)
+
+
+def own_copy(value):
+    """Return a fresh copy of a string.
+
+    Holding on to a string that came out of a loaded record would keep the
+    allocator pages of all the records around it alive after they are freed.
+    """
+    return value.encode().decode() if isinstance(value, str) else value
+
+
+def uuid_bytes(value):
+    """Return the 16 bytes of a canonical lowercase uuid string, or None."""
+    if isinstance(value, str) and UUID_PATTERN.fullmatch(value):
+        return bytes.fromhex(value.replace('-', ''))
+    return None
+
+
+def make_column(field):
+    if field == 'id':
+        return IdColumn()
+    encoding = FIELD_ENCODINGS.get(field)
+    if encoding == 'category':
+        return CategoryColumn()
+    if encoding in ('date', 'month'):
+        return DateColumn(month=encoding == 'month')
+    return TextColumn()
+
+
+class Record(MutableMapping):
+    """A row of a RecordStore, readable and writable like the dict it was made from.
+
+    Rows compare and hash by identity, as one record is one row. Pickling or
+    dict() gives back a plain dict; pass default=dict to json.dumps.
+    """
+
+    __slots__ = ('store', 'row')
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        column = self.store.columns.get(key)
+        value = MISSING if column is None else column.get(self.row)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        column = self.store.columns.get(key)
+        value = MISSING if column is None else column.get(self.row)
+        return default if value is MISSING else value
+
+    def __setitem__(self, key, value):
+        self.store.column(key).set(self.row, value)
+
+    def __delitem__(self, key):
+        self[key]  # KeyError if absent
+        self.store.columns[key].set(self.row, MISSING)
+
+    def __iter__(self):
+        row = self.row
+        for key, column in self.store.columns.items():
+            if column.get(row) is not MISSING:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class Snapshot(Sequence):
+    """Records of a store as of when the snapshot was taken, read back as plain dicts.
+
+    Only the columns that existed then are read, so the GUI thread can add
+    a column (a new field on add or import) while a background compaction
+    writes the snapshot out. The dicts are made as the snapshot is read.
+    """
+
+    def __init__(self, store, records):
+        self.store = store
+        self.records = list(records)
+        self.columns = list(store.columns.items())
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.as_dict(record) for record in self.records[position]]
+        return self.as_dict(self.records[position])
+
+    def __iter__(self):
+        return map(self.as_dict, self.records)
+
+    def __reduce__(self):
+        return (list, (list(self),))
+
+    def as_dict(self, record):
+        if not isinstance(record, Record) or record.store is not self.store:
+            return dict(record)
+        row = record.row
+        values = {}
+        for field, column in self.columns:
+            value = column.get(row)
+            if value is not MISSING:
+                values[field] = value
+        return values
+
+
+class RecordStore:
+    """Columnar storage for the records of one collection.
+
+    Each field is a column: authors, genres and other repetitive fields are
+    dictionary-encoded, dates are integers, ids are 16 raw bytes and other
+    text is packed UTF-8, so a record costs a fraction of a dict of strings.
+    Callers get one Record view per row, which behaves like the dict.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        self.rows = []  # Record view of every row, by row number
+        self.live = bytearray()  # 0 once a row has been discarded
+
+    def snapshot(self, records):
+        """Return a Snapshot of records, which are this store's rows, safe to read from another thread."""
+        return Snapshot(self, records)
+
+    def column(self, field):
+        column = self.columns.get(field)
+        if column is None:
+            column = self.columns[field] = make_column(field)
+            column.extend([MISSING] * len(self.rows))
+        return column
+
+    def add(self, record):
+        """Store a dict (or any mapping) and return its Record view."""
+        return self.add_many([record])[0]
+
+    def add_many(self, records):
+        """Store dicts column by column and return their Record views."""
+        for field in dict.fromkeys(field for record in records for field in record):
+            self.column(field)
+        for field, column in self.columns.items():
+            column.extend([record.get(field, MISSING) for record in records])
+        start = len(self.rows)
+        views = [Record(self, row) for row in range(start, start + len(records))]
+        self.rows.extend(views)
+        self.live.extend(b'\x01' * len(records))
+        return views
+
+    def discard(self, record):
+        """Mark a row deleted so id lookups no longer find it."""
+        self.live[record.row] = 0
+        column = self.columns.get('id')
+        if column is not None:
+            column.forget(record.row)
+
+    def find(self, item_id):
+        found = self.find_many([item_id])
+        return found[0] if found else None
+
+    def find_many(self, ids):
+        """Return the live records with the given ids, in the order of ids."""
+        column = self.columns.get('id')
+        if column is None:
+            return []
+        found = []
+        for item_id in dict.fromkeys(ids):
+            row = column.row_for(item_id)
+            if row is not None and self.live[row]:
+                found.append(self.rows[row])
+        return found
@@ -0,0 +1,263 @@
+from array import array
+import re
+import time
+from bisect import bisect_left
+
+# Dotted/dotless I pairs that str.lower() gets wrong for Turkish
+TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Fields that are bookkeeping rather than something a user would search for
+UNSEARCHABLE_FIELDS = ('id', 'type')
+
+FIELD_SEPARATOR = '\x1f'
+
+# Drop the index for a rebuild once removed records outnumber live ones
+COMPACT_MIN_REMOVED = 1024
+# Stop intersecting once the next posting is this many times longer than the
+# candidates: verifying them against their text is cheaper by then
+VERIFY_RATIO = 8
+# Answer a one-word query from the vocabulary instead of verifying candidates
+# once there are more than one per this many vocabulary tokens
+VOCABULARY_SCAN_RATIO = 16
+
+
+def turkish_lower(text):
+    """Lowercase text with Turkish rules (İ -> i, I -> ı)."""
+    return text.translate(TURKISH_LOWER).lower()
+
+
+def searchable_fields(item):
+    """Yield the lowercased string fields of a record that should be searchable."""
+    for key, value in item.items():
+        if isinstance(value, str) and value and key not in UNSEARCHABLE_FIELDS:
+            yield turkish_lower(value)
+
+
+def item_matches(item, text):
+    """Return whether SearchIndex.search(text) would find item, without an index."""
+    query = turkish_lower(text.strip())
+    if not query:
+        return True
+    fields = FIELD_SEPARATOR.join(searchable_fields(item))
+    if len(query) >= 3:
+        return query in fields
+    return any(token.startswith(query) for token in TOKEN_PATTERN.findall(fields))
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Inverted index over one collection, with token and trigram postings.
+
+    Postings are sorted arrays of small integer ordinals assigned in
+    insertion order, 4 bytes per entry, so appending keeps them sorted and
+    collection order is plain ordinal order. The lowercased text of every
+    record is packed UTF-8 in one buffer, found through an offsets array.
+    Removing an item only clears its slot, and queries skip cleared
+    ordinals; once they outnumber the live ones the index is dropped and
+    rebuilt on the next query.
+
+    Queries of three or more characters are substring matches: the trigram
+    postings are intersected from the rarest one and each candidate is
+    verified against its packed text. A query that is a single word can
+    only match inside one token, so when that is cheaper it is answered
+    exactly by merging the postings of the tokens containing it. Shorter
+    queries match word prefixes through a sorted token vocabulary. The index
+    is built on the first query and kept current through add/remove
+    afterwards.
+
+    A query containing the previous query is answered by re-checking the
+    previous matches only, as long as the index has not changed since.
+    """
+
+    def __init__(self):
+        self.built = False
+        self.clear()
+
+    def clear(self):
+        """Drop all postings; the index is rebuilt on the next query."""
+        self.built = False
+        self._ordinals = {}  # item id -> ordinal
+        self._items = []  # ordinal -> item, None once removed
+        self._text = bytearray()  # lowercased text of every ordinal, UTF-8
+        self._offsets = array('Q', [0])  # ordinal -> start of its text; one past the end last
+        self._removed = 0
+        self._trigrams = {}
+        self._tokens = {}
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._pending_build = None
+        self._removed_while_building = set()
+        self._last_search = None  # (query, version, ordinals)
+        self.version = 0
+
+    def build(self, items):
+        self.start_build(items)
+        self.build_step(None)
+
+    def start_build(self, items):
+        """Begin building from a snapshot of items; feed it with build_step()."""
+        self.clear()
+        self.built = True
+        self._pending_build = list(items)
+        self._build_position = 0
+
+    @property
+    def building(self):
+        return self._pending_build is not None
+
+    def build_step(self, budget):
+        """Index pending items for up to budget seconds (None = all); returns True when done."""
+        if self._pending_build is None:
+            return True
+        deadline = None if budget is None else time.perf_counter() + budget
+        pending = self._pending_build
+        position = self._build_position
+        while position < len(pending):
+            item = pending[position]
+            position += 1
+            if item['id'] not in self._removed_while_building:
+                self.add(item)
+            if deadline is not None and position % 64 == 0 and time.perf_counter() >= deadline:
+                break
+        self._build_position = position
+
+        if position >= len(pending):
+            self._pending_build = None
+            self._removed_while_building = set()
+            return True
+        return False
+
+    def add(self, item):
+        if not self.built:
+            return
+        ordinal = len(self._items)
+        self.version += 1
+        text = FIELD_SEPARATOR.join(searchable_fields(item))
+        self._ordinals[item['id']] = ordinal
+        self._items.append(item)
+        self._text += text.encode()
+        self._offsets.append(len(self._text))
+
+        postings = self._trigrams
+        for gram in trigrams(text):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = array('I', (ordinal,))
+            else:
+                ids.append(ordinal)
+        for token in set(TOKEN_PATTERN.findall(text)):
+            ids = self._tokens.get(token)
+            if ids is None:
+                self._tokens[token] = array('I', (ordinal,))
+                self._vocabulary_dirty = True
+            else:
+                ids.append(ordinal)
+
+    def add_many(self, items):
+        for item in items:
+            self.add(item)
+
+    def remove(self, item_id):
+        if not self.built:
+            return
+        ordinal = self._ordinals.pop(item_id, None)
+        if ordinal is None:
+            if self._pending_build is not None:
+                # Not reached by the build yet; make sure it never is
+                self._removed_while_building.add(item_id)
+            return
+        self.version += 1
+        self._items[ordinal] = None
+        self._removed += 1
+        if self._removed >= COMPACT_MIN_REMOVED and self._removed > len(self._ordinals):
+            # Postings and text still carry every removed item; start over
+            self.clear()
+
+    def search(self, text):
+        """Return the matching items in the order they were indexed."""
+        self.build_step(None)
+        query = turkish_lower(text.strip())
+        items = self._items
+        if not query:
+            return [item for item in items if item is not None]
+        if len(query) >= 3:
+            ordinals = self._substring_matches(query)
+            self._last_search = (query, self.version, ordinals)
+        else:
+            ordinals = sorted(self._prefix_matches(query))
+        return [item for item in map(items.__getitem__, ordinals) if item is not None]
+
+    def _verified(self, query, ordinals):
+        """Return the ordinals whose text contains query."""
+        needle = query.encode()
+        find = self._text.find
+        offsets = self._offsets
+        # UTF-8 is self-synchronising, so a byte match is a character match
+        return [ordinal for ordinal in ordinals
+                if find(needle, offsets[ordinal], offsets[ordinal + 1]) >= 0]
+
+    def _substring_matches(self, query):
+        """Return the sorted ordinals of the items containing query."""
+        if self._last_search is not None:
+            last_query, last_version, last_ordinals = self._last_search
+            if last_version == self.version and last_query in query:
+                # Anything containing query also contains last_query
+                if self._scan_vocabulary(query, len(last_ordinals)):
+                    return self._word_matches(query)
+                return self._verified(query, last_ordinals)
+
+        postings = []
+        for gram in trigrams(query):
+            ids = self._trigrams.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+
+        if len(query) == 3:
+            # A lone trigram's posting is exactly the items containing it
+            return postings[0].tolist()
+
+        # Intersect starting from the rarest trigram
+        postings.sort(key=len)
+        if self._scan_vocabulary(query, len(postings[0])):
+            return self._word_matches(query)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            if len(candidates) * VERIFY_RATIO < len(ids):
+                break
+            candidates = candidates.intersection(ids)
+            if not candidates:
+                return []
+        return self._verified(query, sorted(candidates))
+
+    def _scan_vocabulary(self, query, candidates):
+        """Return whether _word_matches beats verifying this many candidates."""
+        return candidates * VOCABULARY_SCAN_RATIO > len(self._tokens) and TOKEN_PATTERN.fullmatch(query)
+
+    def _word_matches(self, word):
+        """Return the sorted ordinals of the items with a token containing word."""
+        # Tokens are maximal runs of word characters, so a word is in a text
+        # exactly when it is inside one of the text's tokens
+        postings = [ids for token, ids in self._tokens.items() if word in token]
+        if len(postings) == 1:
+            return postings[0].tolist()
+        matches = set()
+        for ids in postings:
+            matches.update(ids)
+        return sorted(matches)
+
+    def _prefix_matches(self, prefix):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._tokens)
+            self._vocabulary_dirty = False
+
+        matches = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            matches.update(self._tokens[self._vocabulary[position]])
+            position += 1
+        return matches
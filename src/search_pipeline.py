@@ -0,0 +1,78 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# Default wait after the last keystroke before a query runs
+DEFAULT_DEBOUNCE_MS = 150
+# Time slice for index building between event-loop turns, a bit under one 60 Hz frame
+FRAME_BUDGET = 0.012
+
+
+class SearchPipeline(QObject):
+    """Debounced search-as-you-type on top of DataManager's search indexes.
+
+    Each keystroke restarts the debounce timer, so only the last query of a
+    burst runs and older ones are dropped. If the collection's index still
+    has to be built, it is built in frame-sized slices on the event loop so
+    typing never stalls.
+    """
+
+    results_ready = pyqtSignal(str, object)  # item type, matching items
+
+    def __init__(self, data_manager, debounce_ms=DEFAULT_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self._query = None  # (item type, text) waiting to run
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._start)
+
+        self._builder = QTimer(self)
+        self._builder.setInterval(0)
+        self._builder.timeout.connect(self._build_step)
+
+    def set_debounce(self, debounce_ms):
+        self._debounce.setInterval(debounce_ms)
+
+    def submit(self, current_type, text):
+        """Queue a query, replacing any that has not run yet."""
+        self._query = (current_type, text)
+        self._builder.stop()
+        self._debounce.start()
+
+    def cancel(self):
+        self._query = None
+        self._debounce.stop()
+        self._builder.stop()
+
+    def _index(self, current_type):
+        return self.data_manager.search_index(current_type)
+
+    def _start(self):
+        if self._query is None:
+            return
+        current_type, _ = self._query
+        index = self._index(current_type)
+        if index is None:
+            # The storage backend answers searches itself
+            self._finish()
+            return
+        if not index.built:
+            index.start_build(self.data_manager.items_of_type(current_type))
+        if index.building:
+            self._builder.start()
+        else:
+            self._finish()
+
+    def _build_step(self):
+        if self._query is None:
+            self._builder.stop()
+            return
+        if self._index(self._query[0]).build_step(FRAME_BUDGET):
+            self._builder.stop()
+            self._finish()
+
+    def _finish(self):
+        current_type, text = self._query
+        self._query = None
+        self.results_ready.emit(current_type, self.data_manager.search(current_type, text))
@@ -0,0 +1,145 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_right
+from functools import cmp_to_key, lru_cache
+from src.search_index import turkish_lower
+
+# Letters in Turkish alphabetical order; q, w and x go where they do in Latin
+TURKISH_ALPHABET = 'abcçdefgğhıijklmnoöpqrsştuüvwxyz'
+
+# Letters map onto private-use characters in alphabet order, so a plain string
+# comparison of two keys follows Turkish collation; spaces, digits and
+# punctuation keep their code points and sort before any letter
+COLLATION = str.maketrans({letter: chr(0xE000 + rank) for rank, letter in enumerate(TURKISH_ALPHABET)})
+
+# Digit runs are zero-padded so "Sayı 9" sorts before "Sayı 10"
+NUMBER_PATTERN = re.compile(r'\d+')
+NUMBER_WIDTH = 12
+
+# Date keys: canonical dates as YYYYMMDD (or YYYYMM) integers, empty values
+# first and text that is not a date after every real date
+EMPTY_DATE = 0
+NOT_A_DATE = 999_999_999
+UNKNOWN_DATE = -1  # Slot of a row whose key has not been computed
+
+
+@lru_cache(maxsize=4096)
+def _fold(char):
+    """Strip the accents off a letter that is not part of the Turkish alphabet (é -> e)."""
+    if char in TURKISH_ALPHABET:
+        return char
+    base = unicodedata.normalize('NFD', char)
+    return base[0] if base[0].isascii() else char
+
+
+def collation_key(value):
+    """Return a key that orders text by Turkish collation, case-insensitively."""
+    text = turkish_lower(str(value).strip())
+    if not text.isascii():
+        text = ''.join(map(_fold, text))
+    if any(char.isdigit() for char in text):
+        text = NUMBER_PATTERN.sub(lambda match: match.group().zfill(NUMBER_WIDTH), text)
+    return text.translate(COLLATION)
+
+
+def date_key(value, month=False):
+    """Return the integer key of a canonical DD/MM/YYYY (or MM/YYYY) date."""
+    if not isinstance(value, str) or not value.strip():
+        return EMPTY_DATE
+    if value.isascii():
+        if month:
+            if len(value) == 7 and value[2] == '/' and value[:2].isdigit() and value[3:].isdigit():
+                return int(value[3:] + value[:2])
+        elif len(value) == 10 and value[2] == '/' and value[5] == '/' \
+                and value[:2].isdigit() and value[3:5].isdigit() and value[6:].isdigit():
+            return int(value[6:] + value[3:5] + value[:2])
+    return NOT_A_DATE
+
+
+def sort_key(value, kind):
+    """Key of one field value; kind is 'text', 'date' or 'month' as in IMPORT_SCHEMAS."""
+    if kind == 'text':
+        return collation_key(value)
+    return date_key(value, month=kind == 'month')
+
+
+class SortKeyIndex:
+    """Sort keys of the records of one RecordStore, computed when they are stored.
+
+    Keys are kept per field in a list (text) or an int array (dates) indexed
+    by the record's row, so sorting a collection is a key lookup per record
+    rather than a collation or date parse. Records that are not rows of the
+    store get their keys computed on the spot.
+    """
+
+    def __init__(self, store, schema):
+        self.store = store
+        self.schema = schema  # {field: 'text' | 'date' | 'month'}
+        self.build([])
+
+    def build(self, items):
+        self._keys = {
+            field: [] if kind == 'text' else array('i')
+            for field, kind in self.schema.items()
+        }
+        self.add_many(items)
+
+    def add_many(self, items):
+        rows = len(self.store.rows)
+        for field, kind in self.schema.items():
+            keys = self._keys[field]
+            if len(keys) < rows:
+                keys.extend([None if kind == 'text' else UNKNOWN_DATE] * (rows - len(keys)))
+            computed = {}  # Authors, genres and dates repeat a lot; key each value once
+            for item in items:
+                value = item.get(field, '')
+                try:
+                    key = computed[value]
+                except KeyError:
+                    key = computed[value] = sort_key(value, kind)
+                except TypeError:
+                    key = sort_key(value, kind)
+                keys[item.row] = key
+
+    def remove(self, item):
+        for field, keys in self._keys.items():
+            if item.row < len(keys):
+                keys[item.row] = None if self.schema[field] == 'text' else UNKNOWN_DATE
+
+    def key_function(self, field):
+        """Return a function giving the sort key of an item for field."""
+        kind = self.schema.get(field, 'text')
+        keys = self._keys.get(field, ())
+        store = self.store
+        unknown = None if kind == 'text' else UNKNOWN_DATE
+
+        def key(item):
+            if getattr(item, 'store', None) is store and item.row < len(keys):
+                value = keys[item.row]
+                if value != unknown:
+                    return value
+            return sort_key(item.get(field, ''), kind)
+        return key
+
+    def insertion_point(self, items, item, order):
+        """Return where item goes in items already sorted by order, after any equal items."""
+        keys = [(self.key_function(field), descending) for field, descending in order]
+
+        def compare(a, b):
+            for key, descending in keys:
+                key_a, key_b = key(a), key(b)
+                if key_a != key_b:
+                    return (key_a < key_b) - (key_a > key_b) if descending else (key_a > key_b) - (key_a < key_b)
+            return 0
+
+        wrapped = cmp_to_key(compare)
+        return bisect_right(items, wrapped(item), key=wrapped)
+
+    def sort(self, items, order):
+        """Return items sorted by order, a list of (field, descending), most significant first."""
+        items = list(items)
+        # Stable sorts from the least significant field up give the combined order
+        for field, descending in reversed(order):
+            items.sort(key=self.key_function(field), reverse=descending)
+        return items
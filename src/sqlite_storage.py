@@ -0,0 +1,198 @@
+import json
+import re
+import sqlite3
+from src.storage import COLLECTIONS, StorageBackend
+from src.dates import iso_date
+from src.search_index import FIELD_SEPARATOR, searchable_fields
+
+# Field shown as the title column of each collection
+TITLE_FIELDS = {'books': 'Kitap', 'articles': 'Makale', 'magazines': 'Dergi'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    collection TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    yazar TEXT NOT NULL,
+    tur TEXT NOT NULL,
+    title TEXT NOT NULL,
+    baslama TEXT,
+    bitirme TEXT,
+    search_text TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_position ON items (collection, position);
+CREATE INDEX IF NOT EXISTS items_yazar ON items (collection, yazar);
+CREATE INDEX IF NOT EXISTS items_tur ON items (collection, tur);
+CREATE INDEX IF NOT EXISTS items_title ON items (collection, title);
+CREATE INDEX IF NOT EXISTS items_baslama ON items (collection, baslama);
+CREATE INDEX IF NOT EXISTS items_bitirme ON items (collection, bitirme);
+"""
+
+INSERT = """
+INSERT OR REPLACE INTO items
+    (id, collection, position, yazar, tur, title, baslama, bitirme, search_text, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE = """
+UPDATE items
+SET yazar = ?, tur = ?, title = ?, baslama = ?, bitirme = ?, search_text = ?, data = ?
+WHERE id = ?
+"""
+
+MAX_PARAMETERS = 500
+
+
+def _token_prefix(text, prefix):
+    """SQL function: does any word of text start with prefix?"""
+    return _prefix_pattern(prefix).search(text) is not None
+
+
+_prefix_patterns = {}
+
+
+def _prefix_pattern(prefix):
+    pattern = _prefix_patterns.get(prefix)
+    if pattern is None:
+        pattern = _prefix_patterns[prefix] = re.compile(r'(?<!\w)' + re.escape(prefix))
+    return pattern
+
+
+class SQLiteStorage(StorageBackend):
+    """SQLite backend in WAL mode with one row per record.
+
+    The full record is kept as JSON; author, genre, title and ISO dates are
+    copied into indexed columns, and the lowercased searchable text into
+    search_text, so search and genre filtering run inside SQLite using the
+    same matching rules as SearchIndex.
+    """
+
+    supports_queries = True
+    supports_paging = True
+
+    def __init__(self, path="library_data.db"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.create_function("token_prefix", 2, _token_prefix, deterministic=True)
+        self._next_position = self._max_position() + 1
+
+    def load(self):
+        data = {name: [] for name in COLLECTIONS}
+        rows = self.connection.execute("SELECT collection, data FROM items ORDER BY collection, position")
+        for collection, record in rows:
+            data[collection].append(json.loads(record))
+        return data
+
+    def load_collection(self, collection):
+        rows = self.connection.execute(
+            "SELECT data FROM items WHERE collection = ? ORDER BY position", (collection,)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, collection):
+        row = self.connection.execute("SELECT COUNT(*) FROM items WHERE collection = ?", (collection,)).fetchone()
+        return row[0]
+
+    def load_page(self, collection, offset, limit):
+        rows = self.connection.execute(
+            "SELECT data FROM items WHERE collection = ? ORDER BY position LIMIT ? OFFSET ?",
+            (collection, limit, offset)
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def load_records(self, collection, ids):
+        records = []
+        # Stay well below SQLite's limit on bound parameters
+        for start in range(0, len(ids), MAX_PARAMETERS):
+            chunk = ids[start:start + MAX_PARAMETERS]
+            rows = self.connection.execute(
+                f"SELECT data FROM items WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            )
+            records.extend(json.loads(row[0]) for row in rows)
+        return records
+
+    def append(self, op, collection, **payload):
+        with self.connection:
+            if op == 'add':
+                self._insert(collection, payload.get('records') or [payload['record']])
+            elif op == 'update':
+                self._update(collection, payload['records'])
+            elif op == 'delete':
+                self.connection.executemany(
+                    "DELETE FROM items WHERE id = ?", [(item_id,) for item_id in payload['ids']]
+                )
+        return False
+
+    def store_batch(self, collection, records, snapshot):
+        with self.connection:
+            self._insert(collection, records)
+
+    def write_snapshot(self, data):
+        with self.connection:
+            self.connection.execute("DELETE FROM items")
+            self._next_position = 0
+            for collection in COLLECTIONS:
+                self._insert(collection, data.get(collection, []))
+
+    def close(self):
+        self.connection.close()
+
+    def search(self, collection, query):
+        if len(query) >= 3:
+            condition = "instr(search_text, ?) > 0"
+        else:
+            condition = "token_prefix(search_text, ?)"
+        rows = self.connection.execute(
+            f"SELECT id FROM items WHERE collection = ? AND {condition} ORDER BY position",
+            (collection, query)
+        )
+        return [row[0] for row in rows]
+
+    def ids_by_genre(self, collection, genre):
+        rows = self.connection.execute(
+            "SELECT id FROM items WHERE collection = ? AND tur = ? ORDER BY position",
+            (collection, genre)
+        )
+        return [row[0] for row in rows]
+
+    def genre_counts(self, collection):
+        rows = self.connection.execute(
+            "SELECT tur, COUNT(*) FROM items WHERE collection = ? GROUP BY tur", (collection,)
+        )
+        return dict(rows)
+
+    def _insert(self, collection, records):
+        start = self._next_position
+        self._next_position += len(records)
+        self.connection.executemany(INSERT, [
+            self._columns(collection, record, start + offset) for offset, record in enumerate(records)
+        ])
+
+    def _columns(self, collection, record, position=None):
+        """Return the INSERT parameters of a record, in column order."""
+        return (
+            record['id'],
+            collection,
+            position,
+            str(record.get('Yazar', '')),
+            str(record.get('Tür', '')),
+            str(record.get(TITLE_FIELDS[collection], '')),
+            iso_date(record.get('Başlama Tarihi')),
+            iso_date(record.get('Bitirme Tarihi')),
+            FIELD_SEPARATOR.join(searchable_fields(record)),
+            json.dumps(record, ensure_ascii=False, default=dict)
+        )
+
+    def _update(self, collection, records):
+        # Rewrite the records in place, keeping their position
+        self.connection.executemany(UPDATE, [
+            self._columns(collection, record)[3:] + (record['id'],) for record in records
+        ])
+
+    def _max_position(self):
+        row = self.connection.execute("SELECT MAX(position) FROM items").fetchone()
+        return -1 if row[0] is None else row[0]
@@ -0,0 +1,96 @@
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Set in the environment of the instrumented child run
+PROFILE_ENV = "LIBRARY_PROFILE_STARTUP"
+
+# Time from process start to a shown window that startup should stay under
+STARTUP_TARGET_MS = 800
+
+# How many top-level imports to list
+TOP_IMPORTS = 12
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+PHASE_PREFIX = "startup-phase:"
+
+_started = time.perf_counter()
+_phases = []
+
+
+def active():
+    return os.environ.get(PROFILE_ENV) == "1"
+
+
+def mark(phase):
+    """Record how long after startup phase was reached (only while profiling)."""
+    if active():
+        _phases.append((phase, (time.perf_counter() - _started) * 1000))
+
+
+def report_and_quit():
+    """Print the recorded phases for the parent run and leave the event loop."""
+    from PyQt5.QtWidgets import QApplication
+    mark("first event")
+    for phase, elapsed in _phases:
+        print(f"{PHASE_PREFIX}{phase}:{elapsed:.1f}", flush=True)
+    QApplication.quit()
+
+
+def parse_import_times(lines):
+    """Return {top-level package: cumulative microseconds} from -X importtime output.
+
+    Only imports at the outermost level are counted, so nested imports are
+    charged to whatever pulled them in.
+    """
+    totals = {}
+    for line in lines:
+        match = IMPORT_LINE.match(line)
+        if match and len(match.group(3)) == 1:
+            root = match.group(4).split('.')[0]
+            totals[root] = totals.get(root, 0) + int(match.group(2))
+    return totals
+
+
+def profile(script, target_ms=STARTUP_TARGET_MS):
+    """Run script under -X importtime and print where its startup time goes.
+
+    Returns 0 when the window was shown within target_ms, 1 otherwise, or
+    the child's exit code if it failed to start.
+    """
+    env = dict(os.environ, **{PROFILE_ENV: "1"})
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script],
+        env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        return result.returncode
+
+    imports = parse_import_times(result.stderr.splitlines())
+    print("Import time by top-level module (cumulative):")
+    for name, micros in sorted(imports.items(), key=lambda item: -item[1])[:TOP_IMPORTS]:
+        print(f"  {name:<28}{micros / 1000:>9.1f} ms")
+    print(f"  {'all imports':<28}{sum(imports.values()) / 1000:>9.1f} ms")
+
+    phases = {}
+    for line in result.stdout.splitlines():
+        if line.startswith(PHASE_PREFIX):
+            phase, elapsed = line[len(PHASE_PREFIX):].rsplit(':', 1)
+            phases[phase] = float(elapsed)
+    print("Phases (since main.py started):")
+    for phase, elapsed in phases.items():
+        print(f"  {phase:<28}{elapsed:>9.1f} ms")
+    print(f"Process wall time: {wall_ms:.1f} ms")
+
+    shown = phases.get("window")
+    if shown is None:
+        print("The window was never shown")
+        return 1
+    within = shown <= target_ms
+    print(f"Window shown after {shown:.1f} ms (target {target_ms} ms): {'OK' if within else 'TOO SLOW'}")
+    return 0 if within else 1
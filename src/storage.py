@@ -0,0 +1,304 @@
+import json
+import os
+import threading
+import uuid
+from src.durable_io import FLUSH_WINDOW_MS, CoalescingWriter, atomic_write
+
+COLLECTIONS = ('books', 'articles', 'magazines')
+
+# Selectable backends and the file each one keeps the library in
+STORAGE_FILES = {
+    'pickle': "library_data.pkl",
+    'sqlite': "library_data.db",
+    'mmap': "library_data.libmap"
+}
+DEFAULT_STORAGE = 'pickle'
+
+
+class StorageBackend:
+    """Interface DataManager persists the collections through.
+
+    Records are dicts carrying a unique 'id'. Backends that can answer
+    search and genre queries themselves set supports_queries and implement
+    search/ids_by_genre/genre_counts; those that can read a collection a
+    page at a time set supports_paging and implement count/load_page/load_records.
+    """
+
+    supports_queries = False
+    supports_paging = False
+
+    def load(self):
+        """Return {collection: [records]} in insertion order."""
+        raise NotImplementedError("Subclasses must implement load")
+
+    def load_collection(self, collection):
+        """Return the records of one collection in insertion order."""
+        return self.load()[collection]
+
+    def count(self, collection):
+        raise NotImplementedError("Subclasses must implement count")
+
+    def load_page(self, collection, offset, limit):
+        """Return up to limit records of collection starting at position offset."""
+        raise NotImplementedError("Subclasses must implement load_page")
+
+    def load_records(self, collection, ids):
+        """Return the records with the given ids, in any order."""
+        raise NotImplementedError("Subclasses must implement load_records")
+
+    def append(self, op, collection, **payload):
+        """Persist one mutation: 'add' with record/records, 'update' with records
+        (replaced in place) or 'delete' with ids.
+
+        Returns True when the backend wants compact() to be called.
+        """
+        raise NotImplementedError("Subclasses must implement append")
+
+    def store_batch(self, collection, records, snapshot):
+        """Persist records just added to collection in bulk; snapshot() returns every collection."""
+        self.write_snapshot(snapshot())
+
+    def write_snapshot(self, data):
+        """Replace everything stored with data."""
+        raise NotImplementedError("Subclasses must implement write_snapshot")
+
+    def compact(self, data):
+        pass
+
+    def flush(self):
+        """Block until every mutation appended so far is on disk."""
+
+    def wait(self):
+        pass
+
+    def close(self):
+        pass
+
+    def search(self, collection, query):
+        """Return ids of matching records in order; query is already Turkish-lowercased."""
+        raise NotImplementedError("Subclasses must implement search")
+
+    def ids_by_genre(self, collection, genre):
+        raise NotImplementedError("Subclasses must implement ids_by_genre")
+
+    def genre_counts(self, collection):
+        raise NotImplementedError("Subclasses must implement genre_counts")
+
+
+def create_storage(kind=DEFAULT_STORAGE, path=None):
+    """Create the storage backend named kind ('pickle', 'sqlite' or 'mmap')."""
+    if kind not in STORAGE_FILES:
+        raise ValueError(f"Unknown storage backend: {kind}")
+    path = path or STORAGE_FILES[kind]
+    if kind == 'sqlite':
+        from src.sqlite_storage import SQLiteStorage
+        return SQLiteStorage(path)
+    if kind == 'mmap':
+        from src.mapped_storage import MappedStorage
+        return MappedStorage(path)
+    return JournalStorage(path)
+
+
+class JournalStorage(StorageBackend):
+    """Snapshot + append-only journal persistence for the library collections.
+
+    Every mutation is appended to the journal as one JSON line, so writes cost
+    O(1) regardless of library size. Lines are written and fsynced by a
+    CoalescingWriter, so a burst of edits within flush_window_ms costs one
+    fsync and never blocks the caller. Once enough entries pile up the full
+    collections are written to the snapshot in a background thread and the
+    journal is trimmed to whatever was appended after that snapshot. Both
+    files are replaced with atomic_write, so a crash never leaves a torn one.
+
+    The snapshot can only be read as a whole, so the first collection asked
+    for loads all of them and the others are handed out from that one read.
+    """
+
+    def __init__(self, snapshot_path="library_data.pkl", journal_path=None, compact_threshold=1000,
+                 flush_window_ms=FLUSH_WINDOW_MS):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.compact_threshold = compact_threshold
+        self.flush_window_ms = flush_window_ms
+        self._lock = threading.Lock()
+        self._seq = 0  # Sequence number of the last journal entry
+        self._pending = 0  # Records changed by journal entries not yet folded into the snapshot
+        self._journal = None
+        self._compactor = None
+        self._next_snapshot = None  # (data, seq) for the compactor to write next
+        self._torn = False
+        self._unclaimed = None  # Collections read by load_collection but not yet handed out
+
+    def load(self):
+        """Return the collections from the snapshot with the journal replayed on top."""
+        data = {name: [] for name in COLLECTIONS}
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            # pandas is only imported once it is needed; see src/warmup.py
+            import pandas as pd
+            snapshot = pd.read_pickle(self.snapshot_path)
+            for name in COLLECTIONS:
+                data[name] = snapshot.get(name, [])
+            snapshot_seq = snapshot.get('journal_seq', 0)
+
+        # Key records by id so journal deletes resolve in O(1)
+        records = {}
+        backfilled = False
+        for name in COLLECTIONS:
+            records[name] = {}
+            for item in data[name]:
+                if 'id' not in item:
+                    item['id'] = str(uuid.uuid4())
+                    backfilled = True
+                records[name][item['id']] = item
+
+        self._seq = snapshot_seq
+        self._pending = 0
+        for entry in self._read_journal():
+            if entry['seq'] <= snapshot_seq:
+                continue  # Already folded into the snapshot
+            collection = records[entry['collection']]
+            if entry['op'] == 'add':
+                for record in entry.get('records') or [entry['record']]:
+                    collection[record['id']] = record
+            elif entry['op'] == 'update':
+                for record in entry['records']:
+                    if record['id'] in collection:
+                        collection[record['id']] = record
+            elif entry['op'] == 'delete':
+                for item_id in entry['ids']:
+                    collection.pop(item_id, None)
+            self._seq = entry['seq']
+            self._pending += entry_weight(entry)
+
+        data = {name: list(records[name].values()) for name in COLLECTIONS}
+
+        # Later appends would be glued onto a torn line, so cut it off now
+        if self._torn:
+            self._trim_journal(snapshot_seq)
+
+        # Freshly minted ids must reach disk before the journal refers to them
+        if backfilled:
+            self.write_snapshot(data)
+        return data
+
+    def load_collection(self, collection):
+        records = self._unclaimed.pop(collection, None) if self._unclaimed else None
+        if records is None:
+            self._unclaimed = self.load()
+            records = self._unclaimed.pop(collection)
+        return records
+
+    def append(self, op, collection, **payload):
+        """Append one mutation to the journal.
+
+        Returns True once the journal is large enough to be compacted.
+        """
+        with self._lock:
+            self._seq += 1
+            entry = {'seq': self._seq, 'op': op, 'collection': collection}
+            entry.update(payload)
+            journal = self._open_journal()
+            journal.write(json.dumps(entry, ensure_ascii=False, default=dict) + "\n")
+            self._pending += entry_weight(entry)
+            return self._pending >= self.compact_threshold
+
+    def store_batch(self, collection, records, snapshot):
+        """Journal the batch as one entry and leave rewriting the snapshot to compaction."""
+        if self.append('add', collection, records=records):
+            self.compact(snapshot())
+
+    def flush(self):
+        """Block until every journal entry appended so far is on disk."""
+        journal = self._journal
+        if journal is not None:
+            journal.flush()
+
+    def compact(self, data):
+        """Fold the journal into a new snapshot of data in a background thread.
+
+        Requests made while a snapshot is being written are coalesced: the
+        compactor then writes only the latest data it was given.
+        """
+        with self._lock:
+            self._next_snapshot = (data, self._seq)
+            if self._compactor is None:
+                self._compactor = threading.Thread(target=self._compact_pending, name="journal-compactor")
+                self._compactor.start()
+
+    def _compact_pending(self):
+        while True:
+            with self._lock:
+                pending, self._next_snapshot = self._next_snapshot, None
+                if pending is None:
+                    self._compactor = None
+                    return
+            try:
+                self._write_snapshot(*pending)
+            except BaseException:
+                with self._lock:
+                    self._compactor = None
+                raise
+
+    def write_snapshot(self, data):
+        """Synchronously write data as the new snapshot."""
+        self.wait()
+        with self._lock:
+            seq = self._seq
+        self._write_snapshot(data, seq)
+
+    def wait(self):
+        """Block until a running compaction has finished."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def close(self):
+        self.wait()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _write_snapshot(self, data, seq):
+        import pandas as pd
+        snapshot = {name: data.get(name, []) for name in COLLECTIONS}
+        snapshot['journal_seq'] = seq
+        atomic_write(self.snapshot_path, lambda f: pd.to_pickle(snapshot, f))
+        self._trim_journal(seq)
+
+    def _trim_journal(self, seq):
+        """Drop journal entries that are covered by the snapshot at seq."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+            remaining = [entry for entry in self._read_journal() if entry['seq'] > seq]
+            atomic_write(self.journal_path, lambda f: f.writelines(
+                json.dumps(entry, ensure_ascii=False) + "\n" for entry in remaining
+            ), binary=False)
+            self._pending = sum(map(entry_weight, remaining))
+
+    def _open_journal(self):
+        if self._journal is None:
+            self._journal = CoalescingWriter(self.journal_path, self.flush_window_ms)
+        return self._journal
+
+    def _read_journal(self):
+        self._torn = False
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write; nothing after it is valid
+                    self._torn = True
+                    return
+
+
+def entry_weight(entry):
+    """How much a journal entry counts towards compaction: the records it carries."""
+    return max(1, len(entry.get('records') or entry.get('ids') or ()))
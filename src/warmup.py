@@ -0,0 +1,33 @@
+import importlib
+import threading
+
+# Heavy modules that are imported where they are used rather than at startup
+DEFERRED_MODULES = ('numpy', 'pandas', 'openpyxl', 'src.pdf_export')
+
+# How long after the window is shown to start importing them
+WARMUP_DELAY_MS = 200
+
+
+def warm_up(modules=DEFERRED_MODULES):
+    """Import the deferred modules in a background thread.
+
+    The window is already up by the time this runs, so the first Excel
+    import or PDF export does not have to wait for pandas or reportlab.
+    Failures are left for the code that actually needs the module to report.
+    """
+    thread = threading.Thread(target=_import_all, args=(modules,), name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def _import_all(modules):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+    try:
+        from src.pdf_export import register_font
+        register_font()
+    except Exception:
+        pass  # No font file; export_to_pdf reports it when used